@@ -1,3 +1,22 @@
 class LimitReach(Exception):
     def __init__(self, message="Limit message approach!"):
-        super().__init__(message)
\ No newline at end of file
+        super().__init__(message)
+
+class RateLimited(Exception):
+    def __init__(self, message="Request budget exhausted!"):
+        super().__init__(message)
+
+
+class InvalidConfig(Exception):
+    def __init__(self, message="Invalid configuration!"):
+        super().__init__(message)
+
+
+class BackendUnavailable(Exception):
+    def __init__(self, message="No speech backend available!"):
+        super().__init__(message)
+
+
+class SessionExpired(Exception):
+    def __init__(self, message="Google session expired, sign in again!"):
+        super().__init__(message)
@@ -0,0 +1,144 @@
+import io
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+def decode_mp3(data: bytes) -> tuple[np.ndarray, int]:
+    """
+    Decode MP3 bytes once into mono float samples.
+
+    Args:
+        data (bytes): Encoded MP3.
+
+    Returns:
+        tuple[np.ndarray, int]: float32 samples in [-1, 1] and the sample rate.
+    """
+    from pydub import AudioSegment  # Deferred: pydub probes for ffmpeg on import
+    audio = AudioSegment.from_file(io.BytesIO(data), format="mp3")
+    samples = np.frombuffer(audio.raw_data, dtype=f"<i{audio.sample_width}")
+    samples = samples.reshape(-1, audio.channels).mean(axis=1)
+    return (samples / float(1 << (8 * audio.sample_width - 1))).astype(np.float32), audio.frame_rate
+
+
+def trim_silence(samples: np.ndarray, rate: int, threshold_db: float = -50.0, keep_ms: int = 30) -> np.ndarray:
+    """
+    Cut leading and trailing silence, keeping a short margin.
+
+    Args:
+        samples (np.ndarray): Mono float samples.
+        rate (int): Sample rate.
+        threshold_db (float): Level below which a 10 ms block counts as silent (default: -50 dBFS).
+        keep_ms (int): Silence kept at each end in milliseconds (default: 30).
+
+    Returns:
+        np.ndarray: The trimmed samples, or the input if it is silent throughout.
+    """
+    block = max(1, rate // 100)
+    usable = len(samples) // block * block
+    if usable == 0:
+        return samples
+    rms = np.sqrt(np.mean(np.square(samples[:usable].reshape(-1, block)), axis=1))
+    loud = np.flatnonzero(rms > 10 ** (threshold_db / 20))
+    if len(loud) == 0:
+        return samples
+    keep = rate * keep_ms // 1000
+    start = max(0, loud[0] * block - keep)
+    end = min(len(samples), (loud[-1] + 1) * block + keep)
+    return samples[start:end]
+
+
+def time_stretch(samples: np.ndarray, rate: int, speed: float,
+                 frame_ms: float = 40.0, tolerance_ms: float = 10.0) -> np.ndarray:
+    """
+    Change tempo without changing pitch using WSOLA (waveform-similarity overlap-add).
+
+    Frames are read every `speed * hop` samples and written every `hop` samples.
+    Each frame is shifted by up to `tolerance_ms` to line up with the natural
+    continuation of the previous one, found with a single (decimated) matrix
+    product over all candidate offsets.
+
+    Args:
+        samples (np.ndarray): Mono float samples.
+        rate (int): Sample rate.
+        speed (float): Tempo factor, above 1.0 is faster.
+        frame_ms (float): Analysis frame length in milliseconds (default: 40).
+        tolerance_ms (float): Largest alignment shift in milliseconds (default: 10).
+
+    Returns:
+        np.ndarray: Stretched float32 samples, about `len(samples) / speed` long.
+    """
+    if speed == 1.0 or len(samples) == 0:
+        return samples
+    frame = max(4, int(rate * frame_ms / 1000) // 2 * 2)
+    hop_out = frame // 2
+    hop_in = hop_out * speed
+    tolerance = int(rate * tolerance_ms / 1000)
+
+    frames = int(max(0, len(samples) - frame) / hop_in) + 1
+    padded = np.pad(samples.astype(np.float32), (tolerance, frame + hop_out + 2 * tolerance))
+    windows = sliding_window_view(padded, frame)
+    window = np.hanning(frame).astype(np.float32)
+
+    out = np.zeros(frames * hop_out + frame, dtype=np.float32)
+    weight = np.zeros_like(out)
+    previous = tolerance
+    for k in range(frames):
+        nominal = tolerance + int(round(k * hop_in))
+        if k == 0:
+            position = nominal
+        else:
+            # Every 4th sample is plenty to find the best alignment
+            candidates = windows[nominal - tolerance:nominal + tolerance + 1, ::4]
+            position = nominal - tolerance + int(np.argmax(candidates @ windows[previous + hop_out, ::4]))
+        out[k * hop_out:k * hop_out + frame] += windows[position] * window
+        weight[k * hop_out:k * hop_out + frame] += window
+        previous = position
+
+    out /= np.maximum(weight, 1e-3)
+    return out[:int(len(samples) / speed)]
+
+
+def resample(samples: np.ndarray, rate: int, target_rate: int) -> np.ndarray:
+    """
+    Linear-interpolation resampling.
+
+    Args:
+        samples (np.ndarray): Mono float samples.
+        rate (int): Current sample rate.
+        target_rate (int): Wanted sample rate.
+
+    Returns:
+        np.ndarray: Resampled float32 samples.
+    """
+    if rate == target_rate or len(samples) == 0:
+        return samples
+    positions = np.arange(int(len(samples) * target_rate / rate)) * (rate / target_rate)
+    return np.interp(positions, np.arange(len(samples)), samples).astype(np.float32)
+
+
+def to_pcm(samples: np.ndarray, size: int, channels: int) -> bytes:
+    """
+    Encode mono float samples as interleaved PCM in a mixer's sample format.
+
+    Args:
+        samples (np.ndarray): Mono float samples in [-1, 1].
+        size (int): Sample format as reported by `pygame.mixer.get_init()` (-16 is signed 16-bit, 32 is float).
+        channels (int): Number of output channels.
+
+    Returns:
+        bytes: Raw PCM.
+    """
+    samples = np.clip(samples, -1.0, 1.0)
+    if size == 32:
+        pcm = samples.astype(np.float32)
+    else:
+        bits = abs(size)
+        scale = float((1 << (bits - 1)) - 1)
+        pcm = np.round(samples * scale)
+        if size > 0:
+            pcm = pcm + (1 << (bits - 1))
+        pcm = pcm.astype(f"{'<i' if size < 0 else '<u'}{bits // 8}")
+    if channels > 1:
+        pcm = np.repeat(pcm, channels)
+    return pcm.tobytes()
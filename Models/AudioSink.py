@@ -0,0 +1,266 @@
+import threading
+import time
+import wave
+from collections import deque
+from typing import Callable, NamedTuple, Optional
+
+import numpy as np
+
+from Models.AudioDSP import resample, to_pcm
+
+# Called with True once a clip has finished playing, or False if it was dropped by `stop`
+ClipCallback = Callable[[bool], None]
+
+
+class Clip(NamedTuple):
+    """Decoded mono audio ready for a sink that does not need a native handle."""
+    samples: np.ndarray
+    rate: int
+
+    def duration(self) -> float:
+        return len(self.samples) / self.rate if self.rate else 0.0
+
+
+class AudioSink:
+    """
+    Playback backend for the speech engine. Clips are converted once with
+    `prepare` (on a synthesis worker) and then queued with `play`, which returns
+    as soon as the clip is queued so consecutive clips play back to back.
+    """
+
+    def prepare(self, samples: np.ndarray, rate: int):
+        """
+        Convert decoded audio into whatever the sink plays.
+
+        Args:
+            samples (np.ndarray): Mono float samples in [-1, 1].
+            rate (int): Sample rate of `samples`.
+
+        Returns:
+            A handle to pass to `play`.
+        """
+        return Clip(samples, rate)
+
+    def play(self, clip, on_done: Optional[ClipCallback] = None) -> None:
+        """
+        Queue a clip behind everything already queued.
+
+        Args:
+            clip: Handle returned by `prepare`.
+            on_done (Optional[ClipCallback]): Called from the sink's thread when the clip ends.
+        """
+        raise NotImplementedError
+
+    def drain(self, timeout: Optional[float] = None) -> bool:
+        """
+        Block until every queued clip has finished.
+
+        Args:
+            timeout (Optional[float]): Seconds to wait, forever if None.
+
+        Returns:
+            bool: True if the sink went idle within the timeout.
+        """
+        return True
+
+    def stop(self) -> None:
+        """Cut the current clip and drop everything queued."""
+
+    def close(self) -> None:
+        """Stop playback and release the device."""
+        self.stop()
+
+
+class PygameSink(AudioSink):
+    """
+    Plays clips on a reserved pygame mixer channel. The next clip is handed to
+    `Channel.queue` while the current one plays, so the mixer starts it without
+    a gap. A single thread sleeps until the current clip is due to end, confirms
+    it with the mixer and fires its callback; nothing polls between clips.
+    """
+
+    def __init__(self, channel: int = 0, max_queued: int = 2) -> None:
+        """
+        Args:
+            channel (int): Mixer channel reserved for speech (default: 0).
+            max_queued (int): Clips waiting behind the mixer before `play` blocks (default: 2).
+        """
+        import pygame
+        self.pygame = pygame
+        if not pygame.mixer.get_init():
+            pygame.mixer.init()
+        if pygame.mixer.get_num_channels() <= channel:
+            pygame.mixer.set_num_channels(channel + 1)
+        pygame.mixer.set_reserved(channel + 1)
+        self.channel = pygame.mixer.Channel(channel)
+        self.max_queued = max_queued
+        self.waiting: deque = deque()    # (sound, on_done) not yet handed to the mixer
+        self.mixing: deque = deque()     # (sound, on_done, ends_at) playing or queued in the mixer
+        self.cond = threading.Condition()
+        self.closed = False
+        self.thread = threading.Thread(target=self.__run, name="audio-sink", daemon=True)
+        self.thread.start()
+
+    def prepare(self, samples: np.ndarray, rate: int):
+        frequency, size, channels = self.pygame.mixer.get_init()
+        return self.pygame.mixer.Sound(buffer=to_pcm(resample(samples, rate, frequency), size, channels))
+
+    def play(self, clip, on_done: Optional[ClipCallback] = None) -> None:
+        with self.cond:
+            self.cond.wait_for(lambda: self.closed or len(self.waiting) < self.max_queued)
+            if self.closed:
+                raise RuntimeError("Audio sink closed")
+            self.waiting.append((clip, on_done))
+            self.cond.notify_all()
+
+    def drain(self, timeout: Optional[float] = None) -> bool:
+        with self.cond:
+            return self.cond.wait_for(lambda: not self.waiting and not self.mixing, timeout)
+
+    def stop(self) -> None:
+        with self.cond:
+            dropped = [on_done for _, on_done in self.waiting] + [on_done for _, on_done, _ in self.mixing]
+            self.waiting.clear()
+            self.mixing.clear()
+            self.channel.stop()
+            self.cond.notify_all()
+        for on_done in dropped:
+            if on_done is not None:
+                on_done(False)
+
+    def close(self) -> None:
+        self.stop()
+        with self.cond:
+            self.closed = True
+            self.cond.notify_all()
+        self.thread.join()
+
+    def __run(self) -> None:
+        while True:
+            finished = []
+            with self.cond:
+                if self.closed:
+                    return
+                now = time.monotonic()
+                # The head clip is over once its time is up and the mixer has moved past it
+                while self.mixing and self.mixing[0][2] <= now and (
+                        not self.channel.get_busy() or self.channel.get_sound() is not self.mixing[0][0]):
+                    finished.append(self.mixing.popleft()[1])
+                if not self.mixing and self.waiting:
+                    sound, on_done = self.waiting.popleft()
+                    self.channel.play(sound)
+                    self.mixing.append((sound, on_done, now + sound.get_length()))
+                if len(self.mixing) == 1 and self.waiting and self.channel.get_queue() is None:
+                    sound, on_done = self.waiting.popleft()
+                    self.channel.queue(sound)
+                    self.mixing.append((sound, on_done, self.mixing[0][2] + sound.get_length()))
+                if finished or self.mixing or self.waiting:
+                    self.cond.notify_all()
+
+                if not finished:
+                    if self.mixing:
+                        # Sleep until the clip is due; re-check every few ms if the mixer runs late
+                        self.cond.wait(max(self.mixing[0][2] - now, 0.005))
+                    else:
+                        self.cond.wait()
+            for on_done in finished:
+                if on_done is not None:
+                    on_done(True)
+
+
+class NullSink(AudioSink):
+    """
+    Discards audio, for running headless. Clips finish immediately, or after
+    their real duration when `realtime` is set; then, like PygameSink, `play`
+    blocks while `max_queued` clips are waiting behind the one playing.
+    """
+
+    def __init__(self, realtime: bool = False, max_queued: int = 2) -> None:
+        """
+        Args:
+            realtime (bool): Take as long as the audio would to play (default: False).
+            max_queued (int): Clips waiting behind the current one before `play` blocks, when realtime (default: 2).
+        """
+        self.realtime = realtime
+        self.max_queued = max_queued
+        self.clips = 0
+        self.seconds = 0.0
+        self.ends_at = 0.0
+        self.timers: dict[threading.Timer, Optional[ClipCallback]] = {}
+        self.lock = threading.Lock()
+        self.idle = threading.Condition(self.lock)
+
+    def play(self, clip: Clip, on_done: Optional[ClipCallback] = None) -> None:
+        def finish():
+            with self.lock:
+                if self.timers.pop(timer, False) is False:
+                    return  # Dropped by stop
+                self.idle.notify_all()
+            if on_done is not None:
+                on_done(True)
+
+        timer = None
+        with self.lock:
+            self.clips += 1
+            self.seconds += clip.duration()
+            if self.realtime:
+                self.idle.wait_for(lambda: len(self.timers) <= self.max_queued)
+                self.ends_at = max(self.ends_at, time.monotonic()) + clip.duration()
+                delay = self.ends_at - time.monotonic()
+                if delay > 0:
+                    timer = threading.Timer(delay, finish)
+                    timer.daemon = True
+                    self.timers[timer] = on_done
+        if timer is None:
+            if on_done is not None:
+                on_done(True)
+            return
+        timer.start()
+
+    def drain(self, timeout: Optional[float] = None) -> bool:
+        with self.lock:
+            return self.idle.wait_for(lambda: not self.timers, timeout)
+
+    def stop(self) -> None:
+        with self.lock:
+            timers, self.timers = self.timers, {}
+            self.ends_at = 0.0
+            self.idle.notify_all()
+        for timer, on_done in timers.items():
+            timer.cancel()
+            if on_done is not None:
+                on_done(False)
+
+
+class WavSink(AudioSink):
+    """
+    Writes every clip back to back into one 16-bit mono WAV file, so the exact
+    audio the speaker would hear can be checked headless. Clips finish as soon
+    as they are written.
+    """
+
+    def __init__(self, path: str, rate: int = 24000) -> None:
+        """
+        Args:
+            path (str): Output WAV file, overwritten.
+            rate (int): Sample rate of the file; clips are resampled to it (default: 24000).
+        """
+        self.path = path
+        self.rate = rate
+        self.lock = threading.Lock()
+        self.file = wave.open(path, "wb")
+        self.file.setnchannels(1)
+        self.file.setsampwidth(2)
+        self.file.setframerate(rate)
+
+    def play(self, clip: Clip, on_done: Optional[ClipCallback] = None) -> None:
+        with self.lock:
+            self.file.writeframes(to_pcm(resample(clip.samples, clip.rate, self.rate), -16, 1))
+        if on_done is not None:
+            on_done(True)
+
+    def close(self) -> None:
+        with self.lock:
+            if self.file is not None:
+                self.file.close()
+                self.file = None
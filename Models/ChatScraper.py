@@ -0,0 +1,276 @@
+from selenium.webdriver.chrome.webdriver import WebDriver
+from selenium.webdriver.common.by import By
+from selenium.common.exceptions import WebDriverException
+
+import logging
+from enum import Enum
+from typing import List, Tuple, Optional
+
+from Models.LogWriter import REPEATED
+
+
+class IngestionMode(Enum):
+    """How new chat messages are pulled out of the meeting page."""
+    SCAN = "scan"                # Walk every message element on each poll
+    INCREMENTAL = "incremental"  # One execute_script call from the last seen message
+    OBSERVER = "observer"        # In-page MutationObserver queue drained by long-polling
+
+
+# Turns one `div[data-message-id]` node into [timestamp, name, message_id, text],
+# or null while its text has not been rendered yet.
+_READ_RECORD_JS = """
+function readRecord(node) {
+    const group = node.closest('.Ss4fHf');
+    const body = node.querySelector('[jsname="dTKtvb"]');
+    const text = body ? body.innerText.trim() : '';
+    if (!group || !text) {
+        return null;
+    }
+    const name = group.querySelector('.poVWob');
+    const timestamp = group.querySelector('.MuzmKe');
+    return [
+        timestamp ? timestamp.innerText.trim() : '',
+        name ? name.innerText.trim() : '',
+        node.getAttribute('data-message-id'),
+        text,
+    ];
+}
+"""
+
+# Collects every chat message rendered after `arguments[0]` (the last seen
+# data-message-id) in a single round trip. Records are returned in DOM order.
+EXTRACT_NEW_MESSAGES_JS = _READ_RECORD_JS + """
+const lastId = arguments[0];
+const nodes = document.querySelectorAll('.Ss4fHf div[data-message-id]');
+let start = 0;
+if (lastId) {
+    for (let i = nodes.length - 1; i >= 0; i--) {
+        if (nodes[i].getAttribute('data-message-id') === lastId) {
+            start = i + 1;
+            break;
+        }
+    }
+}
+const records = [];
+for (let i = start; i < nodes.length; i++) {
+    const record = readRecord(nodes[i]);
+    if (record) {
+        records.push(record);
+    }
+}
+return records;
+"""
+
+# Installs a MutationObserver that pushes every new message record into
+# `window.__chatBot.queue`. Messages already on the page are marked as seen
+# rather than queued. The observer watches the list of message groups; while
+# the chat is still empty a lighter observer watches the page for that list
+# (child nodes only) and hands over to the list observer once the first
+# message group appears. Returns true if a live observer was already installed.
+INSTALL_OBSERVER_JS = _READ_RECORD_JS + """
+const current = window.__chatBot;
+if (current && current.root.isConnected) {
+    return true;
+}
+if (current) {
+    current.observer.disconnect();
+}
+const state = {queue: [], seen: new Set(), waiter: null, root: null, observer: null};
+
+function consider(node) {
+    const id = node.getAttribute('data-message-id');
+    if (state.seen.has(id)) {
+        return;
+    }
+    const record = readRecord(node);
+    if (record) {
+        state.seen.add(id);
+        state.queue.push(record);
+    }
+}
+
+function wake() {
+    if (state.queue.length && state.waiter) {
+        state.waiter();
+    }
+}
+
+function onMessages(mutations) {
+    for (const mutation of mutations) {
+        const target = mutation.target.nodeType === 1 ? mutation.target : mutation.target.parentElement;
+        const owner = target ? target.closest('div[data-message-id]') : null;
+        if (owner) {
+            consider(owner);
+        }
+        for (const added of mutation.addedNodes) {
+            if (added.nodeType !== 1) {
+                continue;
+            }
+            if (added.matches('div[data-message-id]')) {
+                consider(added);
+            }
+            added.querySelectorAll('div[data-message-id]').forEach(consider);
+        }
+    }
+    wake();
+}
+
+function watchList(list) {
+    if (state.observer) {
+        state.observer.disconnect();
+    }
+    state.root = list;
+    state.observer = new MutationObserver(onMessages);
+    state.observer.observe(list, {childList: true, subtree: true, characterData: true});
+}
+
+function onPage() {
+    const group = document.querySelector('.Ss4fHf');
+    if (!group || !group.parentElement) {
+        return;
+    }
+    // The chat was empty when installed, so everything in the new list is new
+    watchList(group.parentElement);
+    state.root.querySelectorAll('div[data-message-id]').forEach(consider);
+    wake();
+}
+
+const existing = document.querySelector('.Ss4fHf');
+if (existing && existing.parentElement) {
+    existing.parentElement.querySelectorAll('div[data-message-id]').forEach(
+        node => state.seen.add(node.getAttribute('data-message-id')));
+    watchList(existing.parentElement);
+} else {
+    state.root = document.body;
+    state.observer = new MutationObserver(onPage);
+    state.observer.observe(document.body, {childList: true, subtree: true});
+}
+window.__chatBot = state;
+return false;
+"""
+
+# Long-poll on the observer queue (run with execute_async_script). Resolves as
+# soon as records are queued, with [] after `arguments[0]` milliseconds of
+# silence, or with null when the observer is gone (page reloaded or the chat
+# panel re-rendered).
+WAIT_FOR_MESSAGES_JS = """
+const timeoutMs = arguments[0];
+const done = arguments[arguments.length - 1];
+const state = window.__chatBot;
+if (!state || !state.root.isConnected) {
+    done(null);
+    return;
+}
+if (state.queue.length) {
+    done(state.queue.splice(0));
+    return;
+}
+const timer = setTimeout(() => {
+    state.waiter = null;
+    done([]);
+}, timeoutMs);
+state.waiter = () => {
+    clearTimeout(timer);
+    state.waiter = null;
+    done(state.queue.splice(0));
+};
+"""
+
+
+class ChatScraper:
+    """Reads chat messages out of the Google Meet side panel."""
+
+    def __init__(self, driver: WebDriver) -> None:
+        """
+        Args:
+            driver (WebDriver): Driver attached to a meeting tab.
+        """
+        self.driver = driver
+        self.last_message_id: Optional[str] = None
+
+    def fetch_all(self) -> List[Tuple[str, str, str, str]]:
+        """
+        Scan the whole chat panel element by element.
+
+        Returns:
+            List[Tuple[str, str, str, str]]: (timestamp, name, message_id, text) sorted by timestamp.
+        """
+        chat_data: List[Tuple[str, str, str, str]] = []
+
+        messages = self.driver.find_elements(By.CSS_SELECTOR, ".Ss4fHf")
+
+        for msg in messages:
+            try:
+                name: str = msg.find_element(By.CSS_SELECTOR, ".poVWob").text.strip()
+                timestamp: str = msg.find_element(By.CSS_SELECTOR, ".MuzmKe").text.strip()
+
+                msg_elements = msg.find_elements(By.CSS_SELECTOR, '[jsname="dTKtvb"]')
+                for msg_element in msg_elements:
+                    parent_msg = msg_element.find_element(By.XPATH, "./ancestor::div[@data-message-id]")
+                    message_id = parent_msg.get_attribute("data-message-id") if parent_msg else None
+                    text: str = msg_element.text.strip()
+
+                    if text and message_id:
+                        chat_data.append((timestamp, name, message_id, text))
+
+            except Exception as e:
+                logging.error(f'Reading message error: {e}')
+        return sorted(chat_data, key=lambda x: x[0])
+
+    def fetch_new(self) -> List[Tuple[str, str, str, str]]:
+        """
+        Fetch only the messages rendered after the last one returned, in a single
+        `execute_script` call.
+
+        If the cursor message is no longer in the DOM (panel reloaded or closed and
+        reopened) the whole panel is returned again, so callers must still dedupe
+        on message id.
+
+        Returns:
+            List[Tuple[str, str, str, str]]: (timestamp, name, message_id, text) in DOM order.
+        """
+        records = self.driver.execute_script(EXTRACT_NEW_MESSAGES_JS, self.last_message_id) or []
+        chat_data = [tuple(record) for record in records]
+        if chat_data:
+            self.last_message_id = chat_data[-1][2]
+        return chat_data
+
+    def install_observer(self, timeout: float) -> bool:
+        """
+        Install the in-page MutationObserver used by `wait_for_messages`.
+
+        Args:
+            timeout (float): Longest long-poll the caller will request, in seconds.
+
+        Returns:
+            bool: True if a live observer was already installed.
+        """
+        self.driver.set_script_timeout(timeout + 5)
+        return bool(self.driver.execute_script(INSTALL_OBSERVER_JS))
+
+    def wait_for_messages(self, timeout: float) -> Optional[List[Tuple[str, str, str, str]]]:
+        """
+        Block until the observer has queued messages or `timeout` seconds pass.
+
+        Args:
+            timeout (float): Long-poll duration in seconds.
+
+        Returns:
+            Optional[List[Tuple[str, str, str, str]]]: New messages in arrival order,
+            or None if the observer was lost and must be reinstalled.
+        """
+        try:
+            records = self.driver.execute_async_script(WAIT_FOR_MESSAGES_JS, int(timeout * 1000))
+        except WebDriverException as e:
+            logging.warning(f"Chat observer long-poll failed: {e}", extra=REPEATED)
+            return None
+        if records is None:
+            return None
+        chat_data = [tuple(record) for record in records]
+        if chat_data:
+            self.last_message_id = chat_data[-1][2]
+        return chat_data
+
+    def reset(self) -> None:
+        """Forget the cursor so the next `fetch_new` returns the whole panel."""
+        self.last_message_id = None
@@ -0,0 +1,206 @@
+import functools
+import json
+import logging
+import os
+import threading
+from typing import Callable, Optional
+
+from CustomExeption.CustomExeption import InvalidConfig
+
+
+@functools.lru_cache(maxsize=None)
+def supported_languages() -> frozenset:
+    """Language codes accepted by Google TTS, built once (the lookup takes ~0.1 s)."""
+    from gtts.lang import tts_langs
+    return frozenset(tts_langs())
+
+
+class SchedulerPolicy:
+    """
+    How far behind the chat the bot may fall, and what it gives up to catch up.
+    Loaded from the optional "SCHEDULER" object of config.json.
+    """
+    __slots__ = ("target_latency", "drop_after", "max_chars", "min_words", "merge", "prioritize", "mentions",
+                 "max_waiting")
+
+    KEYS = {"TARGET_LATENCY", "DROP_AFTER", "MAX_CHARS", "MIN_WORDS", "MERGE", "PRIORITIZE", "MENTIONS",
+            "MAX_WAITING"}
+
+    def __init__(self, target_latency: float = 10.0, drop_after: float = 60.0, max_chars: int = 120,
+                 min_words: int = 3, merge: bool = True, prioritize: bool = True, mentions: tuple = (),
+                 max_waiting: int = 10) -> None:
+        """
+        Args:
+            target_latency (float): Seconds from reading a message to speaking it; beyond this the
+                bot is behind, reads priority messages first, shortens long messages and skips
+                low-value ones (default: 10).
+            drop_after (float): Seconds after which a waiting message is skipped outright (default: 60).
+            max_chars (int): Length long messages are cut to while behind (default: 120).
+            min_words (int): Messages with fewer words and no question mark count as low value (default: 3).
+            merge (bool): Read consecutive waiting messages from one speaker as one (default: True).
+            prioritize (bool): Read /respone commands and mentions before older messages while
+                behind (default: True).
+            mentions (tuple): Names that mark a message as addressed to the bot, matched case-insensitively.
+            max_waiting (int): Waiting messages that also count as behind, however recent (default: 10).
+        """
+        self.target_latency = target_latency
+        self.drop_after = drop_after
+        self.max_chars = max_chars
+        self.min_words = min_words
+        self.merge = merge
+        self.prioritize = prioritize
+        self.mentions = tuple(mentions)
+        self.max_waiting = max_waiting
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "SchedulerPolicy":
+        """
+        Validate the "SCHEDULER" object of config.json.
+
+        Raises:
+            InvalidConfig: If a key is unknown or a value has the wrong type or range.
+        """
+        if not isinstance(data, dict):
+            raise InvalidConfig("SCHEDULER must be a JSON object")
+        unknown = set(data) - cls.KEYS
+        if unknown:
+            raise InvalidConfig(f"Unknown SCHEDULER keys: {', '.join(sorted(unknown))}")
+        defaults = cls()
+
+        def number(key: str, default, kind=(int, float)):
+            value = data.get(key, default)
+            if isinstance(value, bool) or not isinstance(value, kind) or value <= 0:
+                raise InvalidConfig(f"SCHEDULER.{key} must be a positive number, got {value!r}")
+            return value
+
+        def flag(key: str, default: bool) -> bool:
+            value = data.get(key, default)
+            if not isinstance(value, bool):
+                raise InvalidConfig(f"SCHEDULER.{key} must be true or false, got {value!r}")
+            return value
+
+        mentions = data.get("MENTIONS", [])
+        if not isinstance(mentions, list) or not all(isinstance(m, str) and m for m in mentions):
+            raise InvalidConfig(f"SCHEDULER.MENTIONS must be a list of names, got {mentions!r}")
+
+        return cls(float(number("TARGET_LATENCY", defaults.target_latency)),
+                   float(number("DROP_AFTER", defaults.drop_after)),
+                   number("MAX_CHARS", defaults.max_chars, int),
+                   number("MIN_WORDS", defaults.min_words, int),
+                   flag("MERGE", defaults.merge), flag("PRIORITIZE", defaults.prioritize), tuple(mentions),
+                   number("MAX_WAITING", defaults.max_waiting, int))
+
+    def __repr__(self) -> str:
+        return "SchedulerPolicy(" + ", ".join(f"{k}={getattr(self, k)!r}" for k in self.__slots__) + ")"
+
+
+class VoiceConfig:
+    """Validated speech settings loaded from config.json."""
+    __slots__ = ("remove", "speed", "lang", "scheduler")
+
+    def __init__(self, remove: bool = True, speed: float = 1.0, lang: str = "vi",
+                 scheduler: Optional[SchedulerPolicy] = None) -> None:
+        self.remove = remove
+        self.speed = speed
+        self.lang = lang
+        self.scheduler = scheduler if scheduler is not None else SchedulerPolicy()
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "VoiceConfig":
+        """
+        Validate a parsed config.json.
+
+        Args:
+            data (dict): Parsed JSON object.
+
+        Returns:
+            VoiceConfig: The validated settings; missing keys take their defaults.
+
+        Raises:
+            InvalidConfig: If a key is unknown or a value has the wrong type or range.
+        """
+        if not isinstance(data, dict):
+            raise InvalidConfig("Config must be a JSON object")
+        unknown = set(data) - {"REMOVE", "SPEED", "LANG", "SCHEDULER"}
+        if unknown:
+            raise InvalidConfig(f"Unknown config keys: {', '.join(sorted(unknown))}")
+
+        remove = data.get("REMOVE", True)
+        if not isinstance(remove, bool):
+            raise InvalidConfig(f"REMOVE must be true or false, got {remove!r}")
+
+        speed = data.get("SPEED", 1.0)
+        if isinstance(speed, bool) or not isinstance(speed, (int, float)) or not 0.5 <= speed <= 2.0:
+            raise InvalidConfig(f"SPEED must be a number between 0.5 and 2.0, got {speed!r}")
+
+        lang = data.get("LANG", "vi")
+        if lang not in supported_languages():
+            raise InvalidConfig(f"LANG {lang!r} is not a language supported by Google TTS")
+
+        return cls(remove, float(speed), lang, SchedulerPolicy.from_dict(data.get("SCHEDULER", {})))
+
+    def to_dict(self) -> dict:
+        """Return the settings in the engine's REMOVE/SPEED/LANG form."""
+        return {"REMOVE": self.remove, "SPEED": self.speed, "LANG": self.lang}
+
+
+class ConfigWatcher:
+    """
+    Watches config.json from a background thread and reloads it only when its
+    modification time or size changes, so the chat loop never touches the file.
+    """
+
+    def __init__(self, path: str, on_change: Callable[[VoiceConfig], None], interval: float = 1.0) -> None:
+        """
+        Args:
+            path (str): Path of config.json.
+            on_change (Callable[[VoiceConfig], None]): Called with each new valid config.
+            interval (float): Seconds between file checks (default: 1.0).
+        """
+        self.path = path
+        self.on_change = on_change
+        self.interval = interval
+        self.signature: Optional[tuple[int, int]] = None
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self.__watch, name="config-watcher", daemon=True)
+
+    def load(self) -> VoiceConfig:
+        """
+        Read and validate the file now, recording its signature.
+
+        Raises:
+            InvalidConfig: If the file cannot be parsed or fails validation.
+        """
+        # Taken before reading so a write racing with the read triggers another reload
+        self.signature = self.__signature()
+        try:
+            with open(self.path, "r") as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            raise InvalidConfig(f"Cannot read {self.path}: {e}")
+        return VoiceConfig.from_dict(data)
+
+    def start(self) -> None:
+        """Start watching; call `load` first to apply the current file."""
+        self.thread.start()
+
+    def stop(self) -> None:
+        self.stopped.set()
+
+    def __signature(self) -> Optional[tuple[int, int]]:
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def __watch(self) -> None:
+        while not self.stopped.wait(self.interval):
+            if self.__signature() == self.signature:
+                continue
+            try:
+                config = self.load()
+            except InvalidConfig as e:
+                logging.error(f"Rejected config change, keeping current settings: {e}")
+                continue
+            self.on_change(config)
@@ -1,41 +1,357 @@
-import google.generativeai as genai
-from google.generativeai import ChatSession
+import copy
+import logging
 import os
+import re
+import threading
+import time
+from concurrent.futures import CancelledError, Future, ThreadPoolExecutor
+from collections import OrderedDict, deque
+from typing import Callable, Iterator, Optional
 
-path = 'configurations/keys/gemini.key' # Path to your file that contain your API KEY
-try:
+from CustomExeption.CustomExeption import RateLimited
+from Models.Metrics import METRICS
+
+KEY_PATH = 'configurations/keys/gemini.key' # Path to your file that contain your API KEY
+
+def load_key(path: str = KEY_PATH) -> str:
+    """Read the Gemini API key, skipping PEM-style ----- header lines."""
     with open(path, 'r') as file:
         lines = file.readlines()
-        private_key_lines = [line.strip() for line in lines
-                                if not line.startswith('-----')]
-        KEY = ''.join(private_key_lines)
-except FileNotFoundError:
-    print(f"File '{path}' not found.")
-except Exception as e:
-    print(f"Error reading file '{path}': {e}")
-    
+    private_key_lines = [line.strip() for line in lines
+                            if not line.startswith('-----')]
+    return ''.join(private_key_lines)
+
+# Whitespace after sentence-ending punctuation, or a line break
+SENTENCE_BREAK = re.compile(r'(?<=[.!?…])\s+|\n+')
+
+class TokenBudget:
+    """
+    Requests-per-minute and tokens-per-minute limits over a sliding one-minute
+    window. Callers that do not fit wait their turn, or are rejected straight
+    away when the wait would exceed `max_wait`.
+    """
+
+    def __init__(self, requests_per_minute: int = 15, tokens_per_minute: int = 1_000_000,
+                 max_wait: float = 30.0) -> None:
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.max_wait = max_wait
+        self.events: deque[tuple[float, int]] = deque()
+        self.tokens = 0
+        self.condition = threading.Condition()
+
+    def acquire(self, tokens: int) -> float:
+        """
+        Spend one request and `tokens` tokens, blocking until the window allows it.
+
+        Returns:
+            float: Seconds spent waiting.
+
+        Raises:
+            RateLimited: If the request can never fit or would wait longer than `max_wait`.
+        """
+        if tokens > self.tokens_per_minute:
+            raise RateLimited(f"Request needs {tokens} tokens, budget is {self.tokens_per_minute}/min")
+        start = time.monotonic()
+        with self.condition:
+            admitted = False
+            while True:
+                now = time.monotonic()
+                while self.events and self.events[0][0] <= now - 60:
+                    self.tokens -= self.events.popleft()[1]
+                retry_at = self.__retry_at(tokens)
+                if retry_at <= now:
+                    self.events.append((now, tokens))
+                    self.tokens += tokens
+                    self.condition.notify_all()
+                    return now - start if admitted else 0.0
+                # Shed before queueing, never after, so admitted callers are not failed late
+                if not admitted and retry_at - now > self.max_wait:
+                    raise RateLimited(f"Gemini budget exhausted, next slot in {retry_at - now:.0f}s")
+                admitted = True
+                self.condition.wait(retry_at - now)
+
+    def __retry_at(self, tokens: int) -> float:
+        excess_requests = len(self.events) + 1 - self.requests_per_minute
+        excess_tokens = self.tokens + tokens - self.tokens_per_minute
+        if excess_requests <= 0 and excess_tokens <= 0:
+            return 0.0
+        for timestamp, spent in self.events:
+            excess_requests -= 1
+            excess_tokens -= spent
+            if excess_requests <= 0 and excess_tokens <= 0:
+                return timestamp + 60
+        return self.events[-1][0] + 60
+
+
+def estimate_tokens(contents: list, reply_tokens: int = 256) -> int:
+    """Rough token count (four characters per token) for a request plus its reply."""
+    chars = 0
+    for content in contents:
+        parts = content['parts'] if isinstance(content, dict) else content.parts
+        chars += sum(len(part if isinstance(part, str) else part.text) for part in parts)
+    return chars // 4 + reply_tokens
+
+
+def normalize_prompt(text: str) -> str:
+    return " ".join(text.split()).casefold()
+
+
+class GeminiRequest:
+    """Handle for a reply being generated in the background."""
+
+    def __init__(self, text: str) -> None:
+        self.text = text
+        self.cancelled = threading.Event()
+        self.future: Optional[Future] = None
+        self.release: Optional[Callable[[], None]] = None  # Gives up this caller's share of the model call
+
+    def cancel(self) -> None:
+        """
+        Drop the request if it is still queued, or stop reading the reply
+        stream. A model call shared with other callers keeps running until
+        the last of them cancels.
+        """
+        if self.cancelled.is_set():
+            return
+        self.cancelled.set()
+        self.future.cancel()
+        if self.release is not None:
+            self.release()
+
+    def done(self) -> bool:
+        return self.future.done()
+
+    def result(self, timeout: Optional[float] = None) -> str:
+        return self.future.result(timeout)
+
+    def add_done_callback(self, fn: Callable[["GeminiRequest"], None]) -> None:
+        """Call `fn(request)` once the reply is ready, has failed or was cancelled."""
+        self.future.add_done_callback(lambda _: fn(self))
+
+
+class _SharedCall:
+    """One model call and the number of callers still waiting for it."""
+    __slots__ = ("future", "cancelled", "callers")
+
+    def __init__(self) -> None:
+        self.future: Optional[Future] = None
+        self.cancelled = threading.Event()
+        self.callers = 1
+
+
 class GeminiTranscript:
-    def __init__(self, model = 'gemini-1.5-flash', key = ...) -> None:
-        self.model = genai.GenerativeModel(model)
+    def __init__(self, model = 'gemini-1.5-flash', key = ..., max_concurrency: int = 2, timeout: float = 30.0,
+                 cache_ttl: float = 300.0, cache_size: int = 256, budget: Optional[TokenBudget] = None,
+                 max_turns: int = 20) -> None:
+        # Imported here because the SDK alone takes about a second to import
+        import google.generativeai as genai
+        from google.generativeai import ChatSession
+        self.genai = genai
+        # `model` is a model name, or any object with a compatible `generate_content` (e.g. a local fake)
+        self.model = genai.GenerativeModel(model) if isinstance(model, str) else model
         self.session = ChatSession(self.model)
+        self.history_lock = threading.Lock()
+        # Question/answer pairs kept as context; older ones are dropped so the
+        # history, and the tokens sent with every request, stop growing
+        self.max_turns = max_turns
+        self.timeout = timeout
+        self.executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="gemini")
+        self.budget = budget if budget is not None else TokenBudget()
+        self.cache_ttl = cache_ttl
+        self.cache_size = cache_size
+        self.cache: OrderedDict[str, tuple[float, str]] = OrderedDict()
+        self.inflight: dict[str, _SharedCall] = {}
+        self.lock = threading.Lock()
+        self.stats = {"requests": 0, "cache_hits": 0, "coalesced": 0, "throttled": 0, "shed": 0}
+        self.owner = True  # False for a `conversation`, which must not shut the shared pool down
         try:
             if key == ...:
-                self.key = KEY
+                self.key = load_key()
             else:
                 self.key = key
-        except:
+        except Exception as e:
+            logging.warning(f"Could not read '{KEY_PATH}' ({e}), using GOOGLE_API_KEY")
             self.key = '' # Input your Gemini API KEY
             self.key = os.environ["GOOGLE_API_KEY"]
         genai.configure(api_key=self.key)
         
+    def conversation(self) -> "GeminiTranscript":
+        """
+        A transcript with its own conversation history that shares this one's
+        model, worker pool, rate limit, reply cache and in-flight requests, e.g.
+        one per meeting. Closing it leaves the shared parts running.
+        """
+        from google.generativeai import ChatSession
+        other = copy.copy(self)
+        other.session = ChatSession(self.model)
+        other.history_lock = threading.Lock()
+        other.owner = False
+        return other
+
     def set_key(self, key):
         self.key = key
-        genai.configure(api_key=self.key)
+        self.genai.configure(api_key=self.key)
     
-    def respone(self, text: str):
+    def respone_stream(self, text: str, timeout: Optional[float] = None,
+                       cancelled: Optional[threading.Event] = None) -> Iterator[str]:
+        """Yield the reply one complete sentence at a time, as soon as the chunks containing it arrive."""
         prompt = 'Please answer as short as you can:'
-        response =  self.session.send_message(f"{prompt}\n{text}\n")
+        message = {'role': 'user', 'parts': [f"{prompt}\n{text}\n"]}
+        timeout = self.timeout if timeout is None else timeout
+
+        # Several requests may be in flight, so the shared session is only
+        # touched under the lock: once to snapshot it, once to record the turn
+        with self.history_lock:
+            history = list(self.session.history)
+        try:
+            waited = self.budget.acquire(estimate_tokens(history + [message]))
+        except RateLimited:
+            self.__count("shed")
+            raise
+        if waited > 0:
+            self.__count("throttled")
+        # The timeout covers the model call only, not the wait for a budget slot
+        deadline = time.monotonic() + timeout
+        start = time.perf_counter()
+        first = None
         final = ''
-        for chunk in response:
-            final += chunk.text + '\n'
-        return final.strip()
\ No newline at end of file
+        pending = ''
+        try:
+            response = self.model.generate_content(history + [message], stream=True,
+                                                   request_options={'timeout': timeout})
+            for chunk in response:
+                if cancelled is not None and cancelled.is_set():
+                    raise CancelledError()
+                if time.monotonic() > deadline:
+                    raise TimeoutError(f"Gemini reply took longer than {timeout}s")
+                final += chunk.text
+                sentences = SENTENCE_BREAK.split(pending + chunk.text)
+                pending = sentences.pop()
+                for sentence in sentences:
+                    if sentence.strip():
+                        if first is None:
+                            first = time.perf_counter() - start
+                            METRICS.histogram("gemini_first_sentence_seconds",
+                                              "Time until the first complete reply sentence").observe(first)
+                        yield sentence.strip()
+            if pending.strip():
+                yield pending.strip()
+        except CancelledError:
+            raise
+        except Exception:
+            METRICS.counter("errors_total", "Errors by stage", stage="gemini").inc()
+            raise
+        METRICS.observe_stage("gemini", time.perf_counter() - start)
+
+        with self.history_lock:
+            history = list(self.session.history) + [message, {'role': 'model', 'parts': [final.strip()]}]
+            self.session.history = history[-2 * self.max_turns:] if self.max_turns > 0 else []
+
+    def respone(self, text: str, timeout: Optional[float] = None, cancelled: Optional[threading.Event] = None):
+        return ' '.join(self.respone_stream(text, timeout, cancelled))
+
+    def submit(self, text: str, timeout: Optional[float] = None,
+               on_sentence: Optional[Callable[[str], None]] = None) -> GeminiRequest:
+        """
+        Generate a reply on the background pool. At most `max_concurrency`
+        requests run at once; the rest wait in the pool's queue.
+
+        Prompts that normalize to the same text share one model call while it is
+        in flight, and the answer is reused for `cache_ttl` seconds afterwards.
+
+        If `on_sentence` is given it is called with each sentence as soon as it is
+        complete; the request's result is still the full reply.
+        """
+        request = GeminiRequest(text)
+        request.future = Future()
+        key = normalize_prompt(text)
+        with self.lock:
+            self.stats["requests"] += 1
+            cached = self.cache.get(key)
+            if cached is not None and cached[0] > time.monotonic():
+                self.stats["cache_hits"] += 1
+                self.cache.move_to_end(key)
+                primary = Future()
+                primary.set_result(cached[1])
+            elif key in self.inflight:
+                self.stats["coalesced"] += 1
+                shared = self.inflight[key]
+                shared.callers += 1
+                primary = shared.future
+                request.release = lambda: self.__release(key, shared)
+            else:
+                shared = self.inflight[key] = _SharedCall()
+                if on_sentence is None:
+                    primary = self.executor.submit(self.respone, text, timeout, shared.cancelled)
+                else:
+                    # Sentences stop reaching this caller once it cancels, even if others keep the call going
+                    feed = lambda sentence: None if request.cancelled.is_set() else on_sentence(sentence)
+                    primary = self.executor.submit(self.__stream_to, feed, text, timeout, shared.cancelled)
+                    on_sentence = None  # Already streamed
+                shared.future = primary
+                primary.add_done_callback(lambda done, key=key, shared=shared: self.__settle(key, shared))
+                request.release = lambda: self.__release(key, shared)
+
+        primary.add_done_callback(lambda done: self.__follow(done, request, on_sentence))
+        return request
+
+    def __release(self, key: str, shared: _SharedCall) -> None:
+        with self.lock:
+            shared.callers -= 1
+            if shared.callers > 0:
+                return
+            if self.inflight.get(key) is shared:
+                del self.inflight[key]
+        # Nobody is waiting for the reply any more
+        shared.cancelled.set()
+        shared.future.cancel()
+
+    def __settle(self, key: str, shared: _SharedCall) -> None:
+        done = shared.future
+        with self.lock:
+            if self.inflight.get(key) is shared:
+                del self.inflight[key]
+            if not done.cancelled() and done.exception() is None:
+                self.cache[key] = (time.monotonic() + self.cache_ttl, done.result())
+                self.cache.move_to_end(key)
+                while len(self.cache) > self.cache_size:
+                    self.cache.popitem(last=False)
+
+    @staticmethod
+    def __follow(done: Future, request: GeminiRequest, on_sentence: Optional[Callable[[str], None]]) -> None:
+        if done.cancelled():
+            request.future.cancel()
+            return
+        # False if the caller has cancelled; from here on it no longer can
+        if not request.future.set_running_or_notify_cancel():
+            return
+        if done.exception() is not None:
+            request.future.set_exception(done.exception())
+        else:
+            if on_sentence is not None:
+                for sentence in SENTENCE_BREAK.split(done.result()):
+                    if sentence.strip():
+                        on_sentence(sentence.strip())
+            request.future.set_result(done.result())
+
+    def __count(self, name: str) -> None:
+        with self.lock:
+            self.stats[name] += 1
+
+    def snapshot(self) -> dict:
+        """Return the request, cache hit, coalesced, throttled and shed counters."""
+        with self.lock:
+            return dict(self.stats)
+
+    def __stream_to(self, on_sentence: Callable[[str], None], text: str, timeout: Optional[float],
+                    cancelled: threading.Event) -> str:
+        sentences = []
+        for sentence in self.respone_stream(text, timeout, cancelled):
+            sentences.append(sentence)
+            on_sentence(sentence)
+        return ' '.join(sentences)
+
+    def close(self) -> None:
+        if self.owner:
+            self.executor.shutdown(wait=False, cancel_futures=True)
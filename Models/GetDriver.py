@@ -4,6 +4,11 @@ from selenium.webdriver.chrome.options import Options as ChromeOptions
 from selenium.webdriver.edge.options import Options as EdgeOptions
 from selenium.webdriver.safari.options import Options as SafariOptions
 from enum import Enum
+from typing import Optional
+import hashlib
+import logging
+import os
+import re
 
 class DriverType(Enum):
     EDGE = "edge"
@@ -12,7 +17,20 @@ class DriverType(Enum):
     SAFARI = "safari"
     OTHER = "other"  # Other web browser
 
-def get_default_options(driver_type: DriverType):
+def profile_dir_for(email: str, root: str = "data/profiles") -> str:
+    """
+    Browser profile directory for an account, so its Google session survives restarts.
+    The folder holds login cookies; keep it private.
+    """
+    slug = re.sub(r"[^a-z0-9]+", "_", email.lower()).strip("_")[:40]
+    digest = hashlib.sha1(email.lower().encode("utf-8")).hexdigest()[:8]
+    return os.path.abspath(os.path.join(root, f"{slug}_{digest}"))
+
+def get_default_options(driver_type: DriverType, block_media: bool = True, profile_dir: Optional[str] = None,
+                        headless: bool = False, low_resource: bool = False):
+    # Blocking the microphone and camera makes Meet join with both off, so the
+    # join flow has no toggles to click (1 = allow, 2 = block)
+    media = 2 if block_media else 1
     options_mapping = {
         DriverType.CHROME: ChromeOptions,
         DriverType.EDGE: EdgeOptions,
@@ -25,10 +43,22 @@ def get_default_options(driver_type: DriverType):
     
     if isinstance(options, (ChromeOptions, EdgeOptions)):
         options.add_argument("--disable-blink-features=AutomationControlled")
-        options.add_argument("--start-maximized")
+        if headless:
+            options.add_argument("--headless=new")
+            options.add_argument("--window-size=1280,800")
+        elif not low_resource:
+            options.add_argument("--start-maximized")
+        if low_resource:
+            options.add_argument("--disable-gpu")
+            options.add_argument("--disable-extensions")
+            options.add_argument("--disable-dev-shm-usage")
+            options.add_argument("--mute-audio")  # Speech is played by the bot, not the tab
+        if profile_dir:
+            os.makedirs(profile_dir, exist_ok=True)
+            options.add_argument(f"--user-data-dir={profile_dir}")
         options.add_experimental_option("prefs", {
-            "profile.default_content_setting_values.media_stream_mic": 1,
-            "profile.default_content_setting_values.media_stream_camera": 1,
+            "profile.default_content_setting_values.media_stream_mic": media,
+            "profile.default_content_setting_values.media_stream_camera": media,
             "profile.default_content_setting_values.geolocation": 0,
             "profile.default_content_setting_values.notifications": 1,
         })
@@ -36,14 +66,38 @@ def get_default_options(driver_type: DriverType):
             options.binary_location = "C:\\Program Files\\CocCoc\\Browser\\Application\\browser.exe"  # Path to your browser
 
     elif isinstance(options, FirefoxOptions):
-        options.set_preference("permissions.default.microphone", 1)
-        options.set_preference("permissions.default.camera", 1)
+        options.set_preference("permissions.default.microphone", media)
+        options.set_preference("permissions.default.camera", media)
         options.set_preference("permissions.default.geo", 2)
         options.set_preference("dom.webnotifications.enabled", True)
+        if headless:
+            options.add_argument("-headless")
+        if low_resource:
+            options.set_preference("media.volume_scale", "0.0")
+            options.set_preference("layers.acceleration.disabled", True)
+        if profile_dir:
+            os.makedirs(profile_dir, exist_ok=True)
+            options.add_argument("-profile")
+            options.add_argument(profile_dir)
+
+    elif profile_dir or headless:
+        logging.warning(f"{driver_type.value} does not support a saved profile or headless mode; ignoring")
     
     return options
 
-def get_driver(driver_type: DriverType):
+def get_driver(driver_type: DriverType, block_media: bool = True, profile_dir: Optional[str] = None,
+               headless: bool = False, low_resource: bool = False):
+    """
+    Start a browser.
+
+    Args:
+        driver_type (DriverType): Browser to start.
+        block_media (bool): Deny microphone and camera so Meet joins with both off (default: True).
+        profile_dir (Optional[str]): Persistent profile directory (see `profile_dir_for`) so the
+            Google session is reused across runs; a throwaway profile if None.
+        headless (bool): Run without a window (Chromium and Firefox).
+        low_resource (bool): No maximized window, GPU, extensions or tab audio.
+    """
     driver_mapping = {
         DriverType.EDGE: webdriver.Edge,
         DriverType.FIREFOX: webdriver.Firefox,
@@ -52,4 +106,5 @@ def get_driver(driver_type: DriverType):
         DriverType.OTHER: webdriver.Chrome,  # Using ChromeDriver for other
     }
     
-    return driver_mapping.get(driver_type, webdriver.Chrome)(options=get_default_options(driver_type))
+    return driver_mapping.get(driver_type, webdriver.Chrome)(
+        options=get_default_options(driver_type, block_media, profile_dir, headless, low_resource))
@@ -0,0 +1,199 @@
+import atexit
+import gzip
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import shutil
+import threading
+import time
+
+# Pass as `extra=` on log calls made every poll or every message; see `Summarizer`
+REPEATED = {"repeated": True}
+
+FORMAT = "%(asctime)s - %(levelname)s - %(message)s"
+
+
+class RotatingGzipHandler(logging.handlers.RotatingFileHandler):
+    """
+    File handler that starts a new file once the current one reaches
+    `max_bytes` or is `interval` seconds old, whichever comes first, and
+    gzips the old one to `<name>.1.gz`, shifting earlier backups up to
+    `backups`. Meant to run behind a queue, so the compression never
+    happens on the thread that logged.
+    """
+
+    def __init__(self, path: str, max_bytes: int = 50 * 1024 * 1024, interval: float = 24 * 3600,
+                 backups: int = 10) -> None:
+        """
+        Args:
+            path (str): Current log file.
+            max_bytes (int): Size that triggers a rotation; 0 for none (default: 50 MiB).
+            interval (float): Age in seconds that triggers a rotation; 0 for none (default: one day).
+            backups (int): Compressed files kept (default: 10).
+        """
+        super().__init__(path, maxBytes=max_bytes, backupCount=backups, encoding="utf-8", delay=True)
+        self.interval = interval
+        self.rollover_at = time.time() + interval if interval else float("inf")
+        self.namer = lambda name: name + ".gz"
+        self.rotator = self.__compress
+
+    def shouldRollover(self, record: logging.LogRecord) -> bool:
+        if time.time() >= self.rollover_at:
+            return True
+        return bool(super().shouldRollover(record))
+
+    def doRollover(self) -> None:
+        super().doRollover()
+        if self.interval:
+            self.rollover_at = time.time() + self.interval
+
+    @staticmethod
+    def __compress(source: str, destination: str) -> None:
+        if not os.path.exists(source):
+            return
+        with open(source, "rb") as f_in, gzip.open(destination, "wb") as f_out:
+            shutil.copyfileobj(f_in, f_out)
+        os.remove(source)
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: time, level, logger, thread, message and traceback if any."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {"ts": round(record.created, 3), "level": record.levelname, "logger": record.name,
+                 "thread": record.threadName, "msg": record.getMessage()}
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        if getattr(record, "suppressed", 0):
+            entry["suppressed"] = record.suppressed
+        return json.dumps(entry, ensure_ascii=False)
+
+
+class Summarizer(logging.Filter):
+    """
+    Rate limits records logged with `extra=REPEATED`: per call site, the
+    first one in each `interval` is written and the rest are only counted.
+    The next record written from that site says how many were dropped, and
+    `flush` writes the counts still pending. Other records pass untouched.
+    """
+
+    def __init__(self, interval: float = 60.0) -> None:
+        """
+        Args:
+            interval (float): Seconds between records written from one call site (default: 60).
+        """
+        super().__init__()
+        self.interval = interval
+        self.sites: dict[tuple, list] = {}  # (path, line) -> [next allowed time, dropped, last record]
+        self.lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if not getattr(record, "repeated", False):
+            return True
+        site = (record.pathname, record.lineno)
+        with self.lock:
+            state = self.sites.get(site)
+            if state is not None and record.created < state[0]:
+                state[1] += 1
+                state[2] = record
+                return False
+            dropped = state[1] if state is not None else 0
+            self.sites[site] = [record.created + self.interval, 0, None]
+        if dropped:
+            record.suppressed = dropped
+            record.msg = f"{record.getMessage()} (+{dropped} similar in the last {self.interval:g}s)"
+            record.args = None
+        return True
+
+    def flush(self) -> None:
+        """Write one line for every call site with dropped records."""
+        with self.lock:
+            pending = [(state[1], state[2]) for state in self.sites.values() if state[1]]
+            self.sites.clear()
+        for dropped, record in pending:
+            record.msg = f"{record.getMessage()} (+{dropped - 1} similar before it)" if dropped > 1 \
+                else record.getMessage()
+            record.args = None
+            record.repeated = False
+            record.suppressed = dropped - 1
+            logging.getLogger(record.name).handle(record)
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    # Same process on both ends of the queue, so the record is passed as is;
+    # formatting, tracebacks included, is left to the writer thread
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+class LogWriter:
+    """
+    Handle to the background logging set up by `setup_logging`: records are
+    put on a queue by the logging thread and written, rotated and compressed
+    by a listener thread.
+    """
+
+    def __init__(self, handler: logging.Handler, summarizer: Summarizer) -> None:
+        self.handler = handler
+        self.summarizer = summarizer
+        self.queue: queue.SimpleQueue = queue.SimpleQueue()
+        self.queue_handler = _QueueHandler(self.queue)
+        self.queue_handler.addFilter(summarizer)
+        self.listener = logging.handlers.QueueListener(self.queue, handler)
+        self.lock = threading.Lock()
+        self.running = False
+
+    def start(self) -> "LogWriter":
+        with self.lock:
+            if not self.running:
+                self.listener.start()
+                self.running = True
+        return self
+
+    def stop(self) -> None:
+        """Write pending summaries, then everything still queued, and close the file."""
+        with self.lock:
+            if not self.running:
+                return
+            self.summarizer.flush()
+            self.listener.stop()
+            self.running = False
+        self.handler.close()
+
+
+def setup_logging(directory: str = 'logs', level: int = logging.INFO, max_bytes: int = 50 * 1024 * 1024,
+                  interval: float = 24 * 3600, backups: int = 10, json_lines: bool = False,
+                  summary_interval: float = 60.0) -> LogWriter:
+    """
+    Send log records to a new timestamped file through a background writer.
+    Called by the entry point rather than at import, so importing the package
+    has no side effects. The writer is stopped, and its queue flushed, at exit.
+
+    Args:
+        directory (str): Folder for the log files (default: "logs").
+        level (int): Minimum level written (default: INFO).
+        max_bytes (int): Rotate once the file reaches this size; 0 for never (default: 50 MiB).
+        interval (float): Rotate once the file is this many seconds old; 0 for never (default: one day).
+        backups (int): Rotated, gzipped files kept (default: 10).
+        json_lines (bool): Write one JSON object per line to `.jsonl` instead of text (default: False).
+        summary_interval (float): Seconds between lines from one call site logged with
+            `extra=REPEATED` (default: 60).
+
+    Returns:
+        LogWriter: The running writer; `writer.handler.baseFilename` is the file path.
+    """
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"AI{int(time.time())}.{'jsonl' if json_lines else 'log'}")
+    handler = RotatingGzipHandler(path, max_bytes=max_bytes, interval=interval, backups=backups)
+    handler.setFormatter(JsonFormatter() if json_lines else logging.Formatter(FORMAT))
+    writer = LogWriter(handler, Summarizer(summary_interval)).start()
+    logging.basicConfig(level=level, handlers=[writer.queue_handler], force=True)
+    atexit.register(writer.stop)
+    logging.info("Starting program!")
+    return writer
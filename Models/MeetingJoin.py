@@ -0,0 +1,248 @@
+from selenium.webdriver.chrome.webdriver import WebDriver
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException, WebDriverException
+
+from CustomExeption.CustomExeption import SessionExpired
+
+import logging
+import time
+from enum import Enum
+from typing import Dict, List, Optional, Tuple
+
+Locator = Tuple[str, str]
+
+LOGIN_URL = "https://accounts.google.com/ServiceLogin?hl=en&passive=true&continue=https://www.google.com/&ec=GAZAAQ"
+# Cookies Google sets for a signed-in browser
+SESSION_COOKIES = {"SID", "__Secure-1PSID", "__Secure-3PSID"}
+
+# Each page element is matched by several strategies raced against each other,
+# so a selector that stops matching (UI language, layout change) costs nothing
+# as long as another one still does. Stable attributes come first, the original
+# positional XPaths last.
+EMAIL_INPUT: List[Locator] = [
+    (By.ID, "identifierId"),
+    (By.CSS_SELECTOR, "input[type='email']"),
+]
+PASSWORD_INPUT: List[Locator] = [
+    (By.CSS_SELECTOR, "input[type='password'][name='Passwd']"),
+    (By.XPATH, '//*[@id="password"]/div[1]/div/div[1]/input'),
+]
+MIC_ON: List[Locator] = [
+    (By.CSS_SELECTOR, "div[role='button'][data-is-muted='false'][aria-label*='microphone' i]"),
+    (By.XPATH, "//div[@role='button' and @aria-label='Turn off microphone']"),
+    (By.XPATH, "//div[@role='button' and @aria-label='Tắt micrô']"),
+]
+CAMERA_ON: List[Locator] = [
+    (By.CSS_SELECTOR, "div[role='button'][data-is-muted='false'][aria-label*='camera' i]"),
+    (By.XPATH, "//div[@role='button' and @aria-label='Turn off camera']"),
+    (By.XPATH, "//div[@role='button' and @aria-label='Tắt máy ảnh']"),
+]
+JOIN_BUTTON: List[Locator] = [
+    (By.CSS_SELECTOR, "button[jsname='Qx7uuf']"),
+    (By.XPATH, "//button[.//span[text()='Join now' or text()='Ask to join'"
+               " or text()='Tham gia ngay' or text()='Yêu cầu tham gia']]"),
+    (By.CLASS_NAME, "XCoPyb"),
+]
+# Present only once the bot is inside the call
+IN_CALL: List[Locator] = [
+    (By.CSS_SELECTOR, "button[jsname='CQylAd']"),
+    (By.CSS_SELECTOR, "[aria-label*='Leave call' i], [aria-label='Rời khỏi cuộc gọi']"),
+]
+WAITING_ROOM: List[Locator] = [
+    (By.XPATH, "//*[contains(text(), 'Asking to join') or contains(text(), 'Đang yêu cầu tham gia')]"),
+]
+CHAT_BUTTON: List[Locator] = [
+    (By.CSS_SELECTOR, "button[aria-label*='Chat with everyone' i], button[aria-label*='Trò chuyện với mọi người']"),
+    (By.CSS_SELECTOR, "button[data-panel-id='2']"),
+    (By.XPATH, '//*[@id="yDmH0d"]/c-wiz/div/div/div[36]/div[4]/div[10]/div/div/div[3]/nav/div[3]/div'),
+]
+CHAT_PANEL: List[Locator] = [
+    (By.CSS_SELECTOR, "textarea[aria-label*='message' i], textarea[aria-label*='tin nhắn' i]"),
+    (By.CSS_SELECTOR, ".Ss4fHf"),
+]
+
+
+class JoinState(Enum):
+    """Steps of getting from a fresh browser to an open chat panel."""
+    LOGIN = "login"
+    LOBBY = "lobby"                # Meeting page loaded, join button showing
+    WAITING = "waiting"            # Asked to join, waiting for the host
+    IN_CALL = "in_call"
+    CHAT_OPEN = "chat_open"
+    FAILED = "failed"
+
+
+def visible(locators: List[Locator]):
+    """Condition met by the first element of any strategy that is visible."""
+    return EC.any_of(*(EC.visibility_of_element_located(locator) for locator in locators))
+
+
+def clickable(locators: List[Locator]):
+    """Condition met by the first element of any strategy that can be clicked."""
+    return EC.any_of(*(EC.element_to_be_clickable(locator) for locator in locators))
+
+
+def present(locators: List[Locator]):
+    """Condition met as soon as any strategy finds an element."""
+    return EC.any_of(*(EC.presence_of_element_located(locator) for locator in locators))
+
+
+class MeetingJoiner:
+    """
+    Signs in and joins a meeting as a small state machine. Every step waits on
+    a concrete page condition (an element appearing, the URL changing) instead
+    of sleeping, and every element is matched by several selectors at once.
+    """
+
+    def __init__(self, driver: WebDriver, timeout: float = 20.0, admission_timeout: float = 300.0,
+                 poll: float = 0.1) -> None:
+        """
+        Args:
+            driver (WebDriver): Browser to drive.
+            timeout (float): Longest wait for any page to reach the next state (default: 20 s).
+            admission_timeout (float): Longest wait for the host to let the bot in (default: 5 minutes).
+            poll (float): Seconds between condition checks (default: 0.1).
+        """
+        self.driver = driver
+        self.timeout = timeout
+        self.admission_timeout = admission_timeout
+        self.poll = poll
+        self.state = JoinState.LOGIN
+        self.timings: Dict[str, float] = {}
+
+    def wait(self, condition, timeout: Optional[float] = None):
+        return WebDriverWait(self.driver, self.timeout if timeout is None else timeout,
+                             poll_frequency=self.poll).until(condition)
+
+    def session_valid(self) -> bool:
+        """
+        Check whether the browser profile already holds a Google session, so
+        `login` can be skipped. Chromium browsers are checked through their
+        cookie store without loading a page; others by opening the account page.
+        """
+        start = time.monotonic()
+        try:
+            cookies = self.driver.execute_cdp_cmd("Network.getAllCookies", {})["cookies"]
+            now = time.time()
+            valid = any(cookie["name"] in SESSION_COOKIES and cookie["domain"].endswith("google.com")
+                        and (cookie.get("expires", -1) <= 0 or cookie["expires"] > now)
+                        for cookie in cookies)
+        except (AttributeError, KeyError, WebDriverException):
+            self.driver.get("https://myaccount.google.com/?hl=en")
+            self.wait(EC.any_of(EC.url_contains("accounts.google.com"), EC.url_contains("myaccount.google.com")))
+            valid = "accounts.google.com" not in self.driver.current_url
+        self.timings["session_check"] = time.monotonic() - start
+        return valid
+
+    def login(self, email: str, password: str) -> None:
+        """
+        Sign in to Google. Returns as soon as the browser lands on the
+        post-login page; a profile that is already signed in skips the form.
+        """
+        start = time.monotonic()
+        self.state = JoinState.LOGIN
+        # A leftover implicit wait would add its full length to every selector that misses
+        self.driver.implicitly_wait(0)
+        self.driver.get(LOGIN_URL)
+
+        signed_in = EC.url_contains("www.google.com")
+        field = self.wait(EC.any_of(signed_in, visible(EMAIL_INPUT)))
+        if field is not True:
+            field.send_keys(email)
+            self.driver.find_element(By.ID, "identifierNext").click()
+            logging.info("Email entered and proceeding to password input")
+
+            field = self.wait(EC.any_of(signed_in, visible(PASSWORD_INPUT)))
+            if field is not True:
+                field.send_keys(password)
+                self.driver.find_element(By.ID, "passwordNext").click()
+                logging.info("Password entered and login submitted")
+                self.wait(signed_in)
+        self.timings["login"] = time.monotonic() - start
+        logging.info(f"Google login successful in {self.timings['login']:.1f}s")
+
+    def join(self, meeting_link: str, open_chat: bool = True) -> JoinState:
+        """
+        Open the meeting once, join with microphone and camera off and open the
+        chat panel.
+
+        Args:
+            meeting_link (str): Google Meet URL.
+            open_chat (bool): Open the chat side panel after joining (default: True).
+
+        Returns:
+            JoinState: CHAT_OPEN (or IN_CALL if `open_chat` is False) on success.
+
+        Raises:
+            TimeoutException: If a step did not reach its next state in time.
+            SessionExpired: If Meet sent the browser to the Google sign-in page.
+        """
+        start = time.monotonic()
+        self.driver.implicitly_wait(0)
+        self.driver.get(meeting_link)
+
+        try:
+            # Lobby, or straight into the call when rejoining
+            # or the sign-in form when the saved session was revoked
+            found = self.wait(EC.any_of(clickable(JOIN_BUTTON), present(IN_CALL), visible(EMAIL_INPUT)))
+            if self.__matches(found, EMAIL_INPUT):
+                raise SessionExpired()
+            if not self.__matches(found, IN_CALL):
+                self.state = JoinState.LOBBY
+                self.timings["lobby"] = time.monotonic() - start
+                self.__media_off()
+                found.click()
+                logging.info("Joining the Meeting room")
+
+                found = self.wait(EC.any_of(present(IN_CALL), present(WAITING_ROOM)))
+                if not self.__matches(found, IN_CALL):
+                    self.state = JoinState.WAITING
+                    logging.info("Waiting for the host to admit the bot")
+                    self.wait(present(IN_CALL), self.admission_timeout)
+            self.state = JoinState.IN_CALL
+            self.timings["in_call"] = time.monotonic() - start
+
+            if open_chat:
+                try:
+                    self.open_chat()
+                except TimeoutException:
+                    # Still in the call; the panel can be opened by hand
+                    logging.warning("Chat button not found")
+        except TimeoutException:
+            logging.error(f"Joining stalled in state {self.state.value}")
+            self.state = JoinState.FAILED
+            raise
+        logging.info(f"Join timings: {', '.join(f'{k} {v:.1f}s' for k, v in self.timings.items())}")
+        return self.state
+
+    def open_chat(self) -> None:
+        """Open the chat side panel unless it is already showing."""
+        start = time.monotonic()
+        found = self.wait(EC.any_of(visible(CHAT_PANEL), clickable(CHAT_BUTTON)))
+        if not self.__matches(found, CHAT_PANEL):
+            found.click()
+            logging.info("Clicked on chat button")
+            self.wait(visible(CHAT_PANEL))
+        self.state = JoinState.CHAT_OPEN
+        self.timings["open_chat"] = time.monotonic() - start
+
+    def __media_off(self) -> None:
+        # With media blocked in the browser profile Meet already shows both off;
+        # only toggles that are currently on are clicked
+        for name, locators in (("Microphone", MIC_ON), ("Camera", CAMERA_ON)):
+            for locator in locators:
+                elements = self.driver.find_elements(*locator)
+                if elements and elements[0].is_displayed():
+                    elements[0].click()
+                    logging.info(f"{name} turned off")
+                    break
+
+    def __matches(self, element, locators: List[Locator]) -> bool:
+        if element is True:
+            return True
+        try:
+            return any(element in self.driver.find_elements(*locator) for locator in locators)
+        except WebDriverException:
+            return False
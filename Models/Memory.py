@@ -0,0 +1,204 @@
+import gc
+import logging
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from typing import List, Optional, Sequence
+
+from Models.LogWriter import REPEATED
+from Models.Metrics import METRICS
+
+
+def rss_mb() -> float:
+    """Current resident set size in MiB (peak RSS where the current one is not available)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource  # Not on Windows
+    except ImportError:
+        return 0.0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+class MemoryManager:
+    """
+    Garbage collection and memory tracing for meetings that run for hours.
+
+    Objects alive when the read loop first polls (modules, the SDKs, the
+    speech engine) are moved out of the collector's reach with `gc.freeze`,
+    the automatic young-generation collections are made less frequent, and
+    full collections run only from `poll` on an idle iteration, at most
+    every `idle_interval` seconds, or after `max_interval` seconds if the
+    chat never goes quiet. With `trace=True`, `snapshot` and `diff` report
+    which modules allocated what, via tracemalloc.
+
+    One manager is meant per process; rooms under a supervisor share it.
+    """
+
+    def __init__(self, thresholds: Sequence[int] = (50_000, 20, 100), idle_interval: float = 30.0,
+                 max_interval: float = 300.0, trace: bool = False, trace_frames: int = 1) -> None:
+        """
+        Args:
+            thresholds (Sequence[int]): `gc.set_threshold` values; the first is allocations
+                between young collections (default: (50000, 20, 100); Python's is 700).
+            idle_interval (float): Least seconds between idle full collections (default: 30).
+            max_interval (float): Most seconds between full collections, idle or not (default: 300).
+            trace (bool): Start tracemalloc so `snapshot` and `diff` work; slows allocation (default: False).
+            trace_frames (int): Stack frames kept per traced allocation (default: 1).
+        """
+        self.thresholds = tuple(thresholds)
+        self.idle_interval = idle_interval
+        self.max_interval = max_interval
+        self.trace = trace
+        self.trace_frames = trace_frames
+        self.frozen = False
+        self.last_collect = time.monotonic()
+        self.collections = 0
+        self.collected = 0
+        self.baseline: Optional[tracemalloc.Snapshot] = None
+        self.modules: dict[str, str] = {}
+        self.lock = threading.Lock()
+        self.started = False
+        self.pause_started = 0.0
+
+    def start(self) -> "MemoryManager":
+        """Apply the thresholds, time every collection and start tracing if asked; safe to call again."""
+        with self.lock:
+            if self.started:
+                return self
+            self.started = True
+        gc.set_threshold(*self.thresholds)
+        gc.callbacks.append(self.__on_gc)
+        if self.trace and not tracemalloc.is_tracing():
+            tracemalloc.start(self.trace_frames)
+        return self
+
+    def stop(self) -> None:
+        """Restore Python's collection defaults and stop tracing; frozen objects stay frozen."""
+        with self.lock:
+            if not self.started:
+                return
+            self.started = False
+        gc.set_threshold(700, 10, 10)
+        if self.__on_gc in gc.callbacks:
+            gc.callbacks.remove(self.__on_gc)
+        if self.trace and tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+    def freeze(self) -> None:
+        """Collect once, then exempt every surviving object from later collections. Only the first call acts."""
+        with self.lock:
+            if self.frozen:
+                return
+            self.frozen = True
+        gc.collect()
+        gc.freeze()
+        logging.info(f"{gc.get_freeze_count()} startup objects frozen, RSS {rss_mb():.0f} MiB")
+
+    def poll(self, idle: bool) -> int:
+        """
+        Called once per read-loop iteration. Freezes startup objects on the
+        first call, and runs a full collection when it is due.
+
+        Args:
+            idle (bool): Nothing was read this iteration and nothing is waiting to be spoken.
+
+        Returns:
+            int: Unreachable objects found, 0 if no collection ran.
+        """
+        if not self.frozen:
+            self.freeze()
+            self.last_collect = time.monotonic()
+            return 0
+        since = time.monotonic() - self.last_collect
+        if since >= self.max_interval or (idle and since >= self.idle_interval):
+            return self.collect()
+        return 0
+
+    def collect(self) -> int:
+        """Run a full collection now."""
+        with self.lock:
+            self.last_collect = time.monotonic()
+        n = gc.collect()
+        with self.lock:
+            self.collections += 1
+            self.collected += n
+        if n:
+            logging.info(f'{n} have been release', extra=REPEATED)
+        return n
+
+    def __on_gc(self, phase: str, info: dict) -> None:
+        if phase == "start":
+            self.pause_started = time.perf_counter()
+        else:
+            METRICS.histogram("gc_pause_seconds", "Garbage collection pauses",
+                              generation=str(info["generation"])).observe(time.perf_counter() - self.pause_started)
+
+    def snapshot(self) -> tracemalloc.Snapshot:
+        """
+        Take a tracemalloc snapshot, keeping it as the baseline for the next `diff`.
+
+        Raises:
+            RuntimeError: If tracing is off (`trace=False`).
+        """
+        if not tracemalloc.is_tracing():
+            raise RuntimeError("tracemalloc is not tracing; create the MemoryManager with trace=True")
+        snapshot = tracemalloc.take_snapshot().filter_traces(
+            [tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, "<frozen importlib._bootstrap>")])
+        with self.lock:
+            self.baseline = snapshot
+        return snapshot
+
+    def diff(self, limit: int = 15) -> List[dict]:
+        """
+        Allocation growth by module since the previous `snapshot` or `diff`.
+        The first call only records the baseline and returns an empty list.
+
+        Args:
+            limit (int): Modules returned, largest growth first (default: 15).
+
+        Returns:
+            List[dict]: `{"module", "size_kb", "size_diff_kb", "count", "count_diff"}` per module.
+        """
+        previous = self.baseline
+        current = self.snapshot()
+        if previous is None:
+            return []
+        totals: dict[str, list] = {}
+        for stat in current.compare_to(previous, "filename"):
+            module = self.__module_of(stat.traceback[0].filename)
+            total = totals.setdefault(module, [0, 0, 0, 0])
+            total[0] += stat.size
+            total[1] += stat.size_diff
+            total[2] += stat.count
+            total[3] += stat.count_diff
+        ranked = sorted(totals.items(), key=lambda item: item[1][1], reverse=True)[:limit]
+        return [{"module": module, "size_kb": size / 1024, "size_diff_kb": size_diff / 1024,
+                 "count": count, "count_diff": count_diff}
+                for module, (size, size_diff, count, count_diff) in ranked]
+
+    def __module_of(self, filename: str) -> str:
+        module = self.modules.get(filename)
+        if module is None:
+            # Modules imported since the last lookup are picked up here
+            for name, loaded in list(sys.modules.items()):
+                path = getattr(loaded, "__file__", None)
+                if path:
+                    self.modules.setdefault(path, name)
+            module = self.modules.get(filename) or os.path.basename(filename)
+            self.modules[filename] = module
+        return module
+
+    def report(self) -> dict:
+        """RSS, collector counters and frozen objects, plus growth by module when tracing."""
+        report = {"rss_mb": rss_mb(), "collections": self.collections, "collected": self.collected,
+                  "frozen": gc.get_freeze_count(), "gc_counts": gc.get_count()}
+        if tracemalloc.is_tracing():
+            report["growth"] = self.diff()
+        return report
@@ -0,0 +1,136 @@
+import os
+import sqlite3
+import threading
+import time
+from collections import deque
+from typing import Iterable, List, NamedTuple, Optional
+
+
+class ChatRecord(NamedTuple):
+    """One chat message; unpacks like the (timestamp, name, message_id, text) tuples the scraper returns."""
+    timestamp: str
+    name: str
+    message_id: str
+    text: str
+
+
+class MessageStore:
+    """
+    Chat history for a meeting: a bounded in-memory window for dedupe and
+    speaker-change checks, with every message appended to SQLite so the full
+    history stays queryable without growing memory.
+    """
+
+    def __init__(self, path: str = "data/history.sqlite3", meeting: str = "", window: int = 1000) -> None:
+        """
+        Args:
+            path (str): SQLite database file, or ":memory:" (default: data/history.sqlite3).
+            meeting (str): Meeting link the messages belong to.
+            window (int): Number of recent messages kept in memory (default: 1000).
+        """
+        self.meeting = meeting
+        self.window: deque[ChatRecord] = deque(maxlen=window)
+        self.recent_ids: set[str] = set()
+        self.count = 0
+        self.lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.execute("""CREATE TABLE IF NOT EXISTS messages (
+                               message_id TEXT PRIMARY KEY,
+                               meeting TEXT,
+                               timestamp TEXT,
+                               name TEXT,
+                               text TEXT,
+                               received_at REAL)""")
+        self.db.commit()
+
+    def unseen(self, records: Iterable[tuple]) -> List[ChatRecord]:
+        """
+        Filter out records that are already stored.
+
+        Args:
+            records (Iterable[tuple]): (timestamp, name, message_id, text) tuples.
+
+        Returns:
+            List[ChatRecord]: The unseen records, in input order.
+        """
+        candidates = {}
+        for record in records:
+            record = ChatRecord(*record)
+            if record.message_id not in self.recent_ids and record.message_id not in candidates:
+                candidates[record.message_id] = record
+        if not candidates:
+            return []
+
+        # Ids that fell out of the window are checked against the database in one query
+        known = set()
+        ids = list(candidates)
+        with self.lock:
+            for i in range(0, len(ids), 500):
+                chunk = ids[i:i + 500]
+                rows = self.db.execute(f"SELECT message_id FROM messages WHERE message_id IN ({','.join('?' * len(chunk))})",
+                                       chunk)
+                known.update(row[0] for row in rows)
+        return [record for message_id, record in candidates.items() if message_id not in known]
+
+    def extend(self, records: List[ChatRecord]) -> None:
+        """
+        Append new records to the window and the database.
+
+        Args:
+            records (List[ChatRecord]): Records returned by `unseen`.
+        """
+        now = time.time()
+        with self.lock:
+            self.db.executemany("INSERT OR IGNORE INTO messages VALUES (?, ?, ?, ?, ?, ?)",
+                                [(r.message_id, self.meeting, r.timestamp, r.name, r.text, now) for r in records])
+            self.db.commit()
+
+        for record in records:
+            if len(self.window) == self.window.maxlen:
+                self.recent_ids.discard(self.window[0].message_id)
+            self.window.append(record)
+            self.recent_ids.add(record.message_id)
+        self.count += len(records)
+
+    def last(self) -> Optional[ChatRecord]:
+        """The most recent message, or None before the first one."""
+        return self.window[-1] if self.window else None
+
+    def __len__(self) -> int:
+        """Number of messages stored during this run."""
+        return self.count
+
+    def query(self, name: Optional[str] = None, since: Optional[float] = None,
+              meeting: Optional[str] = None, limit: int = 100) -> List[ChatRecord]:
+        """
+        Look up stored messages, newest first.
+
+        Args:
+            name (Optional[str]): Only messages from this sender.
+            since (Optional[float]): Only messages received after this UNIX time.
+            meeting (Optional[str]): Only messages from this meeting link.
+            limit (int): Maximum number of rows (default: 100).
+
+        Returns:
+            List[ChatRecord]: Matching messages.
+        """
+        clauses, params = [], []
+        for column, op, value in (("name", "=", name), ("received_at", ">", since), ("meeting", "=", meeting)):
+            if value is not None:
+                clauses.append(f"{column} {op} ?")
+                params.append(value)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        with self.lock:
+            rows = self.db.execute(f"SELECT timestamp, name, message_id, text FROM messages {where} "
+                                   f"ORDER BY received_at DESC, rowid DESC LIMIT ?", params + [limit]).fetchall()
+        return [ChatRecord(*row) for row in rows]
+
+    def close(self) -> None:
+        with self.lock:
+            self.db.close()
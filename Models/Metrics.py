@@ -0,0 +1,375 @@
+import bisect
+import json
+import logging
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Optional, Sequence
+
+# Upper bounds in seconds, suited to network and synthesis latencies
+LATENCY_BUCKETS = (0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 4.0, 8.0, 16.0, 32.0)
+
+
+class Histogram:
+    """Fixed-bucket histogram of observed values, cheap enough to update on every call."""
+
+    def __init__(self, buckets: Sequence[float] = LATENCY_BUCKETS) -> None:
+        """
+        Args:
+            buckets (Sequence[float]): Increasing upper bounds; larger values go to an overflow bucket.
+        """
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+        self.lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        """Record one value."""
+        with self.lock:
+            self.counts[bisect.bisect_left(self.buckets, value)] += 1
+            self.count += 1
+            self.sum += value
+            self.max = max(self.max, value)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Estimate a quantile by interpolating inside the bucket that holds it.
+
+        Args:
+            q (float): Quantile between 0 and 1, e.g. 0.95.
+
+        Returns:
+            Optional[float]: The estimate, or None before the first observation.
+        """
+        with self.lock:
+            if not self.count:
+                return None
+            rank = q * self.count
+            seen = 0
+            for i, n in enumerate(self.counts):
+                if n and seen + n >= rank:
+                    lower = self.buckets[i - 1] if i else 0.0
+                    upper = self.buckets[i] if i < len(self.buckets) else self.max
+                    return min(lower + (upper - lower) * (rank - seen) / n, self.max)
+                seen += n
+            return self.max
+
+    def snapshot(self) -> dict:
+        """Return the count, sum, max, p50/p95/p99 estimates and cumulative bucket counts."""
+        with self.lock:
+            cumulative, total = {}, 0
+            for bound, n in zip(self.buckets + (float("inf"),), self.counts):
+                total += n
+                cumulative[bound] = total
+            count, total_sum, largest = self.count, self.sum, self.max
+        return {"count": count, "sum": total_sum, "max": largest,
+                "p50": self.quantile(0.5), "p95": self.quantile(0.95), "p99": self.quantile(0.99),
+                "buckets": cumulative}
+
+
+class Counter:
+    """Monotonically increasing count."""
+
+    def __init__(self) -> None:
+        self.value = 0.0
+        self.lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self.lock:
+            self.value += amount
+
+
+class Gauge:
+    """Current value, either set directly or read from a callback at export time."""
+
+    def __init__(self, fn: Optional[Callable[[], float]] = None) -> None:
+        self.fn = fn
+        self.value = 0.0
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+    def read(self) -> float:
+        if self.fn is None:
+            return self.value
+        try:
+            return float(self.fn())
+        except Exception:
+            return float("nan")
+
+
+class Timer:
+    """Context manager observing the elapsed time of its block into a histogram."""
+
+    __slots__ = ("histogram", "start")
+
+    def __init__(self, histogram: Histogram) -> None:
+        self.histogram = histogram
+
+    def __enter__(self) -> "Timer":
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.histogram.observe(time.perf_counter() - self.start)
+
+
+class _NullMetric:
+    """Stands in for every metric type while the registry is disabled."""
+
+    def inc(self, amount: float = 1.0) -> None:
+        pass
+
+    def set(self, value: float) -> None:
+        pass
+
+    def observe(self, value: float) -> None:
+        pass
+
+    def __enter__(self) -> "_NullMetric":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        pass
+
+
+_NULL = _NullMetric()
+
+
+class MetricsRegistry:
+    """
+    Named counters, gauges and histograms with optional labels. While disabled
+    every lookup returns a shared no-op object, so instrumented code costs a
+    method call and a flag check.
+    """
+
+    def __init__(self, enabled: bool = False, prefix: str = "meetbot") -> None:
+        """
+        Args:
+            enabled (bool): Record metrics (default: False).
+            prefix (str): Prepended to metric names in exports (default: "meetbot").
+        """
+        self.enabled = enabled
+        self.prefix = prefix
+        self.metrics: dict[tuple, object] = {}
+        self.help: dict[str, tuple[str, str]] = {}
+        self.lock = threading.Lock()
+
+    def enable(self, enabled: bool = True) -> None:
+        self.enabled = enabled
+
+    def __get(self, kind: str, name: str, labels: dict, factory: Callable[[], object], help: str):
+        key = (name, tuple(sorted(labels.items())))
+        metric = self.metrics.get(key)
+        if metric is None:
+            with self.lock:
+                metric = self.metrics.get(key)
+                if metric is None:
+                    metric = self.metrics[key] = factory()
+                    self.help.setdefault(name, (kind, help))
+        return metric
+
+    def counter(self, name: str, help: str = "", **labels):
+        """Return the counter `name` with `labels`, creating it on first use."""
+        if not self.enabled:
+            return _NULL
+        return self.__get("counter", name, labels, Counter, help)
+
+    def gauge(self, name: str, help: str = "", fn: Optional[Callable[[], float]] = None, **labels):
+        """
+        Return the gauge `name` with `labels`; `fn` makes it read its value at
+        export time, replacing the callback of an existing gauge.
+        """
+        if not self.enabled:
+            return _NULL
+        gauge = self.__get("gauge", name, labels, lambda: Gauge(fn), help)
+        if fn is not None:
+            gauge.fn = fn  # e.g. a restarted room taking over from the one it replaces
+        return gauge
+
+    def unregister(self, name: str, fn: Optional[Callable[[], float]] = None, **labels) -> None:
+        """Remove the metric `name` with `labels`; with `fn`, only while it is still that gauge's callback."""
+        key = (name, tuple(sorted(labels.items())))
+        with self.lock:
+            metric = self.metrics.get(key)
+            if metric is not None and (fn is None or getattr(metric, "fn", None) is fn):
+                del self.metrics[key]
+
+    def histogram(self, name: str, help: str = "", buckets: Sequence[float] = LATENCY_BUCKETS, **labels):
+        """Return the histogram `name` with `labels`, creating it on first use."""
+        if not self.enabled:
+            return _NULL
+        return self.__get("histogram", name, labels, lambda: Histogram(buckets), help)
+
+    def stage(self, stage: str):
+        """
+        Time a pipeline stage into the `stage_seconds` histogram.
+
+        Usage:
+            with METRICS.stage("synthesis"):
+                ...
+        """
+        if not self.enabled:
+            return _NULL
+        return Timer(self.histogram("stage_seconds", "Time spent in each processing stage", stage=stage))
+
+    def observe_stage(self, stage: str, seconds: float) -> None:
+        """Record a stage duration measured by the caller, e.g. across a generator's yields."""
+        if self.enabled:
+            self.histogram("stage_seconds", "Time spent in each processing stage", stage=stage).observe(seconds)
+
+    def collect(self) -> list[tuple[str, dict, object]]:
+        """Return (name, labels, metric) for every metric, sorted by name."""
+        with self.lock:
+            items = list(self.metrics.items())
+        return sorted(((name, dict(labels), metric) for (name, labels), metric in items),
+                      key=lambda item: (item[0], sorted(item[1].items())))
+
+    def to_json(self) -> dict:
+        """Return every metric as plain values; histograms as their snapshot."""
+        result: dict = {}
+        for name, labels, metric in self.collect():
+            if isinstance(metric, Histogram):
+                value = metric.snapshot()
+                value["buckets"] = {str(bound): n for bound, n in value["buckets"].items()}
+            elif isinstance(metric, Gauge):
+                value = metric.read()
+            else:
+                value = metric.value
+            result.setdefault(name, []).append({"labels": labels, "value": value})
+        return result
+
+    def to_prometheus(self) -> str:
+        """Render every metric in the Prometheus text exposition format."""
+        lines = []
+        described = set()
+        for name, labels, metric in self.collect():
+            full = f"{self.prefix}_{name}"
+            if name not in described:
+                kind, help = self.help[name]
+                if help:
+                    lines.append(f"# HELP {full} {help}")
+                lines.append(f"# TYPE {full} {kind}")
+                described.add(name)
+            if isinstance(metric, Histogram):
+                snapshot = metric.snapshot()
+                for bound, n in snapshot["buckets"].items():
+                    le = "+Inf" if bound == float("inf") else f"{bound:g}"
+                    lines.append(f"{full}_bucket{_labels(labels, le=le)} {n}")
+                lines.append(f"{full}_sum{_labels(labels)} {snapshot['sum']:.6f}")
+                lines.append(f"{full}_count{_labels(labels)} {snapshot['count']}")
+            elif isinstance(metric, Gauge):
+                lines.append(f"{full}{_labels(labels)} {metric.read():g}")
+            else:
+                lines.append(f"{full}{_labels(labels)} {metric.value:g}")
+        return "\n".join(lines) + "\n"
+
+    def summary(self) -> str:
+        """One-line digest: stage p50/p95 in milliseconds, then counters and gauges."""
+        parts = []
+        for name, labels, metric in self.collect():
+            label = ",".join(str(v) for v in labels.values())
+            label = f"{name}[{label}]" if label else name
+            if isinstance(metric, Histogram):
+                if metric.count:
+                    parts.append(f"{label} n={metric.count} p50={metric.quantile(0.5) * 1000:.0f}ms"
+                                 f" p95={metric.quantile(0.95) * 1000:.0f}ms")
+            elif isinstance(metric, Gauge):
+                parts.append(f"{label}={metric.read():g}")
+            else:
+                parts.append(f"{label}={metric.value:g}")
+        return "; ".join(parts)
+
+
+def _labels(labels: dict, **extra) -> str:
+    labels = {**labels, **extra}
+    if not labels:
+        return ""
+    escaped = (str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for v in labels.values())
+    return "{" + ",".join(f'{k}="{v}"' for k, v in zip(labels, escaped)) + "}"
+
+
+# Process-wide registry; disabled until `enable()` is called
+METRICS = MetricsRegistry()
+
+
+class MetricsServer:
+    """
+    Serves the registry on a local HTTP port: `/metrics` in the Prometheus text
+    format and `/metrics.json` as JSON, plus `/memory.json` when given a
+    memory manager.
+    """
+
+    def __init__(self, registry: MetricsRegistry = METRICS, host: str = "127.0.0.1", port: int = 9464,
+                 memory=None) -> None:
+        """
+        Args:
+            registry (MetricsRegistry): Registry to export (default: the process-wide one).
+            host (str): Interface to bind; keep it local unless the port is firewalled (default: 127.0.0.1).
+            port (int): TCP port, 0 for any free port (default: 9464).
+            memory: A `MemoryManager`; `/memory.json` returns its `report()`, with allocation
+                growth by module since the previous request when tracing (default: None).
+        """
+        registry_ref = registry
+        memory_ref = memory
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                path = self.path.split("?", 1)[0]
+                if path == "/metrics":
+                    body, kind = registry_ref.to_prometheus().encode("utf-8"), "text/plain; version=0.0.4"
+                elif path == "/metrics.json":
+                    body, kind = json.dumps(registry_ref.to_json()).encode("utf-8"), "application/json"
+                elif path == "/memory.json" and memory_ref is not None:
+                    body, kind = json.dumps(memory_ref.report()).encode("utf-8"), "application/json"
+                else:
+                    self.send_error(404)
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", kind)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        self.server.daemon_threads = True
+        self.port = self.server.server_address[1]
+        self.thread = threading.Thread(target=self.server.serve_forever, name="metrics-http", daemon=True)
+
+    def start(self) -> "MetricsServer":
+        self.thread.start()
+        logging.info(f"Metrics served on http://{self.server.server_address[0]}:{self.port}/metrics")
+        return self
+
+    def stop(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class MetricsReporter:
+    """Logs `registry.summary()` every `interval` seconds from a background thread."""
+
+    def __init__(self, registry: MetricsRegistry = METRICS, interval: float = 60.0) -> None:
+        self.registry = registry
+        self.interval = interval
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self.__run, name="metrics-summary", daemon=True)
+
+    def start(self) -> "MetricsReporter":
+        self.thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.stopped.set()
+        if self.thread.is_alive():
+            self.thread.join()
+        logging.info(f"Metrics: {self.registry.summary()}")
+
+    def __run(self) -> None:
+        while not self.stopped.wait(self.interval):
+            logging.info(f"Metrics: {self.registry.summary()}")
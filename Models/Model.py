@@ -6,7 +6,6 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.action_chains import ActionChains
 
-import gc
 import os
 # import pyttsx3
 import json
@@ -15,19 +14,52 @@ from time import sleep
 import logging
 import logging.config
 
-from Models.Gemini import GeminiTranscript
+from Models.Gemini import GeminiTranscript, GeminiRequest
+from Models.LogWriter import REPEATED, setup_logging
+from Models.Memory import MemoryManager, rss_mb
+from Models.ChatScraper import ChatScraper, IngestionMode
+from Models.MeetingJoin import JoinState, MeetingJoiner
+from Models.Config import ConfigWatcher, VoiceConfig
+from Models.Scheduler import ChatScheduler
+from Models.MessageStore import ChatRecord, MessageStore
+from Models.Metrics import METRICS, Histogram, MetricsReporter, MetricsServer
 from CustomExeption.CustomExeption import *
 from Models.VoiceModel import GoogleTextToSpeechModel as Engine
 from Models.VoiceModel import STATUS
+from Models.SpeechPipeline import SpeechStream, Utterance, UtteranceState
+from concurrent.futures import Future, ThreadPoolExecutor
 from typing import List, Tuple, Optional
 
-if not os.path.exists('logs'):
-    os.makedirs('logs')
-logging.basicConfig(level=logging.INFO,
-                    format="%(asctime)s - %(levelname)s - %(message)s",
-                    handlers=[logging.FileHandler(f"logs/AI{int(time.time())}.log", encoding="utf-8")])
-
-logging.info("Starting program!")
+class Warmup:
+    """
+    Builds the speech engine and the Gemini client on background threads, so
+    the slow parts (the Gemini SDK import, the audio device, the TTS language
+    table) overlap with starting the browser.
+
+    Usage:
+        warmup = Warmup()
+        driver = get_driver(...)
+        ai = VoiceAI(driver, ..., **warmup.components())
+    """
+
+    def __init__(self, lang: str = 'vi', gemini: bool = True, gemini_key=...) -> None:
+        """
+        Args:
+            lang (str): Speech language for the engine (default: "vi").
+            gemini (bool): Also create the default GeminiTranscript (default: True).
+            gemini_key: API key for GeminiTranscript (default: read from the key file).
+        """
+        executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="warmup")
+        self.engine: Future = executor.submit(Engine, lang)
+        self.gemini: Optional[Future] = executor.submit(GeminiTranscript, key=gemini_key) if gemini else None
+        executor.shutdown(wait=False)
+
+    def components(self) -> dict:
+        """Wait for the components and return them as VoiceAI keyword arguments."""
+        components = {'engine': self.engine.result()}
+        if self.gemini is not None:
+            components['gemini_model'] = self.gemini.result()
+        return components
 
 def reading_config(path: str = 'configurations/config.json'):
     try:
@@ -40,7 +72,7 @@ def reading_config(path: str = 'configurations/config.json'):
         norm_path = os.path.normpath(path)
         dir_path = os.path.dirname(norm_path)
         if dir_path:
-            os.makedirs(dir_path)
+            os.makedirs(dir_path, exist_ok=True)
         config = {
             "REMOVE": True,
             "SPEED": 1.0,
@@ -64,178 +96,251 @@ def verify(credentials_path: str = 'configurations/credentials.json'):
     return account
 
 
-def status_log(status: list[dict]):
-    for item in status:
-        if item['status'] == STATUS.NORMAL:
-            logging.info(item['message'])
+def status_log(utterance: Utterance):
+    def report(done: Utterance):
+        if done.state == UtteranceState.PLAYED:
+            logging.info(f"Spoke in {done.finished_at - done.submitted_at:.2f}s: {done.text}")
         else:
-            logging.error(item['message'])
+            logging.error(f"Speech failed for '{done.text}': {done.error}")
+    utterance.add_done_callback(report)
+
 class VoiceAI:
     def __init__(self, driver: WebDriver,
                  config_path: str = 'configurations/config.json',
-                 credentials_path: str = 'configurations/credentials.json'):
-
+                 credentials_path: str = 'configurations/credentials.json',
+                 ingestion: IngestionMode = IngestionMode.INCREMENTAL,
+                 observer_timeout: float = 5.0,
+                 gemini_model: Optional[GeminiTranscript] = None,
+                 stream_replies: bool = True,
+                 history_path: str = 'data/history.sqlite3',
+                 engine: Optional[Engine] = None,
+                 metrics_port: Optional[int] = None,
+                 metrics_interval: float = 60.0,
+                 meeting_link: Optional[str] = None,
+                 memory: Optional[MemoryManager] = None):
+
+        # Metrics must be on before the components below look up their instruments
+        self.metrics_server = None
+        self.metrics_reporter = None
+        self.gauges: list[tuple] = []  # (name, fn, labels) registered by this instance
+        self.released = False
+        if metrics_port is not None:
+            METRICS.enable()
+        self.memory = (memory if memory is not None else MemoryManager()).start()
         self.driver = driver
         logging.info("WebDriver initialized")
+        self.scraper = ChatScraper(driver)
+        self.ingestion = ingestion
+        self.observer_timeout = observer_timeout
+        self.observer_ready = False
         self.account = verify(credentials_path)
+        if meeting_link is not None:
+            self.account['meeting_link'] = meeting_link  # One account, several rooms
+        self.history = MessageStore(history_path, meeting=self.account.get('meeting_link', ''))
         # self.engine = pyttsx3.init()
-        self.engine = Engine('vi')
-        self.gemini_model = GeminiTranscript()
+        self.engine = engine if engine is not None else Engine('vi')
+        self.scheduler = ChatScheduler(self.engine)
+        self.gemini_model = gemini_model if gemini_model is not None else GeminiTranscript()
+        self.known_speakers: set = set()
+        self.speech_latency = Histogram()  # Message read to its speech starting
+        self.stream_replies = stream_replies
         self.config_path = config_path
+        reading_config(config_path)  # Creates the default file if it is missing
+        self.config_watcher = ConfigWatcher(config_path, self.apply_config)
+        self.config_chatbot()
+        self.config_watcher.start()
+        if metrics_port is not None:
+            self.__start_metrics(metrics_port, metrics_interval)
+
+    def __start_metrics(self, port: int, interval: float) -> None:
+        pipeline = self.engine.pipeline
+        self.__gauge("speech_queue_depth", "Utterances waiting for playback", pipeline.pending)
+        self.__gauge("speech_backlog_age_seconds", "Age of the oldest utterance not yet playing",
+                     pipeline.backlog_age)
+        self.__gauge("scheduler_waiting", "Chat messages waiting to be read", self.scheduler.pending)
+        self.__gauge("scheduler_backlog_age_seconds", "Age of the oldest chat message waiting to be read",
+                     self.scheduler.backlog_age)
+        if self.engine.cache is not None:
+            for key in ("memory_hits", "disk_hits", "misses", "evictions"):
+                self.__gauge("tts_cache", "TTS cache counters", lambda key=key: self.engine.cache.snapshot()[key],
+                             event=key)
+        for key in ("requests", "cache_hits", "coalesced", "throttled", "shed"):
+            self.__gauge("gemini_requests", "Gemini request counters",
+                         lambda key=key: self.gemini_model.snapshot()[key], event=key)
+        self.__gauge("rss_mb", "Resident set size in MiB", rss_mb)
+        self.metrics_server = MetricsServer(METRICS, port=port, memory=self.memory).start()
+        self.metrics_reporter = MetricsReporter(METRICS, interval).start()
+
+    def __gauge(self, name: str, help: str, fn, **labels) -> None:
+        # Remembered so `release` can drop them and the gauges stop holding on to this instance
+        METRICS.gauge(name, help, fn=fn, **labels)
+        self.gauges.append((name, fn, labels))
 
     def config_chatbot(self):
-        config = reading_config(self.config_path)
         try:
-            status = self.engine.config_voice(config)
-            for k, v in status.items():
-                if v == STATUS.CHANGE:
-                    logging.info(f"{k} set to: {config[k]}")
-                elif v == STATUS.INVALID:
-                    logging.info(f"{k}Is not a valid key, config failed")
-        except KeyError as e:
-            logging.info("Invalid config setting")
-            logging.error(e)
-
-    def join_meeting(self):
-        self.__login()
-        self.__join_meeting()
-
-    def __login(self) -> None:
-        logging.info("Starting Google login process")
-        self.driver.get("https://accounts.google.com/ServiceLogin?hl=en&passive=true&continue=https://www.google.com/&ec=GAZAAQ")
+            self.apply_config(self.config_watcher.load())
+        except InvalidConfig as e:
+            logging.error(f"Invalid config setting, keeping current settings: {e}")
+
+    def apply_config(self, config: VoiceConfig):
+        status = self.engine.config_voice(config.to_dict())
+        for k, v in status.items():
+            if v == STATUS.CHANGE:
+                logging.info(f"{k} set to: {getattr(config, k.lower())}")
+        if repr(config.scheduler) != repr(self.scheduler.policy):
+            self.scheduler.policy = config.scheduler
+            logging.info(f"SCHEDULER set to: {config.scheduler}")
+
+    def join_meeting(self) -> JoinState:
+        joiner = MeetingJoiner(self.driver)
+        if joiner.session_valid():
+            logging.info("Reusing the saved Google session")
+        else:
+            self.__login(joiner)
+        logging.info(f"Joining Google Meet with link: {self.account['meeting_link']}")
+        try:
+            return joiner.join(self.account['meeting_link'])
+        except SessionExpired:
+            logging.warning("Saved Google session was rejected, signing in again")
+            self.__login(joiner)
+            return joiner.join(self.account['meeting_link'])
 
+    def __login(self, joiner: MeetingJoiner) -> None:
+        logging.info("Starting Google login process")
         try:
-            self.driver.find_element(By.ID, "identifierId").send_keys(self.account['email'])
-            self.driver.find_element(By.ID, "identifierNext").click()
-            logging.info("Email entered and proceeding to password input")
-
-            self.driver.implicitly_wait(10)
-            self.driver.find_element(By.XPATH, '//*[@id="password"]/div[1]/div/div[1]/input').send_keys(self.account['password'])
-            self.driver.find_element(By.ID, "passwordNext").click()
-            logging.info("Password entered and login submitted")
-
-            self.driver.implicitly_wait(10)
-            self.driver.get("https://accounts.google.com/")
-            logging.info("Google login successful")
+            joiner.login(self.account['email'], self.account['password'])
         except Exception as e:
             logging.error(f"Login failed: {e}")
             raise e
 
-    def __turnOffMicCam(self) -> None:
-        logging.info("Attempting to turn off microphone and camera")
-        wait = WebDriverWait(self.driver, 10)
-        sleep(2)
-
-        try:
-            button = wait.until(EC.element_to_be_clickable((By.XPATH, "//div[@role='button' and @aria-label='Tắt micrô']")))
-            button.click()
-            logging.info("Microphone turned off")
-        except Exception as e:
-            logging.warning("Microphone button not found:", e)
-
-        sleep(1)
-        try:
-            button = wait.until(EC.element_to_be_clickable((By.XPATH, "//div[@role='button' and @aria-label='Tắt máy ảnh']")))
-            button.click()
-            logging.info("Camera turned off")
-        except Exception as e:
-            logging.warning("Camera button not found!", e)
-
-        try:
-            button = wait.until(EC.element_to_be_clickable((By.CLASS_NAME, "XCoPyb")))
-            button.click()
-            logging.info("Joining the Meeting room")
-        except Exception as e:
-            logging.error("Failed to join meeting room", e)
-
-    def __join_meeting(self) -> None:
-        logging.info(f"Joining Google Meet with link: {self.account['meeting_link']}")
-        self.driver.get(self.account['meeting_link'])
-        
-        sleep(0.5)
-        
-        self.driver.get(self.account['meeting_link'])
-
-        self.__turnOffMicCam()
-
-        wait = WebDriverWait(self.driver, 10)
-
-        try:
-            button = wait.until(EC.element_to_be_clickable((By.XPATH, '//*[@id="yDmH0d"]/c-wiz/div/div/div[36]/div[4]/div[10]/div/div/div[3]/nav/div[3]/div')))
-            button.click()
-            logging.info("Clicked on chat button")
-        except Exception as e:
-            logging.warning("Chat button not found", e)
-
     def get_chat_messages(self) -> List[Tuple[str, str, str, str]]:
-        logging.info("Fetching chat messages from Google Meet")
-        chat_data: List[Tuple[str, str, str, str]] = []
-
-        messages = self.driver.find_elements(By.CSS_SELECTOR, ".Ss4fHf")
-
-        for msg in messages:
-            try:
-                name: str = msg.find_element(By.CSS_SELECTOR, ".poVWob").text.strip()
-                timestamp: str = msg.find_element(By.CSS_SELECTOR, ".MuzmKe").text.strip()
-
-                msg_elements = msg.find_elements(By.CSS_SELECTOR, '[jsname="dTKtvb"]')
-                for msg_element in msg_elements:
-                    parent_msg = msg_element.find_element(By.XPATH, "./ancestor::div[@data-message-id]")
-                    message_id = parent_msg.get_attribute("data-message-id") if parent_msg else None
-                    text: str = msg_element.text.strip()
-
-                    if text and message_id:
-                        chat_data.append((timestamp, name, message_id, text))
-
-            except Exception as e:
-                logging.error('Reading message error' + e)
-        return sorted(chat_data, key=lambda x: x[0])
-
-    def process_and_read_messages(self, chat_data: List[Tuple[str, str, str, str]], history: List[Tuple[str, str, str, str]]) -> None:
-        for idx, (timestamp, name, message_id, text) in enumerate(chat_data):
-            if (name != "Bạn" and name != "You") and not text.startswith("https:"):
+        logging.info("Fetching chat messages from Google Meet", extra=REPEATED)
+        if self.ingestion == IngestionMode.SCAN:
+            with METRICS.stage("scrape"):
+                return self.scraper.fetch_all()
+        if self.ingestion == IngestionMode.OBSERVER:
+            return self.__drain_observer()
+        with METRICS.stage("scrape"):
+            return self.scraper.fetch_new()
+
+    def __drain_observer(self) -> List[Tuple[str, str, str, str]]:
+        if self.observer_ready:
+            chat_data = self.scraper.wait_for_messages(self.observer_timeout)
+            if chat_data is not None:
+                return chat_data
+            logging.warning("Chat observer lost, falling back to the scraper")
+
+        self.scraper.install_observer(self.observer_timeout)
+        self.observer_ready = True
+        logging.info("Chat observer installed")
+        # Pick up anything rendered while no observer was attached
+        with METRICS.stage("scrape"):
+            return self.scraper.fetch_new()
+
+    def process_and_read_messages(self, chat_data: List[ChatRecord]) -> None:
+        new_speakers = {name for (_, name, _, _) in chat_data} - self.known_speakers
+        if new_speakers:
+            self.known_speakers.update(new_speakers)
+            self.engine.prewarm(new_speakers)
+        for timestamp, name, message_id, text in chat_data:
+            if name != "Bạn" and name != "You":
                 logging.info(f"New chat message: [{timestamp}] {name}: {text}")
 
-                if len(history) < 2 or history[-1][1] != name or history[-1][0] != timestamp:
-                    self.engine.speech(name)
-
                 flag = False
                 if text.startswith('/respone'):
                     text = text.replace('/respone','')
                     flag = True
 
-                status_log(self.engine.speech(text))
-                
-                if flag:
-                    try:
-                        respone = self.gemini_model.respone(text)
-                        status_log(self.engine.speech('Reply:' + respone))
-                    except Exception as e:
-                        logging.error(e)
-                    
-    def run(self,seen_messages: set = set(), chat_history: List[Tuple[str, str, str, str]] = [], limit_message: int = -1):
-        self.config_chatbot()
-        chat_data = self.get_chat_messages()
-        new_messages = [(t, n, m, txt) for (t, n, m, txt) in chat_data if m not in seen_messages]
-        seen_messages.update(m for (_, _, m, _) in new_messages)
+                # Links, emoji and repeated characters are not worth synthesizing;
+                # a message made only of them is not read at all, nor sent to Gemini
+                spoken = self.engine.normalize(text)
+                if not spoken:
+                    continue
+
+                # The scheduler decides when (and whether) the message is read;
+                # the speaker's name is announced with it
+                read_at = time.monotonic()
+                self.scheduler.add(ChatRecord(timestamp, name, message_id, spoken), priority=flag,
+                                   on_speak=lambda utterance, read_at=read_at, question=(text if flag else None):
+                                   self.__spoken(utterance, read_at, question))
+
+    def __spoken(self, utterance: Utterance, read_at: float, question: Optional[str]) -> None:
+        status_log(utterance)
+        utterance.add_done_callback(lambda done: self.__observe_latency(done, read_at))
+        if question is None:
+            return
+        # The reply is spoken whenever it is ready; chat keeps being read meanwhile
+        if self.stream_replies:
+            stream = self.engine.stream(['Reply:'])
+            request = self.gemini_model.submit(question, on_sentence=stream.feed)
+            request.add_done_callback(lambda request, stream=stream: self.__speak_reply(request, stream))
+        else:
+            self.gemini_model.submit(question).add_done_callback(self.__speak_reply)
+
+    def __observe_latency(self, utterance: Utterance, read_at: float) -> None:
+        if utterance.started_at is not None:
+            self.speech_latency.observe(utterance.started_at - read_at)
+
+    def __speak_reply(self, request: GeminiRequest, stream: Optional[SpeechStream] = None) -> None:
+        # Streamed sentences are already queued; only the slot needs closing
+        streamed = stream.end() if stream is not None else None
+        if request.future.cancelled():
+            logging.info(f"Gemini request cancelled: {request.text}")
+            return
+        error = request.future.exception()
+        if error is not None:
+            logging.error(f"Gemini request failed: {error}")
+            return
+        if streamed is not None:
+            status_log(streamed)
+        elif stream is None:
+            _, reply = self.engine.speech_all(['Reply:', request.result()])
+            status_log(reply)
+
+    def run(self, limit_message: int = -1) -> List[ChatRecord]:
+        new_messages: List[ChatRecord] = []
         try:
+            # Inside the try: a crashed browser raises here, and the room must still be released
+            chat_data = self.get_chat_messages()
+            with METRICS.stage("dedupe"):
+                new_messages = self.history.unseen(chat_data)
+            METRICS.counter("messages_total", "New chat messages read").inc(len(new_messages))
             if new_messages:
-                self.process_and_read_messages(new_messages, chat_history)
-                chat_history.extend(new_messages)
-            sleep(0.1)
+                self.process_and_read_messages(new_messages)
+                self.history.extend(new_messages)
+            if self.ingestion != IngestionMode.OBSERVER:
+                sleep(0.1)  # The observer long-poll already blocks until messages arrive
             if limit_message != -1:
-                if len(chat_history) >= limit_message:
+                if len(self.history) >= limit_message:
                     raise LimitReach()
         except Exception as e:
+            METRICS.counter("errors_total", "Errors by stage", stage="run").inc()
             logging.error(f"Meeting error: {e}")
             self.release()
             raise Exception("Meeting ended. Chrome tab closed")
         finally:
-            n = gc.collect()
-            if n != 0:
-                logging.info(f'{n} have been release')
+            # Full collections wait for a quiet moment instead of running every poll
+            self.memory.poll(idle=not new_messages and not self.scheduler.pending()
+                             and not self.engine.pipeline.pending())
 
-        return seen_messages, chat_history
+        return new_messages
 
     def release(self):
+        """Stop every thread, pool and connection of this instance; later calls do nothing."""
+        if self.released:
+            return
+        self.released = True
+        if self.metrics_server is not None:
+            self.metrics_server.stop()
+            self.metrics_reporter.stop()
+            self.metrics_server = self.metrics_reporter = None
+        for name, fn, labels in self.gauges:
+            METRICS.unregister(name, fn=fn, **labels)
+        self.gauges.clear()
+        self.config_watcher.stop()
+        self.history.close()
+        self.gemini_model.close()
+        self.scheduler.close()
+        self.engine.close(wait=False)
+        logging.info(f"TTS backends: {self.engine.router.snapshot()}")
         self.driver.quit()
\ No newline at end of file
@@ -0,0 +1,219 @@
+import logging
+import threading
+import time
+from collections import deque
+from enum import Enum
+from typing import Callable, List, NamedTuple, Optional
+
+from Models.Config import SchedulerPolicy
+from Models.LogWriter import REPEATED
+from Models.MessageStore import ChatRecord
+from Models.Metrics import METRICS
+from Models.SpeechPipeline import Utterance
+from Models.VoiceModel import split_segments
+
+
+class Action(Enum):
+    """What the scheduler did with a message instead of reading it as is."""
+    PROMOTE = "promote"     # Read ahead of older messages
+    MERGE = "merge"         # Folded into the previous waiting message from the same speaker
+    SHORTEN = "shorten"     # Cut to its first sentence or `max_chars`
+    SKIP = "skip"           # Not read at all
+
+
+class Decision(NamedTuple):
+    """One entry of the scheduler's decision log."""
+    at: float               # UNIX time of the decision
+    action: Action
+    message_id: str
+    name: str
+    age: float              # Seconds the message had waited since it was read
+    reason: str
+
+
+class _Waiting:
+    __slots__ = ("record", "text", "priority", "read_at", "on_speak", "merged")
+
+    def __init__(self, record: ChatRecord, priority: bool, on_speak: Optional[Callable[[Utterance], None]]) -> None:
+        self.record = record
+        self.text = record.text
+        self.priority = priority
+        self.read_at = time.monotonic()
+        self.on_speak = on_speak
+        self.merged: List[str] = []  # Ids of the messages folded into this one
+
+
+class ChatScheduler:
+    """
+    Sits between the chat reader and the speech engine. Messages wait here
+    instead of in the speech queue, and are handed to the engine only when
+    it is down to `lookahead` queued utterances, so the order can still be
+    changed. Consecutive messages from one speaker are read as one. Once the
+    bot is behind (the oldest message has waited longer than the policy's
+    latency target, or more than `max_waiting` are waiting), /respone
+    commands and mentions go first, long messages are shortened and
+    low-value ones skipped; until then the chat is read in order. Every such
+    decision is kept in `decisions`.
+    """
+
+    def __init__(self, engine, policy: Optional[SchedulerPolicy] = None, lookahead: int = 2,
+                 log_size: int = 1000) -> None:
+        """
+        Args:
+            engine: Speech engine (GoogleTextToSpeechModel or compatible).
+            policy (Optional[SchedulerPolicy]): Latency target and catch-up rules (default: SchedulerPolicy()).
+            lookahead (int): Utterances kept queued in the engine so synthesis runs ahead of playback (default: 2).
+            log_size (int): Decisions kept in `decisions` (default: 1000).
+        """
+        self.engine = engine
+        self.policy = policy if policy is not None else SchedulerPolicy()
+        self.lookahead = lookahead
+        self.waiting: deque[_Waiting] = deque()
+        self.decisions: deque[Decision] = deque(maxlen=log_size)
+        self.last_speaker: Optional[tuple[str, str]] = None
+        self.cond = threading.Condition()
+        self.closed = False
+        self.thread = threading.Thread(target=self.__run, name="chat-scheduler", daemon=True)
+        self.thread.start()
+
+    def add(self, record: ChatRecord, priority: bool = False,
+            on_speak: Optional[Callable[[Utterance], None]] = None) -> None:
+        """
+        Queue a chat message for reading.
+
+        Args:
+            record (ChatRecord): The message; its text is what will be spoken.
+            priority (bool): Read it before older messages and never shorten or skip it, e.g. a /respone command.
+            on_speak (Optional[Callable[[Utterance], None]]): Called with the utterance once the
+                message has been handed to the engine. When later messages are merged into it, only
+                the first message's callback is called; theirs are dropped.
+        """
+        policy = self.policy
+        text = record.text.casefold()
+        mentioned = any(name.casefold() in text for name in policy.mentions)
+        with self.cond:
+            self.waiting.append(_Waiting(record, policy.prioritize and (priority or mentioned), on_speak))
+            self.cond.notify_all()
+
+    def pending(self) -> int:
+        """Number of messages waiting to be handed to the engine."""
+        return len(self.waiting)
+
+    def backlog_age(self) -> float:
+        """Seconds the oldest waiting message has waited, 0 if none."""
+        with self.cond:
+            return time.monotonic() - self.waiting[0].read_at if self.waiting else 0.0
+
+    def drain(self, timeout: Optional[float] = None) -> bool:
+        """Block until every waiting message has been handed to the engine."""
+        with self.cond:
+            return self.cond.wait_for(lambda: not self.waiting, timeout)
+
+    def close(self) -> None:
+        """Stop handing messages to the engine; waiting ones are dropped."""
+        with self.cond:
+            self.closed = True
+            self.cond.notify_all()
+        self.thread.join()
+
+    def __has_room(self) -> bool:
+        return self.engine.pipeline.pending() < self.lookahead
+
+    def __wake(self, _=None) -> None:
+        with self.cond:
+            self.cond.notify_all()
+
+    def __run(self) -> None:
+        while True:
+            with self.cond:
+                # Woken by new messages and finished utterances; the timeout covers
+                # speech queued around the scheduler, such as streamed replies
+                while not self.closed and not (self.waiting and self.__has_room()):
+                    self.cond.wait(0.05 if self.waiting else None)
+                if self.closed:
+                    return
+                item = self.__next()
+                self.cond.notify_all()
+            if item is not None:
+                self.__speak(item)
+
+    def behind(self) -> bool:
+        """True once the oldest waiting message is older than the target, or too many are waiting."""
+        policy = self.policy
+        with self.cond:
+            return bool(self.waiting) and (time.monotonic() - self.waiting[0].read_at > policy.target_latency
+                                           or len(self.waiting) > policy.max_waiting)
+
+    def __next(self) -> Optional[_Waiting]:
+        policy = self.policy
+        now = time.monotonic()
+        # Reading stays in chat order until it falls behind
+        behind = self.behind()
+        index = next((i for i, waiting in enumerate(self.waiting) if waiting.priority), 0) if behind else 0
+        item = self.waiting[index]
+        del self.waiting[index]
+        age = now - item.read_at
+        if index:
+            self.__decide(Action.PROMOTE, item, age, f"ahead of {index} older")
+        if item.priority:
+            return item
+
+        if age > policy.drop_after:
+            self.__decide(Action.SKIP, item, age, f"older than {policy.drop_after:g}s")
+            return None
+        if behind and self.__low_value(item.text):
+            self.__decide(Action.SKIP, item, age, "low value while behind")
+            return None
+
+        while policy.merge and self.waiting and not self.waiting[0].priority \
+                and self.waiting[0].record.name == item.record.name:
+            follower = self.waiting.popleft()
+            if behind and self.__low_value(follower.text):
+                self.__decide(Action.SKIP, follower, now - follower.read_at, "low value while behind")
+                continue
+            self.__decide(Action.MERGE, follower, now - follower.read_at, f"into {item.record.message_id}", log=False)
+            separator = " " if item.text.rstrip()[-1:] in ".!?…" else ". "
+            item.text = f"{item.text.rstrip()}{separator}{follower.text.strip()}"
+            item.merged.append(follower.record.message_id)
+        if item.merged:
+            logging.info(f"Scheduler merge [{item.record.name}] {', '.join(item.merged)} into "
+                         f"{item.record.message_id}: {item.text[:60]}", extra=REPEATED)
+
+        if behind and len(item.text) > policy.max_chars:
+            item.text = split_segments(item.text, policy.max_chars)[0]
+            self.__decide(Action.SHORTEN, item, age, f"to {len(item.text)} characters")
+        return item
+
+    def __low_value(self, text: str) -> bool:
+        return len(text.split()) < self.policy.min_words and "?" not in text
+
+    def __speak(self, item: _Waiting) -> None:
+        record = item.record
+        # The speaker is announced again when they start a new group of messages
+        speaker = (record.name, record.timestamp)
+        texts = [item.text] if speaker == self.last_speaker else [record.name, item.text]
+        self.last_speaker = speaker
+        utterance = self.engine.speech_all(texts)[-1]
+        utterance.add_done_callback(self.__wake)
+        if item.on_speak is not None:
+            item.on_speak(utterance)
+
+    def __decide(self, action: Action, item: _Waiting, age: float, reason: str, log: bool = True) -> None:
+        record = item.record
+        self.decisions.append(Decision(time.time(), action, record.message_id, record.name, age, reason))
+        METRICS.counter("scheduler_decisions_total", "Scheduler promotions, merges, cuts and skips",
+                        action=action.value).inc()
+        if log:
+            logging.info(f"Scheduler {action.value} [{record.name}] {reason} after {age:.1f}s: {item.text[:60]}",
+                         extra=REPEATED)
+
+    def snapshot(self) -> dict:
+        """Waiting messages, backlog age and the number of decisions of each kind in the log."""
+        counts = {action.value: 0 for action in Action}
+        for decision in list(self.decisions):
+            counts[decision.action.value] += 1
+        return {"waiting": self.pending(), "backlog_age": self.backlog_age(), "decisions": counts}
+
+    def recent(self, limit: int = 20) -> List[Decision]:
+        """The latest decisions, newest last."""
+        return list(self.decisions)[-limit:]
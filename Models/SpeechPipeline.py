@@ -0,0 +1,377 @@
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from enum import Enum
+from typing import Callable, List, Optional
+
+from Models.Metrics import METRICS
+
+
+class UtteranceState(Enum):
+    """Lifecycle of a queued utterance."""
+    QUEUED = 0       # Waiting for synthesis or for its turn to play
+    PLAYING = 1      # Audio is being played
+    PLAYED = 2       # Playback finished
+    FAILED = -1      # Synthesis or playback raised
+
+
+class Utterance:
+    """A piece of text submitted for speaking and its completion status."""
+
+    def __init__(self, text: str) -> None:
+        self.text = text
+        self.state = UtteranceState.QUEUED
+        self.error: Optional[BaseException] = None
+        self.submitted_at = time.monotonic()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        # Synthesis futures in playback order; None marks the end
+        self.segments: "queue.Queue[Optional[Future]]" = queue.Queue()
+        self.streaming = False  # More segments may still be added (see SpeechPipeline.open_stream)
+        self._done = threading.Event()
+        self._callbacks: List[Callable[["Utterance"], None]] = []
+        self._lock = threading.Lock()
+
+    def done(self) -> bool:
+        """Return True once the utterance has been played or has failed."""
+        return self._done.is_set()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """
+        Block until the utterance is finished.
+
+        Args:
+            timeout (Optional[float]): Seconds to wait, forever if None.
+
+        Returns:
+            bool: True if the utterance finished within the timeout.
+        """
+        return self._done.wait(timeout)
+
+    def add_done_callback(self, fn: Callable[["Utterance"], None]) -> None:
+        """Call `fn(utterance)` when it finishes, immediately if it already has."""
+        with self._lock:
+            if not self._done.is_set():
+                self._callbacks.append(fn)
+                return
+        fn(self)
+
+    def cancel_pending(self) -> None:
+        """Cancel synthesis of segments that have not been picked up by the player."""
+        while True:
+            try:
+                future = self.segments.get_nowait()
+            except queue.Empty:
+                return
+            if future is not None:
+                future.cancel()
+
+    def _start(self) -> None:
+        self.state = UtteranceState.PLAYING
+        self.started_at = time.monotonic()
+        METRICS.histogram("speech_wait_seconds", "Time from queueing an utterance to its first audio").observe(
+            self.started_at - self.submitted_at)
+
+    def _finish(self, state: UtteranceState, error: Optional[BaseException] = None) -> None:
+        with self._lock:
+            self.state = state
+            self.error = error
+            self.finished_at = time.monotonic()
+            self._done.set()
+            callbacks, self._callbacks = self._callbacks, []
+        for fn in callbacks:
+            fn(self)
+
+
+class _ClipTracker:
+    """Finishes an utterance once its last clip has been played by the engine."""
+
+    def __init__(self, utterance: Utterance) -> None:
+        self.utterance = utterance
+        self.outstanding = 1  # Held by the player until every segment has been queued
+        self.error: Optional[BaseException] = None
+        self.lock = threading.Lock()
+
+    def add(self) -> None:
+        with self.lock:
+            self.outstanding += 1
+
+    def fail(self, error: BaseException) -> None:
+        with self.lock:
+            self.error = self.error or error
+
+    def clip_done(self, played: bool) -> None:
+        with self.lock:
+            if not played:
+                self.error = self.error or RuntimeError("Playback stopped")
+            self.outstanding -= 1
+            if self.outstanding:
+                return
+        if self.error is None:
+            self.utterance._finish(UtteranceState.PLAYED)
+        else:
+            METRICS.counter("errors_total", "Errors by stage", stage="speech").inc()
+            self.utterance._finish(UtteranceState.FAILED, self.error)
+        if self.utterance.started_at is not None:
+            METRICS.observe_stage("playback", self.utterance.finished_at - self.utterance.started_at)
+
+    def close(self) -> None:
+        self.clip_done(True)
+
+
+class SpeechStream:
+    """
+    Feeds text into a single pipeline slot as it becomes available. The slot is
+    reserved by the first `feed`, so other speech keeps playing until then,
+    and again whenever the next piece of text is late.
+    """
+
+    def __init__(self, pipeline: "SpeechPipeline", prefix: List[str] = ()) -> None:
+        """
+        Args:
+            pipeline (SpeechPipeline): Pipeline to speak on.
+            prefix (List[str]): Segments spoken before the first fed text (e.g. "Reply:").
+        """
+        self.pipeline = pipeline
+        self.prefix = list(prefix)
+        self.utterance: Optional[Utterance] = None
+        self.lock = threading.Lock()
+
+    def feed(self, text: str) -> None:
+        """Queue the next piece of text; synthesis starts immediately."""
+        with self.lock:
+            if self.utterance is None:
+                self.utterance = self.pipeline.open_stream(self.prefix)
+            self.pipeline.add_segment(self.utterance, text)
+
+    def end(self) -> Optional[Utterance]:
+        """
+        Close the stream.
+
+        Returns:
+            Optional[Utterance]: Handle for everything fed, or None if nothing was.
+        """
+        with self.lock:
+            if self.utterance is not None:
+                self.pipeline.end_stream(self.utterance)
+            return self.utterance
+
+
+class SpeechPipeline:
+    """
+    Producer/consumer speech queue: a worker pool synthesizes upcoming utterances
+    while a single player thread plays finished audio in submission order. An
+    open stream whose next segment has not been added within `stream_wait`
+    seconds steps aside, and resumes after the utterance playing once it has.
+    """
+
+    def __init__(self, engine, workers: int = 2, max_pending: int = 8, stream_wait: float = 0.25) -> None:
+        """
+        Args:
+            engine: Object exposing `synthesize(text)` returning an audio handle,
+                `play(audio, on_done)` which returns once the clip is queued and later calls
+                `on_done(played)`, and `drain()` which waits until everything has played.
+            workers (int): Number of concurrent synthesis workers (default: 2).
+            max_pending (int): Utterances allowed to wait for playback before `submit` blocks (default: 8).
+            stream_wait (float): Seconds the player waits for the next segment of an open stream
+                before playing other utterances (default: 0.25).
+        """
+        self.engine = engine
+        self.stream_wait = stream_wait
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="tts-synth")
+        self.queue: "queue.Queue[Optional[Utterance]]" = queue.Queue(maxsize=max_pending)
+        self.submit_lock = threading.Lock()
+        self.current: Optional[Utterance] = None
+        # Open streams that gave up the player while waiting for their next segment
+        self.parked: "deque[Utterance]" = deque()
+        self.parked_lock = threading.Lock()
+        self.player = threading.Thread(target=self.__play_loop, name="tts-player", daemon=True)
+        self.player.start()
+        self.closed = False
+
+    def submit(self, text: str, timeout: Optional[float] = None,
+               segments: Optional[List[str]] = None) -> Utterance:
+        """
+        Queue text for synthesis and playback.
+
+        Blocks while `max_pending` utterances are already waiting, which keeps the
+        caller from running arbitrarily far ahead of the speaker.
+
+        Args:
+            text (str): Text to speak.
+            timeout (Optional[float]): Longest time to block on a full queue, forever if None.
+            segments (Optional[List[str]]): Pieces of `text` to synthesize in parallel and play back to back.
+
+        Returns:
+            Utterance: Handle reporting the completion status.
+
+        Raises:
+            queue.Full: If the queue stayed full for `timeout` seconds.
+        """
+        with self.submit_lock:
+            return self.__enqueue(text, timeout, segments)
+
+    def submit_all(self, texts: List[str], timeout: Optional[float] = None) -> List[Utterance]:
+        """
+        Queue several texts so they play back to back, with nothing submitted from
+        another thread in between.
+
+        Args:
+            texts (List[str]): Texts to speak, in order.
+            timeout (Optional[float]): Longest time to block on a full queue per text, forever if None.
+
+        Returns:
+            List[Utterance]: One handle per text.
+        """
+        with self.submit_lock:
+            return [self.__enqueue(text, timeout) for text in texts]
+
+    def open_stream(self, texts: List[str] = (), timeout: Optional[float] = None) -> Utterance:
+        """
+        Reserve a playback slot whose segments are added later with `add_segment`,
+        e.g. sentences of a reply that is still being generated. While the next
+        segment is late, utterances queued after the slot play in the meantime.
+
+        Args:
+            texts (List[str]): Segments known up front (e.g. a "Reply:" prefix).
+            timeout (Optional[float]): Longest time to block on a full queue, forever if None.
+
+        Returns:
+            Utterance: Handle for the whole stream.
+        """
+        with self.submit_lock:
+            return self.__enqueue(" ".join(texts), timeout, texts, close=False)
+
+    def add_segment(self, utterance: Utterance, text: str) -> None:
+        """Start synthesizing the next segment of a stream opened with `open_stream`."""
+        utterance.text = f"{utterance.text} {text}".strip()
+        utterance.segments.put(self.executor.submit(self.engine.synthesize, text))
+
+    def end_stream(self, utterance: Utterance) -> None:
+        """Mark a stream as complete."""
+        utterance.streaming = False
+        utterance.segments.put(None)
+
+    def __enqueue(self, text: str, timeout: Optional[float],
+                  segments: Optional[List[str]] = None, close: bool = True) -> Utterance:
+        utterance = Utterance(text)
+        utterance.streaming = not close
+        for segment in ([text] if segments is None else segments):
+            utterance.segments.put(self.executor.submit(self.engine.synthesize, segment))
+        if close:
+            utterance.segments.put(None)
+        try:
+            self.queue.put(utterance, timeout=timeout)
+        except queue.Full:
+            utterance.cancel_pending()
+            raise
+        return utterance
+
+    def pending(self) -> int:
+        """Number of utterances waiting for playback."""
+        return self.queue.qsize()
+
+    def backlog_age(self) -> float:
+        """Seconds the oldest utterance that has not started playing has been waiting, 0 if none."""
+        current = self.current
+        if current is not None and current.started_at is None:
+            return time.monotonic() - current.submitted_at
+        with self.queue.mutex:
+            oldest = next((u for u in self.queue.queue if u is not None), None)
+        return time.monotonic() - oldest.submitted_at if oldest is not None else 0.0
+
+    def __next_utterance(self, stopping: bool) -> Optional[Utterance]:
+        while True:
+            # A parked stream whose next segment has arrived goes first
+            with self.parked_lock:
+                ready = next((u for u in self.parked if not u.segments.empty()), None)
+                if ready is not None:
+                    self.parked.remove(ready)
+                    return ready
+                if stopping:
+                    # Nothing else will be queued; wait on the parked streams in turn
+                    return self.parked.popleft() if self.parked else None
+                parked = bool(self.parked)
+            try:
+                # Polled while streams are parked, since their segments do not wake this queue
+                return self.queue.get(timeout=0.05 if parked else None)
+            except queue.Empty:
+                continue
+
+    def __play_loop(self) -> None:
+        trackers: dict[Utterance, _ClipTracker] = {}
+        stopping = False
+        while True:
+            utterance = self.__next_utterance(stopping)
+            if utterance is None:
+                if stopping or not self.parked:
+                    break
+                stopping = True
+                continue
+            self.current = utterance
+            tracker = trackers.get(utterance)
+            if tracker is None:
+                tracker = trackers[utterance] = _ClipTracker(utterance)
+            while True:
+                try:
+                    future = utterance.segments.get(timeout=self.stream_wait if utterance.streaming
+                                                    and not stopping else None)
+                except queue.Empty:
+                    # The stream's next segment is late: let other speech play meanwhile
+                    with self.parked_lock:
+                        self.parked.append(utterance)
+                    break
+                if future is None:
+                    del trackers[utterance]
+                    tracker.close()
+                    break
+                try:
+                    audio = future.result()
+                except Exception as e:
+                    # Keep going so one failed sentence does not swallow the rest
+                    tracker.fail(e)
+                    continue
+                if utterance.started_at is None:
+                    utterance._start()
+                tracker.add()
+                try:
+                    # Returns once the clip is queued, so the next one follows without a gap
+                    self.engine.play(audio, tracker.clip_done)
+                except Exception as e:
+                    tracker.fail(e)
+                    tracker.clip_done(True)
+            self.current = None
+
+    def close(self, wait: bool = True) -> None:
+        """
+        Stop the pipeline.
+
+        Args:
+            wait (bool): Play everything already queued before returning (default: True).
+        """
+        if self.closed:
+            return
+        self.closed = True
+        if not wait:
+            while True:
+                try:
+                    utterance = self.queue.get_nowait()
+                except queue.Empty:
+                    break
+                if utterance is not None:
+                    utterance.cancel_pending()
+                    utterance._finish(UtteranceState.FAILED, RuntimeError("Speech pipeline closed"))
+            with self.parked_lock:
+                streams = list(self.parked)
+            for current in [self.current, *streams]:
+                if current is not None:
+                    current.cancel_pending()
+                    current.streaming = False
+                    current.segments.put(None)
+        self.queue.put(None)
+        self.player.join()
+        self.executor.shutdown(wait=wait)
+        if wait:
+            self.engine.drain()
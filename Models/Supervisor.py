@@ -0,0 +1,364 @@
+import heapq
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, List, Optional, Sequence
+
+from selenium.webdriver.chrome.webdriver import WebDriver
+
+from Models.AudioSink import AudioSink, PygameSink
+from Models.ChatScraper import IngestionMode
+from Models.Gemini import GeminiTranscript, TokenBudget
+from Models.Memory import MemoryManager
+from Models.Metrics import METRICS, Histogram
+from Models.Model import VoiceAI, reading_config
+from Models.TTSBackends import SpeechCache, TTSBackend, default_backends
+from Models.VoiceModel import GoogleTextToSpeechModel as Engine
+
+
+class DriverPool:
+    """
+    Browsers for the rooms of a supervisor. A browser is used by one room
+    until it is discarded; each gets a slot number (used e.g. to pick its
+    profile directory) that is reused once the browser is gone. `spares`
+    browsers are kept started in the background, so a room that lost its
+    browser gets a new one without waiting for it to boot.
+    """
+
+    def __init__(self, factory: Callable[[int], WebDriver], spares: int = 1) -> None:
+        """
+        Args:
+            factory (Callable[[int], WebDriver]): Starts a browser for a slot number.
+            spares (int): Browsers started ahead of demand (default: 1).
+        """
+        self.factory = factory
+        self.spares = spares
+        self.starting: List[Future] = []
+        self.slots: dict[int, int] = {}         # id(driver) -> slot
+        self.free_slots: List[int] = []
+        self.next_slot = 0
+        self.lock = threading.Lock()
+        self.closed = False
+        self.executor = ThreadPoolExecutor(max_workers=max(1, spares), thread_name_prefix="driver-pool")
+        self.__refill()
+
+    def acquire(self) -> WebDriver:
+        """Return a spare browser, or start one."""
+        with self.lock:
+            pending = self.starting.pop(0) if self.starting else None
+        if pending is not None:
+            try:
+                driver, _ = pending.result()
+            except Exception as e:
+                logging.error(f"Spare browser failed to start: {e}")
+            else:
+                self.__refill()
+                return driver
+        driver, _ = self.__start(self.__take_slot())
+        return driver
+
+    def discard(self, driver: WebDriver) -> None:
+        """Quit a browser that crashed or left its meeting, freeing its slot."""
+        try:
+            driver.quit()
+        except Exception:
+            pass  # Usually already gone
+        with self.lock:
+            slot = self.slots.pop(id(driver), None)
+            if slot is not None:
+                heapq.heappush(self.free_slots, slot)
+        self.__refill()
+
+    def close(self) -> None:
+        with self.lock:
+            self.closed = True
+            starting, self.starting = self.starting, []
+        for future in starting:
+            future.add_done_callback(self.__quit_spare)
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    def __quit_spare(self, future: Future) -> None:
+        if not future.cancelled() and future.exception() is None:
+            self.discard(future.result()[0])
+
+    def __take_slot(self) -> int:
+        with self.lock:
+            if self.free_slots:
+                return heapq.heappop(self.free_slots)
+            self.next_slot += 1
+            return self.next_slot - 1
+
+    def __start(self, slot: int) -> tuple[WebDriver, int]:
+        try:
+            driver = self.factory(slot)
+        except Exception:
+            with self.lock:
+                heapq.heappush(self.free_slots, slot)
+            raise
+        with self.lock:
+            self.slots[id(driver)] = slot
+        return driver, slot
+
+    def __refill(self) -> None:
+        with self.lock:
+            self.__refill_locked()
+
+    def __refill_locked(self) -> None:
+        while not self.closed and len(self.starting) < self.spares:
+            if self.free_slots:
+                slot = heapq.heappop(self.free_slots)
+            else:
+                slot, self.next_slot = self.next_slot, self.next_slot + 1
+            self.starting.append(self.executor.submit(self.__start, slot))
+
+
+class RoomStats:
+    """Throughput and latency of one room, kept across restarts."""
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.started_at = time.monotonic()
+        self.messages = 0
+        self.polls = 0
+        self.restarts = 0
+        self.state = "starting"
+        self.last_error: Optional[str] = None
+        self.poll = Histogram()
+        self.speech = Histogram()
+
+    def snapshot(self) -> dict:
+        uptime = time.monotonic() - self.started_at
+        poll, speech = self.poll.snapshot(), self.speech.snapshot()
+        return {"room": self.name, "state": self.state, "uptime": uptime, "messages": self.messages,
+                "messages_per_minute": self.messages / uptime * 60 if uptime else 0.0,
+                "polls": self.polls, "restarts": self.restarts, "last_error": self.last_error,
+                "poll_p50": poll["p50"], "poll_p95": poll["p95"],
+                "speech_p50": speech["p50"], "speech_p95": speech["p95"]}
+
+
+class MeetingSupervisor:
+    """
+    Runs one `VoiceAI` per meeting, each on its own thread with a browser from
+    a shared `DriverPool`. The rooms share the TTS backends (so one speech
+    cache and one in-flight request per text) and one Gemini client (model,
+    worker pool, rate limit, reply cache and in-flight requests), while each
+    keeps its own conversation history and playback. A room whose
+    browser crashes or whose loop fails is restarted on a fresh browser with
+    exponential backoff.
+
+    Usage:
+        supervisor = MeetingSupervisor(links, lambda slot: get_driver(DriverType.CHROME))
+        supervisor.start()
+        supervisor.wait()
+    """
+
+    def __init__(self, meetings: Sequence[str], driver_factory: Callable[[int], WebDriver],
+                 config_path: str = 'configurations/config.json',
+                 credentials_path: str = 'configurations/credentials.json',
+                 ingestion: IngestionMode = IngestionMode.INCREMENTAL,
+                 lang: str = 'vi',
+                 backends: Optional[Sequence[TTSBackend]] = None,
+                 sink_factory: Optional[Callable[[int], AudioSink]] = None,
+                 gemini_model=None,
+                 gemini_key=...,
+                 gemini_budget: Optional[TokenBudget] = None,
+                 history_path: str = 'data/history.sqlite3',
+                 join: bool = True,
+                 spares: int = 1,
+                 restart_delay: float = 5.0,
+                 max_failures: int = 10,
+                 report_interval: float = 60.0,
+                 memory: Optional[MemoryManager] = None) -> None:
+        """
+        Args:
+            meetings (Sequence[str]): Google Meet links, one room each.
+            driver_factory (Callable[[int], WebDriver]): Starts a browser for a pool slot.
+            config_path (str): Voice config shared by every room.
+            credentials_path (str): Google account used in every room.
+            ingestion (IngestionMode): How rooms read the chat (default: INCREMENTAL).
+            lang (str): Speech language (default: "vi").
+            backends (Optional[Sequence[TTSBackend]]): TTS backends shared by all rooms
+                (default: Google TTS with one SpeechCache, then espeak-ng if installed).
+            sink_factory (Optional[Callable[[int], AudioSink]]): Playback sink for a room index
+                (default: a PygameSink on the room's own mixer channel).
+            gemini_model: Model name or object behind the GeminiTranscript shared by every room
+                (default: gemini-1.5-flash).
+            gemini_key: API key (default: read from the key file).
+            gemini_budget (Optional[TokenBudget]): Rate limit shared by all rooms (default: a new TokenBudget).
+            history_path (str): Chat history database shared by all rooms.
+            join (bool): Sign in and join each meeting; False when the browsers already show the chat.
+            spares (int): Browsers kept started for restarts (default: 1).
+            restart_delay (float): First wait before restarting a failed room, doubled per failure (default: 5 s).
+            max_failures (int): Consecutive failures before a room is given up (default: 10).
+            report_interval (float): Seconds between per-room summaries in the log (default: 60).
+            memory (Optional[MemoryManager]): Garbage collection shared by every room (default: a new MemoryManager).
+        """
+        self.meetings = list(meetings)
+        self.pool = DriverPool(driver_factory, spares)
+        self.config_path = config_path
+        self.credentials_path = credentials_path
+        self.ingestion = ingestion
+        self.lang = lang
+        if backends is None:
+            backends = default_backends(SpeechCache())
+        self.backends = list(backends)
+        self.sink_factory = sink_factory if sink_factory is not None else (lambda index: PygameSink(channel=index))
+        self.gemini_model = gemini_model if gemini_model is not None else 'gemini-1.5-flash'
+        self.gemini_key = gemini_key
+        self.gemini_budget = gemini_budget if gemini_budget is not None else TokenBudget()
+        self.gemini: Optional[GeminiTranscript] = None  # Built by the first room, see __build
+        self.gemini_lock = threading.Lock()
+        self.history_path = history_path
+        self.join = join
+        self.restart_delay = restart_delay
+        self.max_failures = max_failures
+        self.report_interval = report_interval
+        self.memory = memory if memory is not None else MemoryManager()
+        self.stats = [RoomStats(f"room-{i}") for i in range(len(self.meetings))]
+        self.rooms: List[Optional[VoiceAI]] = [None] * len(self.meetings)  # None while (re)starting
+        self.sinks: List[Optional[AudioSink]] = [None] * len(self.meetings)
+        self.stopped = threading.Event()
+        self.threads: List[threading.Thread] = []
+
+    def start(self) -> "MeetingSupervisor":
+        """Start every room on its own thread."""
+        reading_config(self.config_path)  # Created once here, not raced by the rooms
+        for index in range(len(self.meetings)):
+            thread = threading.Thread(target=self.__room, args=(index,), name=f"room-{index}", daemon=True)
+            thread.start()
+            self.threads.append(thread)
+        return self
+
+    def wait(self) -> None:
+        """Block until every room has ended, logging per-room stats every `report_interval` seconds."""
+        next_report = time.monotonic() + self.report_interval
+        while True:
+            alive = [thread for thread in self.threads if thread.is_alive()]
+            if not alive:
+                return
+            alive[0].join(max(0.0, next_report - time.monotonic()))
+            if time.monotonic() >= next_report:
+                self.report()
+                next_report += self.report_interval
+
+    def stop(self) -> None:
+        """Ask every room to leave and wait for them."""
+        self.stopped.set()
+        for thread in self.threads:
+            thread.join()
+        self.pool.close()
+        if self.gemini is not None:
+            self.gemini.close()
+        self.report()
+
+    def snapshot(self) -> List[dict]:
+        """Per-room state, uptime, message count and rate, restarts and poll/speech latency percentiles."""
+        return [stats.snapshot() for stats in self.stats]
+
+    def report(self) -> None:
+        for room in self.snapshot():
+            logging.info(f"{room['room']} {room['state']}: {room['messages']} messages"
+                         f" ({room['messages_per_minute']:.1f}/min), {room['restarts']} restarts,"
+                         f" speech p50 {_ms(room['speech_p50'])} p95 {_ms(room['speech_p95'])},"
+                         f" poll p95 {_ms(room['poll_p95'])}")
+
+    def __build(self, index: int, driver: WebDriver) -> VoiceAI:
+        if self.sinks[index] is None:
+            # The sink outlives restarts: a PygameSink holds its mixer channel
+            self.sinks[index] = self.sink_factory(index)
+        with self.gemini_lock:
+            if self.gemini is None:
+                self.gemini = GeminiTranscript(self.gemini_model, key=self.gemini_key, budget=self.gemini_budget)
+        engine = Engine(self.lang, sink=_Borrowed(self.sinks[index]), backends=self.backends)
+        try:
+            return VoiceAI(driver, self.config_path, self.credentials_path, self.ingestion,
+                           gemini_model=self.gemini.conversation(), history_path=self.history_path,
+                           engine=engine, meeting_link=self.meetings[index], memory=self.memory)
+        except Exception:
+            engine.close(wait=False)  # Stops the pipeline and the borrowed sink
+            raise
+
+    def __room(self, index: int) -> None:
+        stats = self.stats[index]
+        failures = 0
+        while not self.stopped.is_set():
+            driver = ai = None
+            try:
+                driver = self.pool.acquire()
+                ai = self.__build(index, driver)
+                ai.speech_latency = stats.speech  # Kept across restarts
+                if self.join:
+                    stats.state = "joining"
+                    ai.join_meeting()
+                stats.state = "running"
+                self.rooms[index] = ai
+                failures = 0
+                while not self.stopped.is_set():
+                    start = time.perf_counter()
+                    new_messages = ai.run()
+                    stats.poll.observe(time.perf_counter() - start)
+                    stats.polls += 1
+                    if new_messages:
+                        stats.messages += len(new_messages)
+                        METRICS.counter("room_messages_total", "Chat messages read per room",
+                                        room=stats.name).inc(len(new_messages))
+            except Exception as e:
+                self.rooms[index] = None
+                # `run` usually releases the room before raising; whatever failed, make sure
+                if ai is not None:
+                    self.__release(ai)
+                if driver is not None:
+                    self.pool.discard(driver)
+                failures += 1
+                stats.last_error = str(e)
+                METRICS.counter("room_restarts_total", "Rooms restarted after a failure", room=stats.name).inc()
+                logging.error(f"{stats.name} failed ({failures} in a row): {e}")
+                if failures >= self.max_failures:
+                    stats.state = "failed"
+                    logging.error(f"{stats.name} given up after {failures} failures")
+                    break
+                stats.state = "restarting"
+                stats.restarts += 1
+                self.stopped.wait(min(self.restart_delay * 2 ** (failures - 1), 300.0))
+                continue
+            # Stopped by the supervisor
+            stats.state = "stopped"
+            self.rooms[index] = None
+            self.__release(ai)
+            self.pool.discard(driver)
+        if self.sinks[index] is not None:
+            self.sinks[index].close()
+
+    @staticmethod
+    def __release(ai: VoiceAI) -> None:
+        try:
+            ai.release()
+        except Exception as e:
+            logging.warning(f"Room release failed: {e}")
+
+
+class _Borrowed(AudioSink):
+    """Passes calls to a sink that the supervisor owns, except `close`."""
+
+    def __init__(self, sink: AudioSink) -> None:
+        self.sink = sink
+
+    def prepare(self, samples, rate: int):
+        return self.sink.prepare(samples, rate)
+
+    def play(self, clip, on_done=None) -> None:
+        self.sink.play(clip, on_done)
+
+    def drain(self, timeout: Optional[float] = None) -> bool:
+        return self.sink.drain(timeout)
+
+    def stop(self) -> None:
+        self.sink.stop()
+
+    def close(self) -> None:
+        self.sink.stop()
+
+
+def _ms(seconds: Optional[float]) -> str:
+    return "-" if seconds is None else f"{seconds * 1000:.0f}ms"
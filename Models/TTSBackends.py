@@ -0,0 +1,447 @@
+import hashlib
+import io
+import logging
+import os
+import shutil
+import subprocess
+import threading
+import time
+import wave
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeout
+from typing import Iterable, Optional, Sequence
+
+import numpy as np
+
+from CustomExeption.CustomExeption import BackendUnavailable
+from Models.AudioDSP import decode_mp3
+from Models.Metrics import METRICS, Histogram
+
+
+class SpeechCache:
+    """
+    Content-addressed cache of synthesized MP3 audio with a size-bounded in-memory
+    LRU tier in front of a persistent on-disk tier.
+    """
+
+    def __init__(self, max_memory_bytes: int = 32 * 1024 * 1024,
+                 directory: Optional[str] = "data/cache/tts",
+                 max_disk_bytes: int = 512 * 1024 * 1024) -> None:
+        """
+        Args:
+            max_memory_bytes (int): Memory tier budget in bytes (default: 32 MiB).
+            directory (Optional[str]): Disk tier location, or None to keep the cache in memory only.
+            max_disk_bytes (int): Disk tier budget in bytes; oldest files are pruned beyond it (default: 512 MiB).
+        """
+        self.max_memory_bytes = max_memory_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self.directory = directory
+        self.memory: OrderedDict[str, bytes] = OrderedDict()
+        self.memory_bytes = 0
+        self.disk_bytes = 0
+        self.stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "evictions": 0}
+        self.lock = threading.Lock()
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+            self.disk_bytes = sum(entry.stat().st_size for entry in os.scandir(directory) if entry.is_file())
+
+    @staticmethod
+    def key(text: str, lang: str) -> str:
+        """
+        Build the cache key for an utterance. Speed is not part of it: the
+        cached MP3 is the audio before the speed change, which is applied
+        after decoding.
+
+        Args:
+            text (str): Text to be spoken, normalized for case and whitespace.
+            lang (str): gTTS language code.
+
+        Returns:
+            str: Hex digest identifying the audio.
+        """
+        normalized = " ".join(text.split()).casefold()
+        return hashlib.sha1(f"{lang}\0{normalized}".encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Return the cached audio for `key`, promoting disk hits into memory."""
+        with self.lock:
+            data = self.memory.get(key)
+            if data is not None:
+                self.memory.move_to_end(key)
+                self.stats["memory_hits"] += 1
+                return data
+
+        data = None
+        if self.directory:
+            try:
+                with open(self.__path(key), "rb") as f:
+                    data = f.read()
+            except FileNotFoundError:
+                pass
+
+        with self.lock:
+            if data is None:
+                self.stats["misses"] += 1
+                return None
+            self.stats["disk_hits"] += 1
+            self.__remember(key, data)
+        return data
+
+    def put(self, key: str, data: bytes) -> None:
+        """Store audio in both tiers."""
+        with self.lock:
+            self.__remember(key, data)
+        if self.directory and not os.path.exists(self.__path(key)):
+            tmp_path = f"{self.__path(key)}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, self.__path(key))
+            with self.lock:
+                self.disk_bytes += len(data)
+                prune = self.disk_bytes > self.max_disk_bytes
+            if prune:
+                self.__prune_disk()
+
+    def __contains__(self, key: str) -> bool:
+        with self.lock:
+            if key in self.memory:
+                return True
+        return bool(self.directory) and os.path.exists(self.__path(key))
+
+    def snapshot(self) -> dict:
+        """Return the hit, miss and eviction counters along with the tier sizes."""
+        with self.lock:
+            return {**self.stats, "memory_bytes": self.memory_bytes, "disk_bytes": self.disk_bytes}
+
+    def __path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.mp3")
+
+    def __remember(self, key: str, data: bytes) -> None:
+        if key in self.memory:
+            self.memory.move_to_end(key)
+            return
+        self.memory[key] = data
+        self.memory_bytes += len(data)
+        while self.memory_bytes > self.max_memory_bytes and len(self.memory) > 1:
+            _, evicted = self.memory.popitem(last=False)
+            self.memory_bytes -= len(evicted)
+            self.stats["evictions"] += 1
+
+    def __prune_disk(self) -> None:
+        entries = sorted((entry for entry in os.scandir(self.directory)
+                          if entry.is_file() and entry.name.endswith(".mp3")),
+                         key=lambda entry: entry.stat().st_atime)
+        total = sum(entry.stat().st_size for entry in entries)
+        for entry in entries:
+            if total <= self.max_disk_bytes * 0.9:
+                break
+            size = entry.stat().st_size
+            try:
+                os.remove(entry.path)
+            except FileNotFoundError:
+                continue
+            total -= size
+        with self.lock:
+            self.disk_bytes = total
+
+
+class TTSBackend:
+    """A speech synthesizer the router can choose from."""
+
+    name = "backend"
+
+    def synthesize(self, text: str, config: dict) -> tuple[np.ndarray, int]:
+        """
+        Synthesize text.
+
+        Args:
+            text (str): Text to speak.
+            config (dict): The engine's REMOVE/SPEED/LANG settings.
+
+        Returns:
+            tuple[np.ndarray, int]: Mono float32 samples and their sample rate.
+        """
+        raise NotImplementedError
+
+    def prewarm(self, texts: Iterable[str], config: dict, executor: ThreadPoolExecutor) -> None:
+        """Fill the backend's cache for `texts` in the background, if it has one."""
+
+
+class GTTSBackend(TTSBackend):
+    """Google TTS over the network, behind a SpeechCache with in-flight request coalescing."""
+
+    name = "gtts"
+
+    def __init__(self, cache: Optional[SpeechCache] = None, timeout: tuple[float, float] = (5, 20)) -> None:
+        """
+        Args:
+            cache (Optional[SpeechCache]): Audio cache, possibly shared between engines (default: a new SpeechCache).
+            timeout (tuple[float, float]): Connect and read timeouts in seconds (default: 5, 20).
+        """
+        self.cache = cache if cache is not None else SpeechCache()
+        self.timeout = timeout
+        self.inflight: dict[str, Future] = {}
+        self.inflight_lock = threading.Lock()
+
+    def synthesize(self, text: str, config: dict) -> tuple[np.ndarray, int]:
+        mp3 = self.fetch(text, config)
+        if not config["REMOVE"]:
+            os.makedirs("data/voices/", exist_ok=True)
+            with open(f"data/voices/sound_{time.time_ns()}.mp3", "wb") as f:
+                f.write(mp3)
+        return decode_mp3(mp3)
+
+    def fetch(self, text: str, config: dict) -> bytes:
+        """
+        Return the MP3 for `text`, calling gTTS only on a cache miss.
+
+        Args:
+            text (str): Text to speak.
+            config (dict): The engine's REMOVE/SPEED/LANG settings.
+
+        Returns:
+            bytes: Encoded MP3.
+        """
+        key = self.cache.key(text, config["LANG"])
+        mp3 = self.cache.get(key)
+        if mp3 is not None:
+            return mp3
+
+        # Share one gTTS call between concurrent requests for the same audio
+        with self.inflight_lock:
+            future = self.inflight.get(key)
+            owner = future is None
+            if owner:
+                future = self.inflight[key] = Future()
+        if not owner:
+            return future.result()
+
+        try:
+            from gtts import gTTS
+            buffer = io.BytesIO()
+            gTTS(text=text, lang=config["LANG"], timeout=self.timeout).write_to_fp(buffer)
+            mp3 = buffer.getvalue()
+            self.cache.put(key, mp3)
+            future.set_result(mp3)
+            return mp3
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self.inflight_lock:
+                del self.inflight[key]
+
+    def prewarm(self, texts: Iterable[str], config: dict, executor: ThreadPoolExecutor) -> None:
+        for text in texts:
+            if self.cache.key(text, config["LANG"]) not in self.cache:
+                executor.submit(self.fetch, text, config)
+
+
+class EspeakBackend(TTSBackend):
+    """
+    Local, offline synthesis with the espeak-ng command line tool. Robotic next
+    to Google TTS, but it answers in tens of milliseconds with no network.
+    """
+
+    name = "espeak-ng"
+
+    def __init__(self, executable: str = "espeak-ng", voices: Optional[dict] = None,
+                 timeout: float = 10.0) -> None:
+        """
+        Args:
+            executable (str): espeak-ng binary name or path (default: "espeak-ng").
+            voices (Optional[dict]): Maps gTTS language codes to espeak-ng voices where they differ.
+            timeout (float): Seconds before the process is killed (default: 10).
+        """
+        self.executable = executable
+        self.voices = voices or {"zh-CN": "cmn", "zh-TW": "cmn", "zh": "cmn"}
+        self.timeout = timeout
+
+    @staticmethod
+    def available(executable: str = "espeak-ng") -> bool:
+        """Return True if the espeak-ng binary is on the PATH."""
+        return shutil.which(executable) is not None
+
+    def synthesize(self, text: str, config: dict) -> tuple[np.ndarray, int]:
+        voice = self.voices.get(config["LANG"], config["LANG"])
+        result = subprocess.run([self.executable, "-v", voice, "--stdout"], input=text.encode("utf-8"),
+                                capture_output=True, timeout=self.timeout, check=True)
+        with wave.open(io.BytesIO(result.stdout)) as f:
+            pcm = np.frombuffer(f.readframes(f.getnframes()), dtype=f"<i{f.getsampwidth()}")
+            samples = pcm.reshape(-1, f.getnchannels()).mean(axis=1) / float(1 << (8 * f.getsampwidth() - 1))
+            return samples.astype(np.float32), f.getframerate()
+
+
+class BackendStats:
+    """Latency history and health of one backend, as seen by the router."""
+
+    def __init__(self, recent: int = 20) -> None:
+        self.latency = Histogram()
+        self.recent: deque[float] = deque(maxlen=recent)
+        self.calls = 0
+        self.failures = 0
+        self.timeouts = 0
+        self.consecutive_failures = 0
+        self.open_until = 0.0
+
+    def recent_quantile(self, q: float) -> Optional[float]:
+        if not self.recent:
+            return None
+        ordered = sorted(self.recent)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def default_backends(cache: Optional[SpeechCache] = None) -> list[TTSBackend]:
+    """
+    Google TTS, then espeak-ng as the local fallback if it is installed. Without
+    it there is nothing to fall back to, which is logged as a warning.
+    """
+    backends: list[TTSBackend] = [GTTSBackend(cache)]
+    if EspeakBackend.available():
+        backends.append(EspeakBackend())
+    else:
+        logging.warning("espeak-ng not found on PATH: no offline TTS fallback, "
+                        "speech waits for Google TTS however slow it is")
+    return backends
+
+
+class TTSRouter:
+    """
+    Picks a backend for each utterance within a latency budget. Backends are
+    tried in order of preference: one is skipped while its recent p90 latency is
+    over budget or after repeated failures, and when the chosen one has not
+    answered within the budget the next one is used instead. A call that misses
+    its budget keeps running in the background, so its result still lands in
+    the cache and its latency is still recorded. Prewarming runs on its own
+    pool, so it never queues ahead of a live utterance and eats its budget.
+    """
+
+    def __init__(self, backends: Sequence[TTSBackend], budget: float = 3.0, max_failures: int = 3,
+                 cooldown: float = 30.0, min_samples: int = 5, workers: int = 4, prewarm_workers: int = 1) -> None:
+        """
+        Args:
+            backends (Sequence[TTSBackend]): Backends in order of preference; the last is the fallback of last resort.
+            budget (float): Seconds an utterance may wait for a backend before falling back (default: 3.0).
+            max_failures (int): Consecutive failures or timeouts before a backend is skipped (default: 3).
+            cooldown (float): Seconds a failing backend is skipped for (default: 30).
+            min_samples (int): Recent calls needed before latency is used to skip a backend (default: 5).
+            workers (int): Backend calls allowed in flight, including late ones (default: 4).
+            prewarm_workers (int): Background prewarm calls allowed in flight (default: 1).
+        """
+        if not backends:
+            raise ValueError("TTSRouter needs at least one backend")
+        self.backends = list(backends)
+        self.budget = budget
+        self.max_failures = max_failures
+        self.cooldown = cooldown
+        self.min_samples = min_samples
+        self.stats = {backend.name: BackendStats() for backend in self.backends}
+        self.fallbacks = 0
+        self.lock = threading.Lock()
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="tts-backend")
+        self.prewarmer = ThreadPoolExecutor(max_workers=prewarm_workers, thread_name_prefix="tts-prewarm")
+
+    def candidates(self) -> list[TTSBackend]:
+        """Backends worth trying right now, in order; never empty."""
+        now = time.monotonic()
+        chosen = []
+        with self.lock:
+            for backend in self.backends:
+                stats = self.stats[backend.name]
+                if stats.open_until > now:
+                    continue
+                p90 = stats.recent_quantile(0.9)
+                if len(stats.recent) >= self.min_samples and p90 is not None and p90 > self.budget:
+                    continue
+                chosen.append(backend)
+        # When everything looks unhealthy, still try the last resort
+        return chosen or self.backends[-1:]
+
+    def synthesize(self, text: str, config: dict) -> tuple[np.ndarray, int]:
+        """
+        Synthesize with the first backend that answers within the budget.
+
+        Args:
+            text (str): Text to speak.
+            config (dict): The engine's REMOVE/SPEED/LANG settings.
+
+        Returns:
+            tuple[np.ndarray, int]: Mono float32 samples and their sample rate.
+
+        Raises:
+            BackendUnavailable: If every backend tried failed or timed out.
+        """
+        candidates = self.candidates()
+        errors = []
+        for i, backend in enumerate(candidates):
+            last = i == len(candidates) - 1
+            try:
+                if last:
+                    # The last candidate gets as long as it needs, on this thread so a pool
+                    # full of stalled calls cannot hold it up
+                    return self.__call(backend, text, config)
+                return self.executor.submit(self.__call, backend, text, config).result(timeout=self.budget)
+            except FutureTimeout:
+                errors.append(f"{backend.name}: no answer within {self.budget:g}s")
+            except Exception as e:
+                errors.append(f"{backend.name}: {e}")
+            if not last:
+                with self.lock:
+                    self.fallbacks += 1
+                METRICS.counter("tts_fallbacks_total", "Utterances handed to the next TTS backend",
+                                backend=backend.name).inc()
+                logging.warning(f"TTS fallback from {backend.name} to {candidates[i + 1].name}: {errors[-1]}")
+        raise BackendUnavailable("; ".join(errors))
+
+    def __call(self, backend: TTSBackend, text: str, config: dict) -> tuple[np.ndarray, int]:
+        start = time.monotonic()
+        try:
+            result = backend.synthesize(text, config)
+        except Exception:
+            self.__record(backend, time.monotonic() - start, failed=True)
+            raise
+        self.__record(backend, time.monotonic() - start, failed=False)
+        return result
+
+    def __record(self, backend: TTSBackend, elapsed: float, failed: bool) -> None:
+        if failed:
+            METRICS.counter("errors_total", "Errors by stage", stage=f"tts_{backend.name}").inc()
+        else:
+            METRICS.histogram("tts_backend_seconds", "Synthesis time per TTS backend",
+                              backend=backend.name).observe(elapsed)
+        stats = self.stats[backend.name]
+        with self.lock:
+            stats.calls += 1
+            timed_out = elapsed > self.budget
+            if failed:
+                stats.failures += 1
+            else:
+                stats.latency.observe(elapsed)
+                stats.recent.append(elapsed)
+            if timed_out:
+                stats.timeouts += 1
+            if failed or timed_out:
+                stats.consecutive_failures += 1
+                if stats.consecutive_failures >= self.max_failures:
+                    stats.open_until = time.monotonic() + self.cooldown
+                    stats.consecutive_failures = 0
+            else:
+                stats.consecutive_failures = 0
+
+    def prewarm(self, texts: Iterable[str], config: dict) -> None:
+        """Let every backend cache `texts` in the background."""
+        texts = list(texts)
+        for backend in self.backends:
+            backend.prewarm(texts, config, self.prewarmer)
+
+    def snapshot(self) -> dict:
+        """Per-backend call, failure and timeout counts with latency percentiles, plus the fallback count."""
+        with self.lock:
+            backends = {name: {"calls": s.calls, "failures": s.failures, "timeouts": s.timeouts,
+                               "skipped": s.open_until > time.monotonic(), "latency": s.latency.snapshot()}
+                        for name, s in self.stats.items()}
+            return {"fallbacks": self.fallbacks, "backends": backends}
+
+    def close(self) -> None:
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        self.prewarmer.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,109 @@
+import re
+from functools import lru_cache
+from typing import NamedTuple
+
+_URL = r"\b(?:https?://|www\.)\S+"
+_EMOJI = "[\U0001F1E6-\U0001F1FF\U0001F300-\U0001FAFF\u2600-\u27BF\u2B00-\u2BFF\uFE0F\u200D\u20E3]+"
+
+# Links, emoji runs (with the spaces around them), @mentions, letters or
+# symbols repeated three or more times, words made of a repeated syllable
+# ("hahaha"), and whitespace runs, matched in one scan by a single pattern.
+# Digits are never collapsed.
+_TOKENS = re.compile(
+    rf"(?P<url>{_URL})"
+    rf"|(?P<emoji>\s*{_EMOJI}(?:\s+{_EMOJI})*\s*)"
+    r"|(?<!\S)@(?P<mention>\w)"
+    r"|(?P<syllable>\b(?P<unit>[^\W\d_]{2,3}?)(?P=unit){2,})"
+    r"|(?P<repeat>(?P<char>[^\W\d]|[^\w\s])(?P=char){2,})"
+    r"|(?P<space>\s{2,}|[\t\n\r\f\v])"
+)
+_WORD = re.compile(r"\w")
+_LINKS = re.compile(_URL)
+
+
+class LanguagePack(NamedTuple):
+    """Words spoken in place of what the TTS cannot read well, for one language."""
+    url: str                # Said instead of a link inside a sentence; links on their own are dropped
+    symbols: dict           # Symbol -> spoken word, for messages made only of symbols
+
+
+PACKS = {
+    "vi": LanguagePack("đường link", {
+        "@": "a còng", "#": "thăng", "$": "đô la", "%": "phần trăm",
+        "^": "mũ", "&": "và", "*": "sao", "!": "chấm than", "?": "hỏi chấm",
+        ":": "hai chấm", "=": "bằng", ")": "đóng ngoặc", "(": "mở ngoặc"}),
+    "en": LanguagePack("link", {
+        "@": "at", "#": "hash", "$": "dollar", "%": "percent",
+        "^": "caret", "&": "and", "*": "star", "!": "exclamation mark", "?": "question mark",
+        ":": "colon", "=": "equals", ")": "close bracket", "(": "open bracket", "+": "plus"}),
+}
+# Languages without a pack still get links, emoji and repeats collapsed
+DEFAULT_PACK = LanguagePack("link", {})
+
+
+class TextNormalizer:
+    """
+    Rewrites chat text into what is worth sending to the TTS, in one regex
+    pass: links become the pack's word for "link" (or vanish when they are the
+    whole message), emoji runs are dropped, @mentions lose the @, runs such
+    as "!!!!" or "sooooo" or "hahahaha" are cut down, and whitespace is
+    collapsed. A message left with no letters or digits, such as "?", is
+    spelled out with the pack's symbol words in a single `str.translate`.
+    Results are memoized, since names and short reactions repeat.
+
+    Use `normalizer_for(lang)` to share one instance per language.
+    """
+
+    def __init__(self, pack: LanguagePack = DEFAULT_PACK, cache_size: int = 4096) -> None:
+        """
+        Args:
+            pack (LanguagePack): Spoken words for links and symbols (default: no symbol words).
+            cache_size (int): Distinct texts memoized (default: 4096).
+        """
+        self.pack = pack
+        self.symbols = str.maketrans({symbol: f" {word} " for symbol, word in pack.symbols.items()})
+        self.normalize = lru_cache(maxsize=cache_size)(self.__normalize)
+
+    def __call__(self, text: str) -> str:
+        """
+        Args:
+            text (str): Chat text.
+
+        Returns:
+            str: Text to synthesize, empty if nothing is left worth reading.
+        """
+        return self.normalize(text)
+
+    def __normalize(self, text: str) -> str:
+        links = False
+
+        def replace(match: re.Match) -> str:
+            nonlocal links
+            kind = match.lastgroup
+            if kind == "url":
+                links = True
+                return self.pack.url
+            if kind == "emoji":
+                return " "
+            if kind == "mention":
+                return match.group("mention")
+            if kind == "syllable":
+                return match.group("unit") * 2
+            if kind == "repeat":
+                char = match.group("char")
+                return char * 2 if char.isalnum() else char
+            return " "
+
+        spoken = _TOKENS.sub(replace, text).strip()
+        if not _WORD.search(spoken):
+            # Nothing readable: spell out the symbols, if the pack knows them
+            return " ".join(spoken.translate(self.symbols).split())
+        if links and not _WORD.search(_LINKS.sub("", text)):
+            return ""  # Only links
+        return spoken
+
+
+@lru_cache(maxsize=None)
+def normalizer_for(lang: str) -> TextNormalizer:
+    """The shared normalizer for a gTTS language code such as "vi", "en" or "zh-CN"."""
+    return TextNormalizer(PACKS.get(lang.split("-")[0].lower(), DEFAULT_PACK))
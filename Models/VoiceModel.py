@@ -1,14 +1,15 @@
-from gtts import gTTS
-from gtts.lang import tts_langs
-import os
-import pygame
-from pydub import AudioSegment
-import time
 import re
+import textwrap
 from enum import Enum
+from typing import Iterable, Optional, Sequence
 
-# Initialize pygame mixer
-pygame.mixer.init()
+from Models.AudioDSP import time_stretch, trim_silence
+from Models.AudioSink import AudioSink, ClipCallback, PygameSink
+from Models.Config import supported_languages
+from Models.Metrics import METRICS
+from Models.SpeechPipeline import SpeechPipeline, SpeechStream, Utterance
+from Models.TextNormalizer import normalizer_for
+from Models.TTSBackends import GTTSBackend, SpeechCache, TTSBackend, TTSRouter, default_backends
 
 class STATUS(Enum):
     """Enum representing different statuses of configuration changes."""
@@ -18,6 +19,9 @@ class STATUS(Enum):
     INVALID = 3  # Invalid configuration
     ERROR = -1   # Error occurred
     
+# Boundaries used to split long text for parallel synthesis
+SENTENCE_END = re.compile(r'(?<=[.!?…])\s+|\n+')
+CLAUSE_END = re.compile(r'(?<=[,;:])\s+|\s+(?=[-–—]\s)')
 
 def has_text(content: str) -> bool:
     """
@@ -50,29 +54,85 @@ def replace_special_chars(content: str) -> str:
         content = content.replace(char, replacement)
     return content
 
+def split_segments(text: str, max_chars: int = 100) -> list[str]:
+    """
+    Split text into pieces of at most `max_chars` characters, preferring sentence
+    boundaries, then clause boundaries, then whitespace. The first piece is kept
+    as short as possible so playback can start early; later pieces are merged up
+    to `max_chars` to avoid needless requests.
+
+    Args:
+        text (str): Text to split.
+        max_chars (int): Longest piece (default: 100).
+
+    Returns:
+        list[str]: Pieces in reading order.
+    """
+    pieces = []
+    for sentence in SENTENCE_END.split(text.strip()):
+        if len(sentence) <= max_chars:
+            pieces.append(sentence)
+            continue
+        for clause in CLAUSE_END.split(sentence):
+            if len(clause) <= max_chars:
+                pieces.append(clause)
+            else:
+                pieces.extend(textwrap.wrap(clause, max_chars, break_on_hyphens=False))
+
+    segments: list[str] = []
+    for piece in pieces:
+        if not piece:
+            continue
+        if len(segments) > 1 and len(segments[-1]) + 1 + len(piece) <= max_chars:
+            segments[-1] += " " + piece
+        else:
+            segments.append(piece)
+    return segments
+
 class GoogleTextToSpeechModel:
-    """A text-to-speech (TTS) model using Google TTS."""
+    """
+    A text-to-speech (TTS) model using Google TTS, falling back to a local
+    engine when Google is slow or failing.
+    """
     
-    def __init__(self, lang: str = "vi", remove_audio: bool = True, speed: float = 1.0) -> None:
+    def __init__(self, lang: str = "vi", remove_audio: bool = True, speed: float = 1.0,
+                 workers: int = 4, max_pending: int = 8, cache: Optional[SpeechCache] = None,
+                 segment_chars: int = 100, sink: Optional[AudioSink] = None,
+                 backends: Optional[Sequence[TTSBackend]] = None, latency_budget: float = 3.0) -> None:
         """
         Initialize the TTS model with language, audio removal option, and playback speed.
         
         Args:
             lang (str): Language for the speech (default: "vi").
-            remove_audio (bool): Whether to remove the audio file after playing (default: True).
+            remove_audio (bool): Keep audio in memory only; when False every Google TTS utterance is archived to data/voices/ (default: True).
             speed (float): Playback speed, constrained between 0.5x and 2.0x (default: 1.0).
+            workers (int): Utterances or segments synthesized concurrently ahead of playback (default: 4).
+            max_pending (int): Queued utterances before `speech` blocks (default: 8).
+            cache (Optional[SpeechCache]): Synthesis cache, possibly shared between engines (default: a new SpeechCache).
+            segment_chars (int): Longest text synthesized in one request; longer text is split (default: 100).
+            sink (Optional[AudioSink]): Playback backend, e.g. NullSink or WavSink when headless (default: a new PygameSink on channel 0).
+            backends (Optional[Sequence[TTSBackend]]): Synthesizers in order of preference
+                (default: Google TTS, then espeak-ng if it is installed).
+            latency_budget (float): Seconds to wait for a backend before falling back to the next (default: 3.0).
         """
         self.config = {
             "REMOVE": remove_audio,
             "SPEED": max(0.5, min(2.0, float(speed))),  # Limit speed between 0.5x and 2.0x
-            "LANG": lang if lang in tts_langs() else "vi",  # Default to Vietnamese if invalid
+            "LANG": lang if lang in supported_languages() else "vi",  # Default to Vietnamese if invalid
         }
-        os.makedirs("data/voices/", exist_ok=True)
-        self.PATH = "data/voices/audio.mp3"
+        if backends is None:
+            backends = default_backends(cache)
+        self.cache = next((b.cache for b in backends if isinstance(b, GTTSBackend)), cache)
+        self.router = TTSRouter(backends, budget=latency_budget)
+        self.segment_chars = segment_chars
+        self.sink = sink if sink is not None else PygameSink()
+        self.pipeline = SpeechPipeline(self, workers=workers, max_pending=max_pending)
 
     def config_voice(self, new_config: dict) -> dict:
         """
         Update voice configuration and return the status of each change.
+        The new settings replace the old ones in a single assignment, so an
+        utterance being synthesized never sees a half-applied config.
         
         Args:
             new_config (dict): Dictionary containing new configuration values.
@@ -80,97 +140,137 @@ class GoogleTextToSpeechModel:
         Returns:
             dict: Status of each configuration key (STATUS.NOTHING, STATUS.CHANGE, STATUS.INVALID).
         """
-        status = {k: STATUS.NOTHING for k in self.config}
+        config = dict(self.config)
+        status = {k: STATUS.NOTHING for k in config}
         for key, value in new_config.items():
-            if key in self.config and self.config[key] != value:
-                self.config[key] = value
+            if key in config and config[key] != value:
+                config[key] = value
                 status[key] = STATUS.CHANGE
-            elif key not in self.config:
+            elif key not in config:
                 status[key] = STATUS.INVALID
+        self.config = config
         return status
 
-    def __text_to_speech(self, text: str) -> list[dict]:
+    def synthesize(self, text: str):
         """
-        Convert text to speech and play the generated audio.
-        
+        Convert text to speech in memory, applying the speed setting and trimming
+        edge silence so consecutive clips join without audible gaps.
+
+        The router picks the backend: Google TTS (called only on a cache miss)
+        unless it misses the latency budget or keeps failing, in which case a
+        local engine speaks instead. Apart from the cache's disk tier, nothing
+        touches the disk unless REMOVE is disabled, in which case the original
+        gTTS output is archived under data/voices/.
+
         Args:
             text (str): The input text to be converted into speech.
-        
+
         Returns:
-            list[dict]: A list of status messages describing each step of the process.
+            Audio in the sink's format (a pygame Sound for PygameSink).
         """
-        messages = []
+        config = self.config
+        with METRICS.stage("normalize"):
+            text = normalizer_for(config["LANG"])(text) or text
 
-        if not has_text(text):
-            text = replace_special_chars(text)
-            messages.append({'status': STATUS.NORMAL, 'message': 'Replaced special characters with Vietnamese words.'})
+        # Decode once; the speed change works on the PCM array and is never re-encoded
+        with METRICS.stage("synthesis"):
+            samples, rate = self.router.synthesize(text, config)
+        with METRICS.stage("speed_change"):
+            samples = trim_silence(samples, rate)
+            if config["SPEED"] != 1.0:
+                samples = time_stretch(samples, rate, config["SPEED"])
+        return self.sink.prepare(samples, rate)
 
-        try:
-            tts = gTTS(text=text, lang=self.config["LANG"], timeout=(60, 120))
-            messages.append({'status': STATUS.NORMAL, 'message': 'Text converted to speech successfully.'})
-        except Exception as e:
-            tts = gTTS(text='Error', lang=self.config["LANG"], timeout=(60, 120), tokenizer_func=None)
-            messages.append({'status': STATUS.ERROR, 'message': f'Error in text-to-speech conversion: {e}'})
-        
-        try:
-            if self.config["REMOVE"]:
-                path = self.PATH
-            else:
-                path = f"data/voices/sound_{int(time.time())}.mp3"
-
-            tts.save(path)
-            messages.append({'status': STATUS.NORMAL, 'message': f'Audio file saved at: {path}'})
-        except Exception as e:
-            messages.append({'status': STATUS.ERROR, 'message': f'Error saving audio file: {e}'})
-            return messages
-
-        # Adjust speed if necessary
-        if self.config["SPEED"] != 1.0:
-            try:
-                audio = AudioSegment.from_file(path)
-                audio = audio.speedup(playback_speed=self.config["SPEED"])
-                new_path = "data/voices/new_audio.mp3"
-                audio.export(new_path, format="mp3")
-                messages.append({'status': STATUS.NORMAL, 'message': f'Audio speed adjusted to {self.config["SPEED"]}x, saved at: {new_path}'})
-
-                if self.config["REMOVE"] and os.path.exists(path):
-                    os.remove(path)
-                    messages.append({'status': STATUS.NORMAL, 'message': f'Removed temporary file: {path}'})
-
-                path = new_path
-            except Exception as e:
-                messages.append({'status': STATUS.ERROR, 'message': f'Error adjusting audio speed: {e}'})
-
-        # Play the generated audio
-        try:
-            pygame.mixer.music.load(path)
-            messages.append({'status': STATUS.NORMAL, 'message': f'Loaded audio file: {path}'})
-            pygame.mixer.music.play()
-            while pygame.mixer.music.get_busy():
-                pygame.time.Clock().tick(10)
-            messages.append({'status': STATUS.NORMAL, 'message': 'Audio playback completed.'})
-        except Exception as e:
-            messages.append({'status': STATUS.ERROR, 'message': f'Error playing audio file: {e}'})
-        finally:
-            pygame.mixer.music.unload()
-            messages.append({'status': STATUS.NORMAL, 'message': 'Released audio file from memory.'})
-
-            if os.path.exists(path):
-                os.remove(path)
-                messages.append({'status': STATUS.NORMAL, 'message': f'Deleted audio file: {path}'})
-            else:
-                messages.append({'status': STATUS.ERROR, 'message': f'File not found: {path}'})
+    def prewarm(self, texts: Iterable[str]) -> None:
+        """
+        Synthesize texts into the cache in the background so they play without a
+        network round trip later, e.g. participant names when they first appear.
 
-        return messages
-    
-    def speech(self, text: str) -> list[dict]:
+        Args:
+            texts (Iterable[str]): Texts to cache.
         """
-        Convert text to speech and play the generated audio.
-        
+        config = self.config
+        normalize = normalizer_for(config["LANG"])
+        self.router.prewarm((normalize(text) or text for text in texts), config)
+
+    def normalize(self, text: str) -> str:
+        """
+        Rewrite chat text for speech in the current language: links, emoji and
+        repeated characters collapsed, symbol-only messages spelled out.
+
+        Returns:
+            str: The text to speak, empty if nothing is worth reading.
+        """
+        return normalizer_for(self.config["LANG"])(text)
+
+    def play(self, audio, on_done: Optional[ClipCallback] = None) -> None:
+        """
+        Queue a clip on the sink. Returns as soon as the clip is playing or queued
+        behind the current one, so back-to-back clips play without a gap.
+
+        Args:
+            audio: Clip produced by `synthesize`.
+            on_done (Optional[ClipCallback]): Called with True when the clip has played, False if it was dropped.
+        """
+        self.sink.play(audio, on_done)
+
+    def drain(self, timeout: Optional[float] = None) -> bool:
+        """Block until everything queued on the sink has finished playing."""
+        return self.sink.drain(timeout)
+
+    def speech(self, text: str, wait: bool = False) -> Utterance:
+        """
+        Queue text to be spoken. Synthesis runs ahead on the pipeline's worker
+        pool while earlier utterances are still playing. Text longer than
+        `segment_chars` is split at sentence and clause boundaries and the pieces
+        are synthesized in parallel; playback starts with the first piece.
+
         Args:
             text (str): The input text to be spoken.
-        
+            wait (bool): Block until the utterance has been played (default: False).
+
         Returns:
-            list[dict]: Status messages describing the process.
+            Utterance: Completion status of the queued speech.
+        """
+        segments = split_segments(text, self.segment_chars) if len(text) > self.segment_chars else None
+        utterance = self.pipeline.submit(text, segments=segments)
+        if wait:
+            utterance.wait()
+        return utterance
+
+    def speech_all(self, texts: list[str]) -> list[Utterance]:
+        """
+        Queue several texts to be spoken back to back.
+
+        Args:
+            texts (list[str]): Texts to speak, in order.
+
+        Returns:
+            list[Utterance]: Completion status of each queued text.
+        """
+        return self.pipeline.submit_all(texts)
+
+    def stream(self, prefix: list[str] = ()) -> SpeechStream:
+        """
+        Open a stream for text that arrives piece by piece, such as a reply being
+        generated sentence by sentence. Each piece starts synthesizing as soon as
+        it is fed and the first one plays while later ones are still arriving.
+
+        Args:
+            prefix (list[str]): Texts spoken before the first piece (default: none).
+
+        Returns:
+            SpeechStream: Call `feed(text)` for each piece and `end()` when done.
+        """
+        return SpeechStream(self.pipeline, prefix)
+
+    def close(self, wait: bool = True) -> None:
+        """
+        Stop the speech pipeline and release the audio device.
+
+        Args:
+            wait (bool): Finish speaking everything already queued (default: True).
         """
-        return self.__text_to_speech(text)
+        self.pipeline.close(wait)
+        self.router.close()
+        self.sink.close()
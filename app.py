@@ -2,10 +2,18 @@ import platform
 import logging
 from Models.Model import *
 from Models.GetDriver import *
+from Models.Supervisor import MeetingSupervisor
 
 # Configuration file paths
 CONFIG_PATH: str = "configurations/config.json"
 CREDENTIALS_PATH: str = "configurations/credentials.json"
+INGESTION_MODE: IngestionMode = IngestionMode.OBSERVER  # SCAN, INCREMENTAL or OBSERVER
+METRICS_PORT: Optional[int] = None  # e.g. 9464 to serve http://127.0.0.1:9464/metrics
+PROFILE_ROOT: Optional[str] = "data/profiles"  # Saved browser profiles per account; None for a fresh one each run
+HEADLESS: bool = False
+LOW_RESOURCE: bool = False  # No maximized window, GPU, extensions or tab audio
+TRACE_MEMORY: bool = False  # tracemalloc growth by module at /memory.json (needs METRICS_PORT); slows the bot
+LOG_JSON: bool = False  # One JSON object per line in logs/AI<timestamp>.jsonl instead of text
 
 def get_browser(os_name: str) -> DriverType:
     """Select the appropriate browser based on the operating system."""
@@ -18,23 +26,52 @@ def get_browser(os_name: str) -> DriverType:
     else:
         raise Exception("Unsupported operating system")
 
+def supervise(meeting_links: List[str], email: str):
+    """Monitor several meetings at once, one browser per room."""
+    browser = get_browser(platform.system())
+
+    def start_browser(slot: int):
+        # Browsers running side by side cannot share a profile, so each pool slot has its own
+        profile_dir = f"{profile_dir_for(email, PROFILE_ROOT)}-{slot}" if PROFILE_ROOT else None
+        return get_driver(browser, profile_dir=profile_dir, headless=HEADLESS, low_resource=LOW_RESOURCE)
+
+    if METRICS_PORT is not None:
+        METRICS.enable()
+    memory = MemoryManager(trace=TRACE_MEMORY)
+    supervisor = MeetingSupervisor(meeting_links, start_browser, CONFIG_PATH, CREDENTIALS_PATH, INGESTION_MODE,
+                                   memory=memory)
+    if METRICS_PORT is not None:
+        server = MetricsServer(METRICS, port=METRICS_PORT, memory=memory).start()
+    try:
+        supervisor.start().wait()
+    finally:
+        supervisor.stop()
+        if METRICS_PORT is not None:
+            server.stop()
+
 def main():
     """Main function to initialize WebDriver and automate Google Meet."""
+    setup_logging(json_lines=LOG_JSON)
+    account = verify(CREDENTIALS_PATH)
+    meeting_links = account.get('meeting_links') or [account['meeting_link']]
+    if len(meeting_links) > 1:
+        return supervise(meeting_links, account['email'])
+    warmup = Warmup('vi')  # Speech engine and Gemini load while the browser starts
     os_name = platform.system()
-    driver = get_driver(get_browser(os_name))  # Initialize WebDriver
+    profile_dir = profile_dir_for(account['email'], PROFILE_ROOT) if PROFILE_ROOT else None
+    driver = get_driver(get_browser(os_name), profile_dir=profile_dir,
+                        headless=HEADLESS, low_resource=LOW_RESOURCE)  # Initialize WebDriver
     # driver = get_driver(driver_type=DriverType.CHROME)  # Initialize WebDriver
-    ai = VoiceAI(driver, CONFIG_PATH, CREDENTIALS_PATH)
+    ai = VoiceAI(driver, CONFIG_PATH, CREDENTIALS_PATH, INGESTION_MODE, metrics_port=METRICS_PORT,
+                 meeting_link=meeting_links[0], memory=MemoryManager(trace=TRACE_MEMORY), **warmup.components())
 
     try:
         ai.join_meeting()  # Join the meeting
 
-        seen_messages: set = set()
-        chat_history: List[Tuple[str, str, str, str]] = []
-
         while True:
             try:
                 # Continuously process messages during the meeting
-                seen_messages, chat_history = ai.run(seen_messages, chat_history)
+                ai.run()
             except LimitReach as e:
                 logging.warning(f"Limit reached: {e}")
                 break  # Exit the loop if message limit is reached
@@ -0,0 +1,73 @@
+"""
+Compare the element-by-element chat scan with the single `execute_script`
+extraction on the local Meet fixture.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_chat_extraction --messages 2000
+"""
+import argparse
+import pathlib
+import statistics
+import time
+
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options as ChromeOptions
+
+from Models.ChatScraper import ChatScraper
+
+FIXTURE = pathlib.Path(__file__).parent / "fixtures" / "meet_chat.html"
+
+
+def timed(fn, repeat: int) -> list[float]:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def report(label: str, samples: list[float]) -> None:
+    print(f"{label:<32} median {statistics.median(samples) * 1000:9.2f} ms"
+          f"   min {min(samples) * 1000:9.2f} ms   ({len(samples)} runs)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--messages", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    options = ChromeOptions()
+    options.add_argument("--headless=new")
+    driver = webdriver.Chrome(options=options)
+    try:
+        driver.get(f"{FIXTURE.resolve().as_uri()}?n={args.messages}")
+        scraper = ChatScraper(driver)
+
+        full_scan = timed(scraper.fetch_all, args.repeat)
+        report("scan (find_elements)", full_scan)
+
+        def first_fetch():
+            scraper.reset()
+            return scraper.fetch_new()
+        report("incremental, cold cursor", timed(first_fetch, args.repeat))
+
+        scraper.fetch_new()
+        idle = timed(scraper.fetch_new, args.repeat * 10)
+        report("incremental, no new messages", idle)
+
+        def one_new():
+            driver.execute_script("window.addChatMessage('Bob', 'ping')")
+            assert len(scraper.fetch_new()) == 1
+        report("incremental, one new message", timed(one_new, args.repeat * 10))
+
+        print(f"\nsteady-state speedup: {statistics.median(full_scan) / statistics.median(idle):.0f}x"
+              f" on {args.messages} messages")
+    finally:
+        driver.quit()
+
+
+if __name__ == "__main__":
+    main()
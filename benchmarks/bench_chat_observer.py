@@ -0,0 +1,76 @@
+"""
+Measure the MutationObserver ingestion path on the local Meet fixture:
+the delay from a message being added to the page until Python receives it,
+and the CPU the Python side burns while the chat is quiet, compared with the
+0.1 s incremental poll.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_chat_observer --messages 2000
+"""
+import argparse
+import pathlib
+import statistics
+import time
+
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options as ChromeOptions
+
+from Models.ChatScraper import ChatScraper
+
+FIXTURE = pathlib.Path(__file__).parent / "fixtures" / "meet_chat.html"
+
+SCHEDULE_MESSAGE_JS = """
+const delay = arguments[0];
+setTimeout(() => {
+    window.__sentAt = Date.now();
+    window.addChatMessage('Chi', 'latency probe');
+}, delay);
+"""
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--messages", type=int, default=2000)
+    parser.add_argument("--samples", type=int, default=50)
+    parser.add_argument("--idle", type=float, default=10.0, help="Seconds of quiet chat to measure")
+    args = parser.parse_args()
+
+    options = ChromeOptions()
+    options.add_argument("--headless=new")
+    driver = webdriver.Chrome(options=options)
+    try:
+        driver.get(f"{FIXTURE.resolve().as_uri()}?n={args.messages}")
+        scraper = ChatScraper(driver)
+        scraper.install_observer(timeout=5.0)
+
+        latencies = []
+        for _ in range(args.samples):
+            driver.execute_script(SCHEDULE_MESSAGE_JS, 20)
+            records = scraper.wait_for_messages(timeout=5.0)
+            received = time.time() * 1000
+            assert records, "observer delivered nothing"
+            latencies.append(received - driver.execute_script("return window.__sentAt"))
+        latencies.sort()
+        print(f"observer delivery latency   p50 {statistics.median(latencies):6.1f} ms"
+              f"   p95 {latencies[int(len(latencies) * 0.95) - 1]:6.1f} ms")
+
+        cpu, start = time.process_time(), time.monotonic()
+        while time.monotonic() - start < args.idle:
+            scraper.wait_for_messages(timeout=1.0)
+        observer_cpu = time.process_time() - cpu
+
+        cpu, start = time.process_time(), time.monotonic()
+        while time.monotonic() - start < args.idle:
+            scraper.fetch_new()
+            time.sleep(0.1)
+        poll_cpu = time.process_time() - cpu
+
+        print(f"idle CPU over {args.idle:.0f} s        observer {observer_cpu * 1000:6.1f} ms"
+              f"   0.1 s poll {poll_cpu * 1000:6.1f} ms")
+    finally:
+        driver.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+"""
+End-to-end benchmark of the chat reader, fully offline: `VoiceAI.run` is
+driven against `FakeWebDriver` (a synthetic Meet chat panel), with simulated
+Google TTS and Gemini backends and a null audio sink.
+
+For chat panels that already hold 100, 1,000 and 10,000 messages it streams
+in `--live` new messages (every `--reply-every`-th one a /respone command),
+then leaves the chat idle for `--idle` seconds, and reports:
+
+    - message-to-speech-start latency percentiles (arrival in the DOM to the
+      first audio of the message reaching the sink)
+    - polls per second while busy and while idle
+    - CPU seconds per idle minute
+    - peak RSS (each panel size runs in its own process)
+
+Run from the repository root:
+
+    python -m benchmarks.bench_end_to_end --mode observer
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+from Models.AudioSink import NullSink
+from Models.ChatScraper import IngestionMode
+from Models.Gemini import GeminiTranscript
+from Models.MessageStore import ChatRecord
+from Models.Model import VoiceAI
+from Models.TTSBackends import SpeechCache
+from Models.VoiceModel import GoogleTextToSpeechModel
+from benchmarks.fakes import FakeGenerativeModel, FakeTTSBackend, FakeWebDriver
+
+NAMES = ["Alice", "Bob", "Chi", "Dung", "Emma"]
+
+
+class RecordingEngine(GoogleTextToSpeechModel):
+    """Remembers the utterance queued for each text so its start time can be read back."""
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.utterances = {}
+
+    def speech(self, text: str, wait: bool = False):
+        utterance = super().speech(text, wait)
+        self.utterances.setdefault(text, utterance)
+        return utterance
+
+    def speech_all(self, texts: list[str]):
+        utterances = super().speech_all(texts)
+        for text, utterance in zip(texts, utterances):
+            # Messages merged by the scheduler are joined with ". "
+            for part in [text] + text.split(". "):
+                self.utterances.setdefault(part, utterance)
+        return utterances
+
+
+def percentile(values: list[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))] if ordered else float("nan")
+
+
+def peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def scenario(args) -> dict:
+    with tempfile.TemporaryDirectory() as directory:
+        credentials = os.path.join(directory, "credentials.json")
+        with open(credentials, "w") as f:
+            json.dump({"email": "bench@example.com", "password": "-",
+                       "meeting_link": "https://meet.google.com/bench"}, f)
+
+        driver = FakeWebDriver(latency=args.round_trip)
+        for i in range(args.size):
+            driver.add_message(NAMES[i // 3 % len(NAMES)], f"Earlier message {i}")
+
+        engine = RecordingEngine(sink=NullSink(), cache=SpeechCache(directory=None),
+                                 backends=[FakeTTSBackend("gtts", median=args.tts_latency, sigma=0.3, seed=1)])
+        gemini = GeminiTranscript(model=FakeGenerativeModel(latency=args.gemini_latency), key="fake")
+        ai = VoiceAI(driver, os.path.join(directory, "config.json"), credentials,
+                     IngestionMode(args.mode), observer_timeout=1.0, gemini_model=gemini,
+                     history_path=os.path.join(directory, "history.sqlite3"), engine=engine)
+
+        # Everything already on the panel counts as read, as it would after joining
+        ai.history.extend([ChatRecord(*record) for record in driver.records])
+        ai.scraper.last_message_id = driver.records[-1][2] if driver.records else None
+
+        live = {}
+
+        def feed():
+            for j in range(args.live):
+                time.sleep(1 / args.rate)
+                if j % args.reply_every == args.reply_every - 1:
+                    text, spoken = f"/respone question {j}", f"question {j}"
+                else:
+                    text = spoken = f"Live message {j}"
+                live[driver.add_message(NAMES[j // 2 % len(NAMES)], text)] = spoken
+
+        feeder = threading.Thread(target=feed, daemon=True)
+        start = time.monotonic()
+        feeder.start()
+        polls = 0
+        deadline = start + args.live / args.rate + 60
+        while time.monotonic() < deadline:
+            ai.run()
+            polls += 1
+            if not feeder.is_alive() and all(spoken in engine.utterances for spoken in live.values()):
+                break
+        busy = time.monotonic() - start
+        for spoken in live.values():
+            engine.utterances[spoken].wait(30)
+
+        latencies = [engine.utterances[spoken].started_at - driver.arrivals[message_id]
+                     for message_id, spoken in live.items()
+                     if spoken in engine.utterances and engine.utterances[spoken].started_at is not None]
+
+        # Idle: nothing new arrives, only the polling loop runs
+        idle_polls = 0
+        cpu, start = time.process_time(), time.monotonic()
+        while time.monotonic() - start < args.idle:
+            ai.run()
+            idle_polls += 1
+        idle = time.monotonic() - start
+        idle_cpu = time.process_time() - cpu
+
+        ai.release()
+        return {"size": args.size, "mode": args.mode, "spoken": len(latencies), "live": args.live,
+                "p50": percentile(latencies, 0.5), "p95": percentile(latencies, 0.95),
+                "p99": percentile(latencies, 0.99), "max": max(latencies, default=float("nan")),
+                "busy_polls_per_s": polls / busy, "idle_polls_per_s": idle_polls / idle,
+                "cpu_per_idle_minute": idle_cpu / idle * 60, "peak_rss_mb": peak_rss_mb()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mode", choices=[mode.value for mode in IngestionMode], default="observer")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--live", type=int, default=100, help="new messages streamed in per run")
+    parser.add_argument("--rate", type=float, default=5.0, help="new messages per second")
+    parser.add_argument("--reply-every", type=int, default=10)
+    parser.add_argument("--idle", type=float, default=10.0, help="seconds of idle chat measured")
+    parser.add_argument("--round-trip", type=float, default=0.001, help="seconds per WebDriver command")
+    parser.add_argument("--tts-latency", type=float, default=0.3, help="median simulated gTTS latency")
+    parser.add_argument("--gemini-latency", type=float, default=1.5)
+    parser.add_argument("--size", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.size is not None:
+        print(json.dumps(scenario(args)))
+        return
+
+    print(f"mode {args.mode}, {args.live} live messages at {args.rate:g}/s, {args.idle:g} s idle\n")
+    print(f"{'panel':>7} {'spoken':>8} {'p50 s':>7} {'p95 s':>7} {'p99 s':>7} {'max s':>7}"
+          f" {'polls/s busy':>13} {'polls/s idle':>13} {'cpu s/idle min':>15} {'peak RSS MiB':>13}")
+    forwarded = sys.argv[1:]
+    for size in args.sizes:
+        # A fresh process per size keeps peak RSS and caches independent
+        output = subprocess.run([sys.executable, "-m", "benchmarks.bench_end_to_end", *forwarded, "--size", str(size)],
+                                capture_output=True, text=True, check=True).stdout
+        r = json.loads(output.strip().splitlines()[-1])
+        print(f"{r['size']:>7} {r['spoken']:>4}/{r['live']:<3} {r['p50']:7.3f} {r['p95']:7.3f} {r['p99']:7.3f}"
+              f" {r['max']:7.3f} {r['busy_polls_per_s']:13.1f} {r['idle_polls_per_s']:13.1f}"
+              f" {r['cpu_per_idle_minute']:15.2f} {r['peak_rss_mb']:13.0f}")
+
+
+if __name__ == "__main__":
+    main()
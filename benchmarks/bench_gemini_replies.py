@@ -0,0 +1,66 @@
+"""
+Show how Gemini replies affect chat-reading delay, using the fake Gemini
+backend: inline `respone` calls versus the background `submit` path.
+
+A message arrives every `--interval` seconds and every `--every`-th one is a
+/respone command. The reported delay is how long each message waited before
+the read loop got to it.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_gemini_replies --latency 2.0
+"""
+import argparse
+import statistics
+import time
+
+from Models.Gemini import GeminiTranscript
+from benchmarks.fakes import FakeGenerativeModel
+
+
+def simulate(gemini: GeminiTranscript, inline: bool, messages: int, interval: float, every: int) -> list[float]:
+    delays = []
+    requests = []
+    start = time.monotonic()
+    for i in range(messages):
+        arrival = start + i * interval
+        now = time.monotonic()
+        if now < arrival:
+            time.sleep(arrival - now)
+        delays.append(time.monotonic() - arrival)
+        if i % every == 0:
+            if inline:
+                gemini.respone(f"question {i}")
+            else:
+                requests.append(gemini.submit(f"question {i}"))
+    for request in requests:
+        request.result()
+    return delays
+
+
+def report(label: str, delays: list[float]) -> None:
+    delays = sorted(delays)
+    print(f"{label:<22} p50 {statistics.median(delays) * 1000:8.1f} ms"
+          f"   p95 {delays[int(len(delays) * 0.95) - 1] * 1000:8.1f} ms"
+          f"   max {delays[-1] * 1000:8.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--latency", type=float, default=2.0, help="Fake Gemini time to first chunk")
+    parser.add_argument("--messages", type=int, default=40)
+    parser.add_argument("--interval", type=float, default=0.25)
+    parser.add_argument("--every", type=int, default=10)
+    parser.add_argument("--concurrency", type=int, default=2)
+    args = parser.parse_args()
+
+    for inline in (True, False):
+        gemini = GeminiTranscript(model=FakeGenerativeModel(latency=args.latency), key="fake",
+                                  max_concurrency=args.concurrency)
+        delays = simulate(gemini, inline, args.messages, args.interval, args.every)
+        report("inline respone" if inline else "background submit", delays)
+        gemini.close()
+
+
+if __name__ == "__main__":
+    main()
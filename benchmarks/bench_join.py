@@ -0,0 +1,81 @@
+"""
+Time from opening the meeting link to the chat panel being open, with the
+previous join steps (two navigations, fixed sleeps, 10 s waits on single
+selectors) and with `MeetingJoiner`, on the local Meet lobby fixture.
+
+Requires Chrome. Run from the repository root:
+
+    python -m benchmarks.bench_join --runs 3
+"""
+import argparse
+import pathlib
+import statistics
+import time
+
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options as ChromeOptions
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+
+from Models.MeetingJoin import CHAT_PANEL, MeetingJoiner, visible
+
+FIXTURE = pathlib.Path(__file__).parent / "fixtures" / "meet_join.html"
+
+
+def previous_join(driver, url: str) -> None:
+    """The join steps as they were, selector for selector."""
+    driver.get(url)
+    time.sleep(0.5)
+    driver.get(url)
+    wait = WebDriverWait(driver, 10)
+    time.sleep(2)
+    for locator in ((By.XPATH, "//div[@role='button' and @aria-label='Tắt micrô']"),):
+        try:
+            wait.until(EC.element_to_be_clickable(locator)).click()
+        except Exception:
+            pass
+    time.sleep(1)
+    for locator in ((By.XPATH, "//div[@role='button' and @aria-label='Tắt máy ảnh']"),
+                    (By.CLASS_NAME, "XCoPyb"),
+                    (By.XPATH, '//*[@id="yDmH0d"]/c-wiz/div/div/div[36]/div[4]/div[10]/div/div/div[3]/nav/div[3]/div')):
+        try:
+            wait.until(EC.element_to_be_clickable(locator)).click()
+        except Exception:
+            pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--lobby", type=int, default=800, help="ms before the join button appears")
+    parser.add_argument("--admit", type=int, default=500, help="ms from join click to being in the call")
+    args = parser.parse_args()
+
+    options = ChromeOptions()
+    options.add_argument("--headless=new")
+    driver = webdriver.Chrome(options=options)
+    try:
+        for label, media, join in (("previous, media allowed", "on", "previous"),
+                                   ("MeetingJoiner, media allowed", "on", "joiner"),
+                                   ("MeetingJoiner, media blocked", "off", "joiner")):
+            url = f"{FIXTURE.resolve().as_uri()}?lobby={args.lobby}&admit={args.admit}&media={media}"
+            samples = []
+            for _ in range(args.runs):
+                start = time.perf_counter()
+                if join == "previous":
+                    previous_join(driver, url)
+                    # The old chat button XPath never matches here; the panel stays closed
+                    opened = bool(driver.find_elements(*CHAT_PANEL[0]) and
+                                  driver.find_element(*CHAT_PANEL[0]).is_displayed())
+                else:
+                    MeetingJoiner(driver).join(url)
+                    opened = bool(WebDriverWait(driver, 1).until(visible(CHAT_PANEL)))
+                samples.append(time.perf_counter() - start)
+            print(f"{label:<30} median {statistics.median(samples):6.2f} s   chat open: {opened}")
+    finally:
+        driver.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Logging cost per read-loop iteration with the previous blocking
+`FileHandler` and with the background writer from `setup_logging` (text and
+JSONL).
+
+Each iteration logs what one `VoiceAI.run` poll does: the chat fetch line
+and the garbage collection count on every poll, and for every
+`--message-every`-th poll a new chat message, a scheduler decision and the
+"Spoke in" line. To stand in for a busy disk, every `--stall-every`-th
+write to the file stalls for `--stall-ms`. Reported per setup:
+
+    - time spent in logging calls per iteration: p50, p99 and max
+    - bytes written to disk
+
+Run from the repository root:
+
+    python -m benchmarks.bench_logging
+"""
+import argparse
+import logging
+import os
+import tempfile
+import time
+
+from Models.LogWriter import REPEATED, setup_logging
+
+
+def percentile(values: list[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def stall_writes(handler: logging.Handler, every: int, seconds: float) -> None:
+    """Make every `every`-th flush of `handler` sleep for `seconds`."""
+    flush, count = handler.flush, [0]
+
+    def slow_flush():
+        count[0] += 1
+        if count[0] % every == 0:
+            time.sleep(seconds)
+        flush()
+    handler.flush = slow_flush
+
+
+def iteration(i: int, message_every: int) -> None:
+    logging.info("Fetching chat messages from Google Meet", extra=REPEATED)
+    if i % message_every == 0:
+        logging.info(f"New chat message: [09:{i % 60:02d}] Alice: Can you go back to the previous slide {i}")
+        logging.info(f"Scheduler merge [Alice] into m{i - 1} after 2.1s: Can you go back", extra=REPEATED)
+        logging.info(f"Spoke in 1.{i % 100:02d}s: Can you go back to the previous slide {i}")
+    logging.info(f"{i % 7 + 1} have been release", extra=REPEATED)
+
+
+def run(setup: str, args, directory: str) -> dict:
+    if setup == "blocking":
+        path = os.path.join(directory, "blocking.log")
+        handler = logging.FileHandler(path, encoding="utf-8")
+        logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s",
+                            handlers=[handler], force=True)
+        writer = None
+    else:
+        writer = setup_logging(os.path.join(directory, setup), json_lines=setup == "jsonl")
+        handler, path = writer.handler, writer.handler.baseFilename
+    stall_writes(handler, args.stall_every, args.stall_ms / 1000)
+
+    costs = []
+    for i in range(args.iterations):
+        start = time.perf_counter()
+        iteration(i, args.message_every)
+        costs.append(time.perf_counter() - start)
+
+    if writer is not None:
+        writer.stop()
+    else:
+        handler.close()
+    logging.getLogger().handlers.clear()
+    return {"p50": percentile(costs, 0.5), "p99": percentile(costs, 0.99), "max": max(costs),
+            "bytes": os.path.getsize(path)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=20000)
+    parser.add_argument("--message-every", type=int, default=10)
+    parser.add_argument("--stall-every", type=int, default=500, help="writes between simulated disk stalls")
+    parser.add_argument("--stall-ms", type=float, default=20.0)
+    args = parser.parse_args()
+
+    print(f"{args.iterations} iterations, a message every {args.message_every}, "
+          f"{args.stall_ms:g} ms disk stall every {args.stall_every} writes\n")
+    print(f"{'setup':<10} {'p50 us':>8} {'p99 us':>8} {'max ms':>8} {'written KiB':>12}")
+    with tempfile.TemporaryDirectory() as directory:
+        for setup in ("blocking", "queued", "jsonl"):
+            r = run(setup, args, directory)
+            print(f"{setup:<10} {r['p50'] * 1e6:8.1f} {r['p99'] * 1e6:8.1f} {r['max'] * 1e3:8.2f}"
+                  f" {r['bytes'] / 1024:12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Soak test for the message store: feed 100k synthetic chat messages through
+`MessageStore` the way `VoiceAI.run` does and check that memory stays flat,
+compared with the old unbounded set + list.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_message_store --messages 100000
+"""
+import argparse
+import os
+import resource
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from Models.MessageStore import MessageStore
+
+
+def batches(total: int, batch: int):
+    for start in range(0, total, batch):
+        yield [(f"{9 + i // 3600:02d}:{i // 60 % 60:02d}", f"User {i % 40}", f"spaces/soak/messages/{i}",
+                f"Message number {i} with some ordinary chat text in it")
+               for i in range(start, min(total, start + batch))]
+
+
+def peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def soak(label: str, total: int, batch: int, step) -> bool:
+    tracemalloc.start()
+    checkpoints = []
+    start = time.perf_counter()
+    for n, records in enumerate(batches(total, batch), 1):
+        step(records)
+        if n * batch % (total // 10) == 0:
+            checkpoints.append(tracemalloc.get_traced_memory()[0] / 1024 / 1024)
+    elapsed = time.perf_counter() - start
+    tracemalloc.stop()
+
+    # Flat means the last 40% of the run allocated no more than 10% extra
+    flat = checkpoints[-1] <= checkpoints[len(checkpoints) * 6 // 10] * 1.1 + 0.5
+    print(f"{label:<22} {elapsed:6.1f} s   traced MiB at each 10%: "
+          + " ".join(f"{c:.1f}" for c in checkpoints) + f"   {'flat' if flat else 'GROWING'}")
+    return flat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--messages", type=int, default=100_000)
+    parser.add_argument("--batch", type=int, default=10)
+    parser.add_argument("--window", type=int, default=1000)
+    args = parser.parse_args()
+
+    seen_messages: set = set()
+    chat_history: list = []
+
+    def unbounded(records):
+        new = [r for r in records if r[2] not in seen_messages]
+        seen_messages.update(r[2] for r in new)
+        chat_history.extend(new)
+
+    soak("set + list (old)", args.messages, args.batch, unbounded)
+    seen_messages.clear()
+    chat_history.clear()
+
+    with tempfile.TemporaryDirectory() as directory:
+        store = MessageStore(os.path.join(directory, "history.sqlite3"), meeting="soak", window=args.window)
+
+        def bounded(records):
+            store.extend(store.unseen(records))
+
+        flat = soak("MessageStore", args.messages, args.batch, bounded)
+        assert len(store) == args.messages
+        assert len(store.query(name="User 7", limit=5)) == 5
+        store.close()
+
+    print(f"peak RSS {peak_rss_mb():.0f} MiB")
+    sys.exit(0 if flat else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""
+Cost of the instrumentation calls with the registry disabled and enabled,
+against the same loop with no instrumentation at all.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_metrics_overhead --iterations 1000000
+"""
+import argparse
+import time
+
+from Models.Metrics import MetricsRegistry
+
+
+def per_call_ns(fn, iterations: int) -> float:
+    start = time.perf_counter()
+    fn(iterations)
+    return (time.perf_counter() - start) / iterations * 1e9
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    def bare(n):
+        for _ in range(n):
+            pass
+
+    baseline = per_call_ns(bare, args.iterations)
+    print(f"{'empty loop':<34} {baseline:8.1f} ns")
+    for enabled in (False, True):
+        registry = MetricsRegistry(enabled=enabled)
+        state = "enabled" if enabled else "disabled"
+
+        def stage(n):
+            for _ in range(n):
+                with registry.stage("synthesis"):
+                    pass
+
+        def counter(n):
+            for _ in range(n):
+                registry.counter("messages_total").inc()
+
+        for label, fn in (("stage timer", stage), ("counter.inc", counter)):
+            cost = per_call_ns(fn, args.iterations) - baseline
+            print(f"{label + ', ' + state:<34} {cost:8.1f} ns per call")
+
+
+if __name__ == "__main__":
+    main()
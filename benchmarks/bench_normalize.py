@@ -0,0 +1,69 @@
+"""
+Text normalization before synthesis: the previous path (skip messages
+starting with "https:", then `has_text` and, for symbol-only messages,
+`replace_special_chars`) versus `TextNormalizer`, uncached and memoized.
+
+Messages are drawn at random from `benchmarks/fixtures/chat_corpus.txt`, a
+Meet chat corpus from lectures and team meetings, so reactions such as "ok"
+and "+1" repeat as often as they do in a meeting. Reported per path:
+
+    - microseconds per message
+    - messages that would be synthesized, and characters sent to the TTS
+
+Run from the repository root:
+
+    python -m benchmarks.bench_normalize
+"""
+import argparse
+import os
+import random
+import time
+from typing import Callable, Optional
+
+from Models.TextNormalizer import PACKS, DEFAULT_PACK, TextNormalizer
+from Models.VoiceModel import has_text, replace_special_chars
+
+CORPUS = os.path.join(os.path.dirname(__file__), "fixtures", "chat_corpus.txt")
+
+
+def load_corpus(path: str = CORPUS) -> list[str]:
+    with open(path, encoding="utf-8") as f:
+        return [line.rstrip("\n") for line in f if line.strip() and not line.startswith("# ")]
+
+
+def previous(text: str) -> Optional[str]:
+    if text.startswith("https:"):
+        return None
+    return text if has_text(text) else replace_special_chars(text)
+
+
+def measure(normalize: Callable[[str], Optional[str]], messages: list[str]) -> dict:
+    start = time.perf_counter()
+    spoken = [normalize(text) for text in messages]
+    elapsed = time.perf_counter() - start
+    read = [text for text in spoken if text]
+    return {"us": elapsed / len(messages) * 1e6, "read": len(read), "chars": sum(len(text) for text in read)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--messages", type=int, default=200_000)
+    parser.add_argument("--lang", default="vi")
+    parser.add_argument("--seed", type=int, default=5)
+    args = parser.parse_args()
+
+    corpus = load_corpus()
+    messages = random.Random(args.seed).choices(corpus, k=args.messages)
+    pack = PACKS.get(args.lang, DEFAULT_PACK)
+
+    print(f"{args.messages} messages drawn from {len(corpus)} corpus lines, LANG {args.lang}\n")
+    print(f"{'path':<22} {'us/message':>11} {'synthesized':>12} {'TTS chars':>10}")
+    for label, normalize in (("previous", previous),
+                             ("normalizer, uncached", TextNormalizer(pack, cache_size=0)),
+                             ("normalizer, memoized", TextNormalizer(pack))):
+        r = measure(normalize, messages)
+        print(f"{label:<22} {r['us']:11.2f} {r['read']:12} {r['chars']:10}")
+
+
+if __name__ == "__main__":
+    main()
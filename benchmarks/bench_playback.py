@@ -0,0 +1,89 @@
+"""
+Compare the old playback loop (write a file, `mixer.music.load`, spin on
+`get_busy()` with a new `Clock().tick(10)` per iteration, unload) with
+`PygameSink`, which queues pre-decoded clips on a mixer channel and fires a
+callback at the end of each one.
+
+Reports the wall time for N back-to-back clips against their audio length
+(the difference is gap + tail delay) and the CPU time spent waiting.
+Runs headless with SDL's dummy audio driver unless SDL_AUDIODRIVER is set:
+
+    python -m benchmarks.bench_playback --clips 10 --seconds 0.5
+"""
+import argparse
+import os
+import tempfile
+import threading
+import time
+import wave
+
+import numpy as np
+
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+
+from Models.AudioDSP import to_pcm
+from Models.AudioSink import PygameSink
+
+RATE = 24000
+
+
+def tone(seconds: float, frequency: float) -> np.ndarray:
+    t = np.arange(int(RATE * seconds)) / RATE
+    return (0.3 * np.sin(2 * np.pi * frequency * t)).astype(np.float32)
+
+
+def busy_wait_loop(clips: list[np.ndarray], directory: str) -> None:
+    for i, samples in enumerate(clips):
+        path = os.path.join(directory, f"clip_{i}.wav")
+        with wave.open(path, "wb") as f:
+            f.setnchannels(1)
+            f.setsampwidth(2)
+            f.setframerate(RATE)
+            f.writeframes(to_pcm(samples, -16, 1))
+        pygame.mixer.music.load(path)
+        pygame.mixer.music.play()
+        while pygame.mixer.music.get_busy():
+            pygame.time.Clock().tick(10)
+        pygame.mixer.music.unload()
+
+
+def sink_loop(sink: PygameSink, clips: list[np.ndarray]) -> None:
+    sounds = [sink.prepare(samples, RATE) for samples in clips]
+    done = threading.Event()
+    for i, sound in enumerate(sounds):
+        sink.play(sound, (lambda played: done.set()) if i == len(sounds) - 1 else None)
+    done.wait()
+
+
+def measure(label: str, audio_seconds: float, fn) -> None:
+    wall, cpu = time.perf_counter(), time.process_time()
+    fn()
+    wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+    print(f"{label:<24} wall {wall:6.3f} s   audio {audio_seconds:6.3f} s   "
+          f"overhead {(wall - audio_seconds) * 1000:7.1f} ms   cpu {cpu * 1000:7.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--clips", type=int, default=10)
+    parser.add_argument("--seconds", type=float, default=0.5)
+    args = parser.parse_args()
+
+    pygame.mixer.init()
+    clips = [tone(args.seconds, 220 + 40 * i) for i in range(args.clips)]
+    audio_seconds = args.clips * args.seconds
+
+    with tempfile.TemporaryDirectory() as directory:
+        measure("music.load + busy wait", audio_seconds, lambda: busy_wait_loop(clips, directory))
+
+    sink = PygameSink()
+    try:
+        measure("PygameSink queue", audio_seconds, lambda: sink_loop(sink, clips))
+    finally:
+        sink.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""
+Time-to-speech under a chat burst, with the scheduler reading strictly in
+order (the previous behaviour) and with the default catch-up policy.
+
+The simulated meeting opens with a burst of `--burst` messages in two
+seconds (short reactions, normal lines, long paragraphs, a few /respone
+questions and mentions of the bot), followed by one message every
+`--trickle` seconds. Speech takes real time: the fake TTS backend returns
+about `--seconds-per-char` seconds of audio per character and the null sink
+plays it in real time. Reported per policy:
+
+    - read-to-speech-start p50/p95 for priority messages, for the burst and
+      for the messages arriving after it
+    - how long after the burst the oldest waiting message was last older
+      than the latency target
+    - messages merged, shortened and skipped, and total seconds spoken
+
+Run from the repository root:
+
+    python -m benchmarks.bench_scheduler
+"""
+import argparse
+import random
+import time
+
+from Models.AudioSink import NullSink
+from Models.Config import SchedulerPolicy
+from Models.MessageStore import ChatRecord
+from Models.Scheduler import Action, ChatScheduler
+from Models.TTSBackends import SpeechCache
+from Models.VoiceModel import GoogleTextToSpeechModel
+from benchmarks.fakes import FakeTTSBackend
+
+NAMES = ["Alice", "Bob", "Chi", "Dung", "Emma"]
+SHORT = ["ok", "+1", "haha", "yes", "agreed", "thanks!", "nice"]
+NORMAL = ["Can you go back to the previous slide please",
+          "I think the numbers for March are missing from the chart",
+          "We tried that approach last quarter and it did not scale",
+          "Could you share the link to the document after the call"]
+LONG = ("The main problem we found is that the import job runs every night on the same machine as the "
+        "reporting service, so when the import is slow the reports time out. Moving it to its own worker "
+        "fixed most of it, but we still see spikes on Mondays when the weekly export also runs.")
+
+
+def conversation(burst: int, trickle: float, duration: float, seed: int) -> list[tuple[float, ChatRecord, str]]:
+    """(offset in seconds, record, kind) for every message, with kind in priority/burst/after."""
+    rng = random.Random(seed)
+    messages = []
+    for i in range(burst):
+        name = NAMES[rng.randrange(len(NAMES))] if i % 3 == 0 or not messages else messages[-1][1].name
+        roll = rng.random()
+        if i % 12 == 5:
+            text, kind = "/respone what is the deadline for the report?", "priority"
+        elif i % 17 == 9:
+            text, kind = "Meetbot can you read my question again?", "priority"
+        elif roll < 0.45:
+            text, kind = rng.choice(SHORT), "burst"
+        elif roll < 0.85:
+            text, kind = rng.choice(NORMAL), "burst"
+        else:
+            text, kind = LONG, "burst"
+        messages.append((2.0 * i / burst, ChatRecord("09:00", name, f"m{i}", text), kind))
+    t, i = 2.0, burst
+    while t < duration:
+        t += trickle
+        messages.append((t, ChatRecord("09:01", NAMES[i % len(NAMES)], f"m{i}", rng.choice(NORMAL)), "after"))
+        i += 1
+    return messages
+
+
+def percentile(values: list[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))] if ordered else float("nan")
+
+
+def simulate(policy: SchedulerPolicy, args) -> dict:
+    engine = GoogleTextToSpeechModel(
+        sink=NullSink(realtime=True), cache=SpeechCache(directory=None),
+        backends=[FakeTTSBackend("gtts", median=args.tts_latency, sigma=0.3, seed=1,
+                                 seconds_per_char=args.seconds_per_char)])
+    scheduler = ChatScheduler(engine, policy)
+    started = {}
+
+    def spoken(message_id: str, read_at: float):
+        return lambda utterance: utterance.add_done_callback(
+            lambda done: done.started_at is not None and started.setdefault(message_id, done.started_at - read_at))
+
+    messages = conversation(args.burst, args.trickle, args.duration, args.seed)
+    kinds = {record.message_id: kind for _, record, kind in messages}
+    behind_until = 0.0
+    start = time.monotonic()
+
+    def sample() -> None:
+        nonlocal behind_until
+        if scheduler.backlog_age() > args.target:
+            behind_until = time.monotonic() - start - 2.0
+        time.sleep(0.01)
+
+    for offset, record, kind in messages:
+        while time.monotonic() - start < offset:
+            sample()
+        text = record.text
+        priority = text.startswith("/respone")
+        if priority:
+            record = record._replace(text=text.replace("/respone", ""))
+        scheduler.add(record, priority=priority, on_speak=spoken(record.message_id, time.monotonic()))
+    while scheduler.pending():
+        sample()
+    engine.pipeline.close(wait=True)
+    scheduler.close()
+
+    counts = {action: 0 for action in Action}
+    for decision in scheduler.decisions:
+        counts[decision.action] += 1
+    by_kind = {kind: [started[m] for m, k in kinds.items() if k == kind and m in started]
+               for kind in ("priority", "burst", "after")}
+    result = {"behind_until": behind_until, "spoken_seconds": engine.sink.seconds,
+              "merged": counts[Action.MERGE], "shortened": counts[Action.SHORTEN],
+              "skipped": counts[Action.SKIP]}
+    for kind, values in by_kind.items():
+        result[f"{kind}_p50"] = percentile(values, 0.5)
+        result[f"{kind}_p95"] = percentile(values, 0.95)
+    engine.close(wait=False)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--burst", type=int, default=50)
+    parser.add_argument("--trickle", type=float, default=3.0, help="seconds between messages after the burst")
+    parser.add_argument("--duration", type=float, default=90.0, help="seconds of conversation")
+    parser.add_argument("--target", type=float, default=10.0, help="latency target in seconds")
+    parser.add_argument("--seconds-per-char", type=float, default=0.02,
+                        help="audio per character; natural speech is ~0.07, 0.02 keeps the run short")
+    parser.add_argument("--tts-latency", type=float, default=0.3)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    in_order = SchedulerPolicy(target_latency=float("inf"), drop_after=float("inf"), merge=False, prioritize=False)
+    catch_up = SchedulerPolicy(target_latency=args.target, mentions=("meetbot",))
+    print(f"burst of {args.burst} messages, then one every {args.trickle:g} s for {args.duration:g} s\n")
+    print(f"{'policy':<10} {'priority p50/p95 s':>19} {'burst p50/p95 s':>16} {'after p50/p95 s':>16}"
+          f" {'behind s':>12} {'merged':>7} {'shortened':>10} {'skipped':>8} {'spoken s':>9}")
+    for label, policy in (("in order", in_order), ("catch-up", catch_up)):
+        r = simulate(policy, args)
+        print(f"{label:<10} {r['priority_p50']:9.1f}/{r['priority_p95']:<9.1f} {r['burst_p50']:7.1f}/{r['burst_p95']:<8.1f}"
+              f" {r['after_p50']:7.1f}/{r['after_p95']:<8.1f} {r['behind_until']:12.1f} {r['merged']:>7} {r['shortened']:>10}"
+              f" {r['skipped']:>8} {r['spoken_seconds']:9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Compare time until audio can start and total synthesis time for one gTTS call
+per message against parallel segmented synthesis, for 50, 500 and 2,000
+character inputs.
+
+By default gTTS is replaced by a latency model (gTTS sends one request per
+~100 characters, one after another); pass --live to call Google TTS.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_segmented_tts
+    python -m benchmarks.bench_segmented_tts --live --lang en
+"""
+import argparse
+import io
+import math
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from Models.VoiceModel import split_segments
+
+SAMPLE = ("Thanks everyone for joining today, we will go over the results from last week. "
+          "The first experiment worked well; the second one needs another run, mostly because of "
+          "noisy data. Please post your questions in the chat and I will answer them at the end. ")
+
+
+def fake_tts(request_latency: float, per_char: float):
+    def synthesize(text: str) -> None:
+        for _ in range(math.ceil(len(text) / 100)):
+            time.sleep(request_latency + per_char * min(len(text), 100))
+    return synthesize
+
+
+def live_tts(lang: str):
+    from gtts import gTTS
+
+    def synthesize(text: str) -> None:
+        gTTS(text=text, lang=lang).write_to_fp(io.BytesIO())
+    return synthesize
+
+
+def single_call(synthesize, text: str) -> tuple[float, float]:
+    start = time.perf_counter()
+    synthesize(text)
+    total = time.perf_counter() - start
+    return total, total
+
+
+def segmented(synthesize, text: str, workers: int) -> tuple[float, float]:
+    segments = split_segments(text)
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(synthesize, segment) for segment in segments]
+        first = futures[0].result()
+        first_at = time.perf_counter() - start
+        for future in as_completed(futures):
+            future.result()
+    return first_at, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--live", action="store_true", help="Call Google TTS instead of the latency model")
+    parser.add_argument("--lang", default="en")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--request-latency", type=float, default=0.35)
+    parser.add_argument("--per-char", type=float, default=0.002)
+    args = parser.parse_args()
+
+    synthesize = live_tts(args.lang) if args.live else fake_tts(args.request_latency, args.per_char)
+    print(f"{'chars':>6} {'path':<12} {'first audio':>12} {'total':>10}")
+    for length in (50, 500, 2000):
+        text = (SAMPLE * math.ceil(length / len(SAMPLE)))[:length]
+        for label, (first, total) in (("single call", single_call(synthesize, text)),
+                                      ("segmented", segmented(synthesize, text, args.workers))):
+            print(f"{length:>6} {label:<12} {first * 1000:>9.0f} ms {total * 1000:>7.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Time from starting the browser to the Meet lobby (join button showing) with
+a fresh profile that has to sign in, and again with the same profile reused
+so the saved Google session skips the login form.
+
+Requires Chrome and the account in `configurations/credentials.json`; the
+bot does not click join. Run from the repository root:
+
+    python -m benchmarks.bench_session_reuse --runs 3
+"""
+import argparse
+import shutil
+import statistics
+import tempfile
+import time
+
+from Models.GetDriver import DriverType, get_driver
+from Models.MeetingJoin import IN_CALL, JOIN_BUTTON, MeetingJoiner, clickable, present
+from Models.Model import verify
+from selenium.webdriver.support import expected_conditions as EC
+
+
+def reach_lobby(profile_dir: str, account: dict, headless: bool) -> tuple[float, bool]:
+    """Start a browser on `profile_dir`, sign in only if needed and open the meeting page."""
+    start = time.perf_counter()
+    driver = get_driver(DriverType.CHROME, profile_dir=profile_dir, headless=headless, low_resource=headless)
+    try:
+        joiner = MeetingJoiner(driver)
+        reused = joiner.session_valid()
+        if not reused:
+            joiner.login(account["email"], account["password"])
+        driver.get(account["meeting_link"])
+        joiner.wait(EC.any_of(clickable(JOIN_BUTTON), present(IN_CALL)))
+        return time.perf_counter() - start, reused
+    finally:
+        driver.quit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--credentials", default="configurations/credentials.json")
+    parser.add_argument("--headless", action="store_true", help="headless, low-resource browser")
+    args = parser.parse_args()
+    account = verify(args.credentials)
+
+    cold, warm = [], []
+    for _ in range(args.runs):
+        profile_dir = tempfile.mkdtemp(prefix="meetbot-profile-")
+        try:
+            elapsed, _ = reach_lobby(profile_dir, account, args.headless)
+            cold.append(elapsed)
+            elapsed, reused = reach_lobby(profile_dir, account, args.headless)
+            if not reused:
+                print("warning: the saved session was not picked up")
+            warm.append(elapsed)
+        finally:
+            shutil.rmtree(profile_dir, ignore_errors=True)
+
+    print(f"{'cold login':<16} median {statistics.median(cold):6.2f} s")
+    print(f"{'reused session':<16} median {statistics.median(warm):6.2f} s   "
+          f"({statistics.median(warm) / statistics.median(cold):.0%} of cold)")
+
+
+if __name__ == "__main__":
+    main()
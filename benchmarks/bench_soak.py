@@ -0,0 +1,179 @@
+"""
+Accelerated soak test: `--hours` of meeting (8 by default) compressed into a
+few minutes, fully offline. `VoiceAI.run` reads a `FakeWebDriver` chat panel
+in observer mode, with simulated TTS and Gemini and a null audio sink.
+
+Each simulated hour brings `--messages-per-hour` messages in bursts of
+`--burst`, every `--reply-every`-th one a /respone with a new question,
+each burst followed by a quiet minute of idle polls. Time is compressed by
+`--speedup`, which also scales the collection intervals. Two garbage
+collection setups run, each in its own process:
+
+    every-poll    a full gc.collect() after every poll (the previous behaviour)
+    long-running  MemoryManager: startup objects frozen, raised thresholds,
+                  full collections only while idle
+
+Reported per setup:
+
+    - duration of polls that read messages: p50, p99 and max
+    - full collections, total and longest collector pause
+    - RSS after the first hour and at the end, and the growth in between
+    - Gemini history length at the end
+
+Exits with status 1 if the long-running setup grows RSS by more than
+`--tolerance` MiB after the first hour. `--trace` also prints the modules
+whose allocations grew the most over the same span (slower). Run from the
+repository root:
+
+    python -m benchmarks.bench_soak
+"""
+import argparse
+import gc
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+from Models.AudioSink import NullSink
+from Models.ChatScraper import IngestionMode
+from Models.Gemini import GeminiTranscript
+from Models.Memory import MemoryManager, rss_mb
+from Models.Model import VoiceAI
+from Models.TTSBackends import SpeechCache
+from Models.VoiceModel import GoogleTextToSpeechModel
+from benchmarks.fakes import FakeGenerativeModel, FakeTTSBackend, FakeWebDriver
+
+NAMES = [f"Participant {i}" for i in range(20)]
+WORDS = ("slide chart numbers report deadline budget import export worker service team quarter "
+         "meeting link document question review release plan").split()
+
+
+class EveryPoll(MemoryManager):
+    """The previous behaviour: nothing frozen, default thresholds, a full collection after every poll."""
+
+    def start(self) -> "EveryPoll":
+        return self
+
+    def poll(self, idle: bool) -> int:
+        return self.collect()
+
+
+def percentile(values: list[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))] if ordered else float("nan")
+
+
+def soak(args) -> dict:
+    rng = random.Random(args.seed)
+    pauses = []
+    started = [0.0]
+
+    def time_collections(phase: str, info: dict) -> None:
+        if phase == "start":
+            started[0] = time.perf_counter()
+        else:
+            pauses.append(time.perf_counter() - started[0])
+    gc.callbacks.append(time_collections)
+
+    with tempfile.TemporaryDirectory() as directory:
+        credentials = os.path.join(directory, "credentials.json")
+        with open(credentials, "w") as f:
+            json.dump({"email": "bench@example.com", "password": "-",
+                       "meeting_link": "https://meet.google.com/bench"}, f)
+
+        if args.setup == "every-poll":
+            memory = EveryPoll()
+        else:
+            memory = MemoryManager(idle_interval=30 / args.speedup, max_interval=300 / args.speedup,
+                                   trace=args.trace)
+        driver = FakeWebDriver(latency=0.0005, keep=500)
+        engine = GoogleTextToSpeechModel(sink=NullSink(), cache=SpeechCache(4 * 1024 * 1024, directory=None),
+                                         backends=[FakeTTSBackend("gtts", median=0.002, sigma=0.3, seed=1)])
+        gemini = GeminiTranscript(model=FakeGenerativeModel(latency=0.01, chunk_delay=0.002), key="fake")
+        ai = VoiceAI(driver, os.path.join(directory, "config.json"), credentials, IngestionMode.OBSERVER,
+                     observer_timeout=60 / args.speedup / args.idle_polls, gemini_model=gemini,
+                     history_path=os.path.join(directory, "history.sqlite3"), engine=engine, memory=memory)
+
+        busy_polls, rss, growth = [], [], []
+        j = 0
+        for hour in range(args.hours):
+            for _ in range(args.messages_per_hour // args.burst):
+                for _ in range(args.burst):
+                    words = " ".join(rng.choice(WORDS) for _ in range(rng.randint(2, 30)))
+                    if j % args.reply_every == args.reply_every - 1:
+                        text = f"/respone what about the {words} {j}?"
+                    else:
+                        text = f"{words.capitalize()} {j}"
+                    driver.add_message(NAMES[rng.randrange(len(NAMES))], text)
+                    j += 1
+                # Read the burst, then let it be spoken
+                while True:
+                    start = time.perf_counter()
+                    new_messages = ai.run()
+                    if new_messages:
+                        busy_polls.append(time.perf_counter() - start)
+                    elif not ai.scheduler.pending() and not ai.engine.pipeline.pending():
+                        break
+                for _ in range(args.idle_polls):
+                    ai.run()
+            rss.append(rss_mb())
+            if args.trace and hour == 0:
+                memory.diff()  # Baseline after the first hour
+        if args.trace:
+            growth = memory.diff(limit=8)
+        history = len(gemini.session.history)
+        ai.release()
+
+    gc.callbacks.remove(time_collections)
+    return {"setup": args.setup, "messages": j, "poll_p50": percentile(busy_polls, 0.5),
+            "poll_p99": percentile(busy_polls, 0.99), "poll_max": max(busy_polls),
+            "collections": memory.collections, "pause_total": sum(pauses), "pause_max": max(pauses, default=0.0),
+            "rss": rss, "history": history, "growth": growth}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--hours", type=int, default=8)
+    parser.add_argument("--messages-per-hour", type=int, default=360)
+    parser.add_argument("--burst", type=int, default=6)
+    parser.add_argument("--reply-every", type=int, default=20)
+    parser.add_argument("--idle-polls", type=int, default=5, help="polls per quiet minute")
+    parser.add_argument("--speedup", type=float, default=300.0, help="simulated seconds per real second")
+    parser.add_argument("--tolerance", type=float, default=8.0, help="allowed RSS growth after the first hour, MiB")
+    parser.add_argument("--trace", action="store_true", help="report allocation growth by module")
+    parser.add_argument("--seed", type=int, default=3)
+    parser.add_argument("--setup", choices=["every-poll", "long-running"], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.setup is not None:
+        print(json.dumps(soak(args)))
+        return
+
+    print(f"{args.hours} h at {args.messages_per_hour} messages/h, {args.speedup:g}x speed\n")
+    print(f"{'setup':<13} {'poll p50 ms':>12} {'p99 ms':>7} {'max ms':>7} {'full gcs':>9} {'gc total s':>11}"
+          f" {'gc max ms':>10} {'RSS 1h MiB':>11} {'end MiB':>8} {'growth':>7} {'history':>8}")
+    results = {}
+    for setup in ("every-poll", "long-running"):
+        output = subprocess.run([sys.executable, "-m", "benchmarks.bench_soak", *sys.argv[1:], "--setup", setup],
+                                capture_output=True, text=True, check=True).stdout
+        r = results[setup] = json.loads(output.strip().splitlines()[-1])
+        print(f"{setup:<13} {r['poll_p50'] * 1e3:12.2f} {r['poll_p99'] * 1e3:7.2f} {r['poll_max'] * 1e3:7.1f}"
+              f" {r['collections']:>9} {r['pause_total']:11.2f} {r['pause_max'] * 1e3:10.1f}"
+              f" {r['rss'][0]:11.1f} {r['rss'][-1]:8.1f} {r['rss'][-1] - r['rss'][0]:7.1f} {r['history']:>8}")
+
+    r = results["long-running"]
+    print(f"\nlong-running RSS per hour: {' '.join(f'{v:.1f}' for v in r['rss'])} MiB")
+    for entry in r["growth"]:
+        print(f"  {entry['module']:<40} {entry['size_diff_kb']:+10.1f} KiB {entry['count_diff']:+8d} blocks")
+    growth = r["rss"][-1] - r["rss"][0]
+    if growth > args.tolerance:
+        print(f"FAIL: RSS grew {growth:.1f} MiB after the first hour (tolerance {args.tolerance:g} MiB)")
+        sys.exit(1)
+    print(f"OK: RSS grew {growth:.1f} MiB after the first hour (tolerance {args.tolerance:g} MiB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Compare the old pydub speed change (crossfade `speedup` followed by an MP3
+re-encode) with the decode-once NumPy WSOLA time-stretch at 0.75x, 1.25x and
+2.0x on a synthetic speech-like signal.
+
+The MP3 export step needs ffmpeg and is skipped when it is not installed.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_speed_change --seconds 5
+"""
+import argparse
+import io
+import shutil
+import statistics
+import time
+
+import numpy as np
+from pydub import AudioSegment
+
+from Models.AudioDSP import time_stretch
+
+RATE = 24000  # gTTS output rate
+
+
+def speech_like(seconds: float) -> np.ndarray:
+    """Harmonic tone with a syllable-rate envelope and short pauses."""
+    t = np.arange(int(RATE * seconds)) / RATE
+    pitch = 140 + 30 * np.sin(2 * np.pi * 0.7 * t)
+    phase = 2 * np.pi * np.cumsum(pitch) / RATE
+    voice = sum(np.sin(k * phase) / k for k in range(1, 6))
+    envelope = np.clip(np.sin(2 * np.pi * 4 * t), 0, None) * (np.sin(2 * np.pi * 0.5 * t) > -0.8)
+    return (0.3 * voice * envelope).astype(np.float32)
+
+
+def timed(fn, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--seconds", type=float, default=5.0, help="Length of the test utterance")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    samples = speech_like(args.seconds)
+    segment = AudioSegment((samples * 32767).astype("<i2").tobytes(), frame_rate=RATE, sample_width=2, channels=1)
+    encode = shutil.which("ffmpeg") is not None
+    if not encode:
+        print("ffmpeg not found: pydub timings exclude the MP3 re-encode\n")
+
+    print(f"{'speed':>6} {'pydub speedup':>15} {'numpy wsola':>13} {'audio':>8}")
+    for speed in (0.75, 1.25, 2.0):
+        def pydub_path():
+            audio = segment.speedup(playback_speed=speed)
+            if encode:
+                audio.export(io.BytesIO(), format="mp3")
+
+        try:
+            pydub_time = f"{timed(pydub_path, args.repeat) * 1000:12.0f} ms"
+        except Exception as e:
+            pydub_time = f"{'failed':>15}"
+            print(f"pydub speedup at {speed}x failed: {e}")
+        numpy_time = timed(lambda: time_stretch(samples, RATE, speed), args.repeat)
+        print(f"{speed:>5}x {pydub_time:>15} {numpy_time * 1000:10.0f} ms {args.seconds / speed:6.1f} s")
+
+
+if __name__ == "__main__":
+    main()
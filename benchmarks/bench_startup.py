@@ -0,0 +1,97 @@
+"""
+Time from process start until the bot is ready to read chat (VoiceAI built
+and its first poll done), loading everything before the browser starts
+versus warming the speech engine and Gemini client in the background while
+it starts.
+
+The browser is simulated by a `--browser-seconds` delay returning the fake
+WebDriver from `benchmarks/fakes.py`; pass `--chrome` to start a real
+headless Chrome on the local chat fixture instead. Every run is a fresh
+interpreter so nothing is already imported. Audio uses SDL's dummy driver
+unless SDL_AUDIODRIVER is set.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_startup --runs 3
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+START = time.perf_counter()
+
+
+def start_browser(args):
+    if args.chrome:
+        import pathlib
+        from selenium import webdriver
+        from selenium.webdriver.chrome.options import Options as ChromeOptions
+        options = ChromeOptions()
+        options.add_argument("--headless=new")
+        driver = webdriver.Chrome(options=options)
+        fixture = pathlib.Path(__file__).parent / "fixtures" / "meet_chat.html"
+        driver.get(f"{fixture.resolve().as_uri()}?n=100")
+        return driver
+    from benchmarks.fakes import FakeWebDriver
+    time.sleep(args.browser_seconds)
+    return FakeWebDriver()
+
+
+def child(args) -> dict:
+    from Models.Model import VoiceAI, Warmup, Engine, GeminiTranscript
+    imported = time.perf_counter() - START
+
+    directory = tempfile.mkdtemp()
+    credentials = os.path.join(directory, "credentials.json")
+    with open(credentials, "w") as f:
+        json.dump({"email": "bench@example.com", "password": "-", "meeting_link": ""}, f)
+
+    if args.child == "eager":
+        # Everything up front, then the browser: the order the bot used to start in
+        components = {"engine": Engine("vi"), "gemini_model": GeminiTranscript(key="bench")}
+        driver = start_browser(args)
+    else:
+        warmup = Warmup("vi", gemini_key="bench")
+        driver = start_browser(args)
+        components = warmup.components()
+
+    ai = VoiceAI(driver, os.path.join(directory, "config.json"), credentials,
+                 history_path=os.path.join(directory, "history.sqlite3"), **components)
+    ai.run()
+    ready = time.perf_counter() - START
+    ai.release()
+    return {"import": imported, "ready": ready}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--browser-seconds", type=float, default=2.0, help="simulated browser start time")
+    parser.add_argument("--chrome", action="store_true", help="start a real headless Chrome")
+    parser.add_argument("--child", choices=["eager", "warmup"], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(child(args)))
+        return
+
+    env = {**os.environ, "SDL_AUDIODRIVER": os.environ.get("SDL_AUDIODRIVER", "dummy")}
+    browser = "headless Chrome" if args.chrome else f"simulated {args.browser_seconds:g} s browser start"
+    print(f"{browser}, median of {args.runs} runs\n")
+    for mode in ("eager", "warmup"):
+        results = []
+        for _ in range(args.runs):
+            output = subprocess.run([sys.executable, "-m", "benchmarks.bench_startup", *sys.argv[1:], "--child", mode],
+                                    capture_output=True, text=True, check=True, env=env).stdout
+            results.append(json.loads(output.strip().splitlines()[-1]))
+        print(f"{mode:<8} import Models.Model {statistics.median(r['import'] for r in results):6.2f} s"
+              f"   ready {statistics.median(r['ready'] for r in results):6.2f} s")
+
+
+if __name__ == "__main__":
+    main()
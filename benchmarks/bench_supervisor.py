@@ -0,0 +1,142 @@
+"""
+Scaling of `MeetingSupervisor` with 1, 4 and 16 rooms, fully offline: every
+room reads a `FakeWebDriver` chat panel, all rooms share one simulated TTS
+backend and one fake Gemini model, and audio goes to null sinks.
+
+Each room receives `--rate` messages per second for `--duration` seconds
+(every `--reply-every`-th one a /respone command). Halfway through, the
+browser of room 0 is crashed to measure how long the supervisor takes to
+bring the room back. Reported per room count:
+
+    - messages read out of messages sent, over all rooms
+    - read-to-speech-start latency: median of the rooms' p50, worst room's p95
+    - poll duration p95
+    - seconds from the crash to room 0 running again
+    - CPU seconds per wall second, thread count and peak RSS
+
+Each room count runs in its own process. Run from the repository root:
+
+    python -m benchmarks.bench_supervisor
+"""
+import argparse
+import itertools
+import json
+import os
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+from Models.AudioSink import NullSink
+from Models.ChatScraper import IngestionMode
+from Models.Supervisor import MeetingSupervisor
+from benchmarks.fakes import FakeGenerativeModel, FakeTTSBackend, FakeWebDriver
+
+NAMES = ["Alice", "Bob", "Chi", "Dung", "Emma"]
+
+
+def peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def scenario(args) -> dict:
+    with tempfile.TemporaryDirectory() as directory:
+        credentials = os.path.join(directory, "credentials.json")
+        with open(credentials, "w") as f:
+            json.dump({"email": "bench@example.com", "password": "-",
+                       "meeting_link": "https://meet.google.com/bench"}, f)
+
+        browsers = itertools.count()
+        supervisor = MeetingSupervisor(
+            [f"https://meet.google.com/bench-{i}" for i in range(args.rooms)],
+            lambda slot: FakeWebDriver(latency=args.round_trip, space=f"bench{next(browsers)}"),
+            config_path=os.path.join(directory, "config.json"), credentials_path=credentials,
+            ingestion=IngestionMode(args.mode),
+            backends=[FakeTTSBackend("gtts", median=args.tts_latency, sigma=0.3, seed=1)],
+            sink_factory=lambda index: NullSink(),
+            gemini_model=FakeGenerativeModel(latency=args.gemini_latency), gemini_key="fake",
+            history_path=os.path.join(directory, "history.sqlite3"),
+            join=False, restart_delay=0.5, report_interval=3600)
+
+        stopped = threading.Event()
+        sent = [0] * args.rooms
+
+        def feed(index: int) -> None:
+            j = 0
+            while not stopped.wait(1 / args.rate):
+                room = supervisor.rooms[index]
+                if room is None:
+                    continue  # Restarting; the new browser starts with an empty chat
+                text = f"/respone question {j}" if j % args.reply_every == args.reply_every - 1 else f"Message {j}"
+                room.driver.add_message(NAMES[j // 2 % len(NAMES)], text)
+                j += 1
+                sent[index] += 1
+
+        cpu, start = time.process_time(), time.monotonic()
+        supervisor.start()
+        while not all(supervisor.rooms):
+            time.sleep(0.01)
+        feeders = [threading.Thread(target=feed, args=(i,), daemon=True) for i in range(args.rooms)]
+        for feeder in feeders:
+            feeder.start()
+
+        time.sleep(args.duration / 2)
+        crashed = supervisor.rooms[0]
+        crashed.driver.crash()
+        crash_at = time.monotonic()
+        while supervisor.rooms[0] is None or supervisor.rooms[0] is crashed:
+            time.sleep(0.01)
+        recovery = time.monotonic() - crash_at
+        time.sleep(args.duration / 2)
+
+        stopped.set()
+        threads = threading.active_count()
+        wall, cpu = time.monotonic() - start, time.process_time() - cpu
+        time.sleep(1.0)  # Let the last messages be read
+        rooms = supervisor.snapshot()
+        supervisor.stop()
+
+        return {"rooms": args.rooms, "read": sum(room["messages"] for room in rooms), "sent": sum(sent),
+                "speech_p50": statistics.median(room["speech_p50"] or 0.0 for room in rooms),
+                "speech_p95": max(room["speech_p95"] or 0.0 for room in rooms),
+                "poll_p95": max(room["poll_p95"] or 0.0 for room in rooms), "recovery": recovery,
+                "restarts": sum(room["restarts"] for room in rooms), "cpu_per_s": cpu / wall,
+                "threads": threads, "peak_rss_mb": peak_rss_mb()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--room-counts", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--mode", choices=[mode.value for mode in IngestionMode], default="incremental")
+    parser.add_argument("--duration", type=float, default=20.0, help="seconds of chat per run")
+    parser.add_argument("--rate", type=float, default=1.0, help="new messages per second per room")
+    parser.add_argument("--reply-every", type=int, default=10)
+    parser.add_argument("--round-trip", type=float, default=0.001, help="seconds per WebDriver command")
+    parser.add_argument("--tts-latency", type=float, default=0.3, help="median simulated gTTS latency")
+    parser.add_argument("--gemini-latency", type=float, default=1.5)
+    parser.add_argument("--rooms", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.rooms is not None:
+        print(json.dumps(scenario(args)))
+        return
+
+    print(f"mode {args.mode}, {args.rate:g} messages/s per room for {args.duration:g} s, room 0 crashed halfway\n")
+    print(f"{'rooms':>5} {'read/sent':>11} {'speech p50 s':>13} {'p95 s':>7} {'poll p95 s':>11}"
+          f" {'recovery s':>11} {'cpu s/s':>8} {'threads':>8} {'peak RSS MiB':>13}")
+    forwarded = sys.argv[1:]
+    for rooms in args.room_counts:
+        output = subprocess.run([sys.executable, "-m", "benchmarks.bench_supervisor", *forwarded, "--rooms", str(rooms)],
+                                capture_output=True, text=True, check=True).stdout
+        r = json.loads(output.strip().splitlines()[-1])
+        print(f"{r['rooms']:>5} {r['read']:>5}/{r['sent']:<5}"
+              f" {r['speech_p50']:13.3f} {r['speech_p95']:7.3f} {r['poll_p95']:11.3f} {r['recovery']:11.2f}"
+              f" {r['cpu_per_s']:8.2f} {r['threads']:8d} {r['peak_rss_mb']:13.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Per-utterance synthesis latency with Google TTS alone versus the router with
+a local fallback, using simulated backends: a network backend with a
+log-normal latency, occasional stalls and failures, and a fast local engine.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_tts_fallback --utterances 100 --budget 1.5
+"""
+import argparse
+import logging
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from Models.TTSBackends import TTSRouter
+from benchmarks.fakes import FakeTTSBackend
+
+CONFIG = {"REMOVE": True, "SPEED": 1.0, "LANG": "vi"}
+
+
+def run(router: TTSRouter, utterances: int, workers: int) -> tuple[list[float], int]:
+    def one(i: int):
+        start = time.monotonic()
+        try:
+            router.synthesize(f"message {i}", CONFIG)
+            return time.monotonic() - start, False
+        except Exception:
+            return time.monotonic() - start, True
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(one, range(utterances)))
+    return [latency for latency, _ in results], sum(failed for _, failed in results)
+
+
+def report(label: str, router: TTSRouter, latencies: list[float], failed: int) -> None:
+    ordered = sorted(latencies)
+    p95 = ordered[int(0.95 * (len(ordered) - 1))]
+    print(f"{label:<20} p50 {statistics.median(ordered):6.2f} s   p95 {p95:6.2f} s   max {ordered[-1]:6.2f} s"
+          f"   unspoken {failed:3d}   fallbacks {router.snapshot()['fallbacks']:3d}")
+    for name, stats in router.snapshot()["backends"].items():
+        latency = stats["latency"]
+        if latency["count"]:
+            print(f"    {name:<10} calls {stats['calls']:4d}   failures {stats['failures']:3d}"
+                  f"   over budget {stats['timeouts']:3d}   p50 {latency['p50']:6.2f} s   p95 {latency['p95']:6.2f} s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--utterances", type=int, default=100)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--budget", type=float, default=1.5)
+    parser.add_argument("--stall-rate", type=float, default=0.05)
+    parser.add_argument("--stall", type=float, default=8.0)
+    parser.add_argument("--failure-rate", type=float, default=0.05)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.ERROR)  # Fallback warnings are counted in the report instead
+
+    def remote():
+        return FakeTTSBackend("gtts", median=0.4, sigma=0.6, stall_rate=args.stall_rate,
+                              stall=args.stall, failure_rate=args.failure_rate, seed=1)
+
+    local = FakeTTSBackend("local", median=0.05, sigma=0.2, seed=2)
+
+    alone = TTSRouter([remote()], budget=args.budget, workers=args.workers * 2)
+    report("gTTS only", alone, *run(alone, args.utterances, args.workers))
+    alone.close()
+
+    routed = TTSRouter([remote(), local], budget=args.budget, workers=args.workers * 2)
+    report("router + fallback", routed, *run(routed, args.utterances, args.workers))
+    routed.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,241 @@
+"""
+Offline stand-ins for the network services the bot talks to, for benchmarks.
+"""
+import random
+import re
+import threading
+import time
+from typing import Iterator, Optional
+
+import numpy as np
+from selenium.common.exceptions import WebDriverException
+
+from Models.ChatScraper import EXTRACT_NEW_MESSAGES_JS, INSTALL_OBSERVER_JS, WAIT_FOR_MESSAGES_JS
+from Models.TTSBackends import TTSBackend
+
+
+class FakeChunk:
+    def __init__(self, text: str) -> None:
+        self.text = text
+
+
+class FakeGenerativeModel:
+    """
+    Mimics `genai.GenerativeModel.generate_content(stream=True)` with configurable
+    latency, so `GeminiTranscript(model=FakeGenerativeModel(...), key="fake")`
+    works without network access.
+    """
+
+    def __init__(self, latency: float = 2.0, chunk_delay: float = 0.05,
+                 reply: str = "This is a short answer. It has two sentences.",
+                 chunk_words: int = 4) -> None:
+        """
+        Args:
+            latency (float): Seconds before the first chunk arrives.
+            chunk_delay (float): Seconds between later chunks.
+            reply (str): Text returned for every prompt.
+            chunk_words (int): Words per streamed chunk.
+        """
+        self.latency = latency
+        self.chunk_delay = chunk_delay
+        self.reply = reply
+        self.chunk_words = chunk_words
+        self.calls = 0
+
+    def generate_content(self, contents, stream: bool = False,
+                         request_options: Optional[dict] = None, **kwargs) -> Iterator[FakeChunk]:
+        self.calls += 1
+        words = re.findall(r"\S+\s*", self.reply)
+        time.sleep(self.latency)
+        for i in range(0, len(words), self.chunk_words):
+            if i:
+                time.sleep(self.chunk_delay)
+            yield FakeChunk("".join(words[i:i + self.chunk_words]))
+
+
+class FakeTTSBackend(TTSBackend):
+    """
+    TTS backend returning a short tone after a random delay drawn from a
+    log-normal distribution, with optional stalls and failures, to mimic a
+    network service (or, with small numbers, a local engine).
+    """
+
+    def __init__(self, name: str = "fake", median: float = 0.4, sigma: float = 0.5,
+                 stall_rate: float = 0.0, stall: float = 20.0, failure_rate: float = 0.0,
+                 seed: Optional[int] = None, seconds_per_char: float = 0.0) -> None:
+        """
+        Args:
+            name (str): Backend name reported in router stats.
+            median (float): Median latency in seconds.
+            sigma (float): Log-normal spread of the latency.
+            stall_rate (float): Fraction of calls that take `stall` seconds instead.
+            stall (float): Latency of a stalled call in seconds.
+            failure_rate (float): Fraction of calls that raise ConnectionError.
+            seed (Optional[int]): Random seed for repeatable runs.
+            seconds_per_char (float): Audio length per character of text, e.g. 0.07 for natural
+                speech (default: 0, a 0.1 s tone for any text).
+        """
+        self.name = name
+        self.median = median
+        self.sigma = sigma
+        self.stall_rate = stall_rate
+        self.stall = stall
+        self.failure_rate = failure_rate
+        self.random = random.Random(seed)
+        self.seconds_per_char = seconds_per_char
+        self.calls = 0
+
+    def synthesize(self, text: str, config: dict) -> tuple[np.ndarray, int]:
+        self.calls += 1
+        roll = self.random.random()
+        if roll < self.stall_rate:
+            delay = self.stall
+        else:
+            delay = self.median * self.random.lognormvariate(0, self.sigma)
+        time.sleep(delay)
+        if self.random.random() < self.failure_rate:
+            raise ConnectionError(f"{self.name} request failed")
+        rate = 24000
+        t = np.arange(int(rate * max(0.1, len(text) * self.seconds_per_char))) / rate
+        return (0.3 * np.sin(2 * np.pi * 440 * t)).astype(np.float32), rate
+
+
+class FakeElement:
+    """Just enough of a Selenium WebElement for `ChatScraper.fetch_all`."""
+
+    def __init__(self, driver: "FakeWebDriver", text: str = "", children: Optional[dict] = None,
+                 attributes: Optional[dict] = None) -> None:
+        self.driver = driver
+        self._text = text
+        self.children = children or {}
+        self.attributes = attributes or {}
+
+    @property
+    def text(self) -> str:
+        self.driver.round_trip()
+        return self._text
+
+    def find_element(self, by, value):
+        self.driver.round_trip()
+        return self.children[value][0]
+
+    def find_elements(self, by, value):
+        self.driver.round_trip()
+        return list(self.children.get(value, []))
+
+    def get_attribute(self, name: str):
+        self.driver.round_trip()
+        return self.attributes.get(name)
+
+
+class FakeWebDriver:
+    """
+    Serves a synthetic Google Meet chat panel without a browser. The JavaScript
+    snippets from `Models.ChatScraper` are emulated in Python, so every
+    ingestion mode works, and each command costs `latency` seconds like a
+    WebDriver round trip would. `add_message` appends to the panel from any
+    thread and remembers when each message arrived.
+    """
+
+    def __init__(self, latency: float = 0.001, group: int = 3, space: str = "fake",
+                 keep: Optional[int] = None) -> None:
+        """
+        Args:
+            latency (float): Seconds per WebDriver command (default: 1 ms).
+            group (int): Consecutive messages per sender group (default: 3).
+            space (str): Meeting part of the message ids; differs between simulated meetings (default: "fake").
+            keep (Optional[int]): Drop the oldest messages beyond this many, so a long simulated
+                meeting does not grow the benchmark process; None keeps all (default: None).
+        """
+        self.latency = latency
+        self.group = group
+        self.space = space
+        self.keep = keep
+        self.records: list[tuple[str, str, str, str]] = []
+        self.first = 0  # Number of messages dropped from the front
+        self.index: dict[str, int] = {}
+        self.arrivals: dict[str, float] = {}
+        self.commands = 0
+        self.crashed = False
+        self.observer: Optional[dict] = None
+        self.cond = threading.Condition()
+
+    def round_trip(self) -> None:
+        if self.crashed:
+            raise WebDriverException("chrome not reachable")
+        self.commands += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+    def add_message(self, name: str, text: str) -> str:
+        """Append a message and return its data-message-id."""
+        with self.cond:
+            n = self.first + len(self.records)
+            message_id = f"spaces/{self.space}/messages/{n}"
+            minutes = n // 10
+            record = (f"{9 + minutes // 60:02d}:{minutes % 60:02d}", name, message_id, text)
+            self.records.append(record)
+            self.index[message_id] = n
+            self.arrivals[message_id] = time.monotonic()
+            if self.keep is not None and len(self.records) > self.keep:
+                dropped = self.records.pop(0)[2]
+                del self.index[dropped], self.arrivals[dropped]
+                self.first += 1
+            if self.observer is not None:
+                self.observer["queue"].append(record)
+                self.cond.notify_all()
+            return message_id
+
+    def set_script_timeout(self, seconds: float) -> None:
+        self.round_trip()
+
+    def execute_script(self, script: str, *args):
+        self.round_trip()
+        with self.cond:
+            if script == EXTRACT_NEW_MESSAGES_JS:
+                start = max(self.index.get(args[0], -1) + 1 - self.first, 0) if args[0] else 0
+                return [list(record) for record in self.records[start:]]
+            if script == INSTALL_OBSERVER_JS:
+                installed = self.observer is not None
+                if not installed:
+                    self.observer = {"queue": []}
+                return installed
+        raise NotImplementedError("FakeWebDriver only runs the ChatScraper scripts")
+
+    def execute_async_script(self, script: str, *args):
+        self.round_trip()
+        if script != WAIT_FOR_MESSAGES_JS:
+            raise NotImplementedError("FakeWebDriver only runs the ChatScraper scripts")
+        with self.cond:
+            if self.observer is None:
+                return None
+            self.cond.wait_for(lambda: self.observer["queue"], args[0] / 1000)
+            records, self.observer["queue"] = self.observer["queue"], []
+            return [list(record) for record in records]
+
+    def find_elements(self, by, value):
+        self.round_trip()
+        with self.cond:
+            records = list(self.records)
+        groups, current, name = [], None, None
+        for i, (timestamp, sender, message_id, text) in enumerate(records):
+            if current is None or sender != name or i % self.group == 0:
+                current = FakeElement(self, children={
+                    ".poVWob": [FakeElement(self, sender)],
+                    ".MuzmKe": [FakeElement(self, timestamp)],
+                    '[jsname="dTKtvb"]': []})
+                groups.append(current)
+                name = sender
+            message = FakeElement(self, attributes={"data-message-id": message_id})
+            body = FakeElement(self, text, children={"./ancestor::div[@data-message-id]": [message]})
+            current.children['[jsname="dTKtvb"]'].append(body)
+        return groups
+
+    def crash(self) -> None:
+        """Make every later command fail as if the browser had died."""
+        with self.cond:
+            self.crashed = True
+            self.cond.notify_all()
+
+    def quit(self) -> None:
+        pass
@@ -0,0 +1,49 @@
+import pytest
+
+from CustomExeption.CustomExeption import InvalidConfig
+from Models.Config import SchedulerPolicy, VoiceConfig
+
+
+def test_defaults():
+    config = VoiceConfig.from_dict({})
+    assert (config.remove, config.speed, config.lang) == (True, 1.0, "vi")
+    assert repr(config.scheduler) == repr(SchedulerPolicy())
+
+
+def test_valid_config():
+    config = VoiceConfig.from_dict({"REMOVE": False, "SPEED": 1.5, "LANG": "en",
+                                    "SCHEDULER": {"TARGET_LATENCY": 5, "MENTIONS": ["bot"], "MAX_WAITING": 4}})
+    assert config.to_dict() == {"REMOVE": False, "SPEED": 1.5, "LANG": "en"}
+    assert config.scheduler.target_latency == 5.0
+    assert config.scheduler.mentions == ("bot",)
+    assert config.scheduler.max_waiting == 4
+
+
+@pytest.mark.parametrize("data", [
+    [],
+    {"VOLUME": 1},
+    {"REMOVE": "yes"},
+    {"SPEED": 3},
+    {"SPEED": True},
+    {"LANG": "klingon"},
+    {"SCHEDULER": []},
+])
+def test_invalid_config(data):
+    with pytest.raises(InvalidConfig):
+        VoiceConfig.from_dict(data)
+
+
+@pytest.mark.parametrize("data", [
+    {"UNKNOWN": 1},
+    {"TARGET_LATENCY": 0},
+    {"TARGET_LATENCY": "10"},
+    {"MAX_CHARS": 12.5},
+    {"MAX_WAITING": -1},
+    {"MIN_WORDS": True},
+    {"MERGE": 1},
+    {"MENTIONS": "bot"},
+    {"MENTIONS": [""]},
+])
+def test_invalid_scheduler_policy(data):
+    with pytest.raises(InvalidConfig):
+        SchedulerPolicy.from_dict(data)
@@ -0,0 +1,90 @@
+import time
+
+from Models.Gemini import GeminiTranscript, TokenBudget, normalize_prompt
+from benchmarks.fakes import FakeGenerativeModel
+
+
+def transcript(**kwargs) -> GeminiTranscript:
+    return GeminiTranscript(model=FakeGenerativeModel(latency=0.01, chunk_delay=0.0), key="fake", **kwargs)
+
+
+def test_conversations_share_the_client_but_not_history():
+    shared = transcript()
+    room_a, room_b = shared.conversation(), shared.conversation()
+    try:
+        assert room_a.model is room_b.model is shared.model
+        assert room_a.executor is shared.executor and room_a.budget is shared.budget
+        assert room_a.cache is room_b.cache and room_a.inflight is room_b.inflight
+
+        room_a.submit("What is on the slide?").result(timeout=5)
+        assert len(room_a.session.history) == 2
+        assert room_b.session.history == []
+
+        # Answered from the shared cache, without another model call
+        room_b.submit("what is on the  slide?").result(timeout=5)
+        assert shared.model.calls == 1
+        assert shared.snapshot()["cache_hits"] == 1
+
+        room_a.close()
+        assert room_b.submit("Another question").result(timeout=5)
+    finally:
+        shared.close()
+
+
+def test_one_caller_cancelling_leaves_the_others():
+    gemini = transcript()
+    gemini.model.latency = 0.2
+    try:
+        first, second = gemini.submit("Shared question"), gemini.submit("shared question")
+        assert gemini.snapshot()["coalesced"] == 1
+        first.cancel()
+        assert second.result(timeout=5) == gemini.model.reply
+        assert first.future.cancelled()
+
+        third, fourth = gemini.submit("Other question"), gemini.submit("other question")
+        fourth.cancel()
+        assert third.result(timeout=5) == gemini.model.reply
+    finally:
+        gemini.close()
+
+
+def test_streaming_caller_cancelling_leaves_the_others():
+    gemini = transcript()
+    gemini.model.latency = 0.2
+    streamed = []
+    try:
+        first = gemini.submit("Shared question", on_sentence=streamed.append)
+        second = gemini.submit("shared question")
+        first.cancel()
+        assert second.result(timeout=5) == gemini.model.reply
+        assert streamed == []
+    finally:
+        gemini.close()
+
+
+def test_upstream_stops_when_every_caller_cancels():
+    gemini = transcript()
+    gemini.model.latency = 0.2
+    try:
+        first, second = gemini.submit("Shared question"), gemini.submit("shared question")
+        shared = gemini.inflight[normalize_prompt("Shared question")]
+        first.cancel()
+        assert not shared.cancelled.is_set()
+        second.cancel()
+        assert shared.cancelled.is_set()
+        assert normalize_prompt("Shared question") not in gemini.inflight
+    finally:
+        gemini.close()
+
+
+def test_timeout_starts_after_the_budget_wait():
+    gemini = transcript(budget=TokenBudget(requests_per_minute=1, max_wait=5))
+    gemini.model.latency = 0.5
+    try:
+        # The only slot frees in a second, more than the timeout left after the reply
+        gemini.budget.acquire(10)
+        gemini.budget.events[0] = (time.monotonic() - 59.0, 10)
+        assert gemini.respone("Queued question", timeout=1.2) == gemini.model.reply
+        assert gemini.snapshot()["throttled"] == 1
+    finally:
+        gemini.close()
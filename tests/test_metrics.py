@@ -0,0 +1,19 @@
+from Models.Metrics import MetricsRegistry
+
+
+def test_gauge_callback_is_replaced():
+    metrics = MetricsRegistry(enabled=True)
+    metrics.gauge("queue_depth", fn=lambda: 1)
+    metrics.gauge("queue_depth", fn=lambda: 2)
+    assert metrics.to_json()["queue_depth"][0]["value"] == 2.0
+
+
+def test_unregister_only_own_callback():
+    metrics = MetricsRegistry(enabled=True)
+    old, new = (lambda: 1), (lambda: 2)
+    metrics.gauge("queue_depth", fn=old, room="a")
+    metrics.gauge("queue_depth", fn=new, room="a")
+    metrics.unregister("queue_depth", fn=old, room="a")
+    assert metrics.to_json()["queue_depth"][0]["value"] == 2.0
+    metrics.unregister("queue_depth", fn=new, room="a")
+    assert "queue_depth" not in metrics.to_json()
@@ -0,0 +1,156 @@
+import time
+
+import pytest
+
+from Models.Config import SchedulerPolicy
+from Models.MessageStore import ChatRecord
+from Models.Scheduler import Action, ChatScheduler
+
+
+class FakeUtterance:
+    def add_done_callback(self, fn) -> None:
+        pass
+
+
+class FakePipeline:
+    def __init__(self) -> None:
+        self.held = True
+
+    def pending(self) -> int:
+        return 99 if self.held else 0
+
+
+class FakeEngine:
+    """Takes everything it is handed once released; until then looks busy, so messages wait."""
+
+    def __init__(self) -> None:
+        self.pipeline = FakePipeline()
+        self.spoken: list[str] = []
+
+    def speech_all(self, texts):
+        self.spoken.extend(texts)
+        return [FakeUtterance() for _ in texts]
+
+
+@pytest.fixture
+def engine():
+    return FakeEngine()
+
+
+def read(engine, policy, messages, waited: float = 0.0):
+    """Queue `messages` as (name, text, priority), backdate them by `waited` seconds, then let them be read."""
+    scheduler = ChatScheduler(engine, policy)
+    try:
+        for i, (name, text, priority) in enumerate(messages):
+            scheduler.add(ChatRecord(f"09:{i:02d}", name, f"m{i}", text), priority=priority)
+        for waiting in scheduler.waiting:
+            waiting.read_at -= waited
+        engine.pipeline.held = False
+        assert scheduler.drain(timeout=5)
+    finally:
+        scheduler.close()
+    return [text for text in engine.spoken if text not in {name for name, _, _ in messages}], \
+        [decision.action for decision in scheduler.decisions]
+
+
+CHAT = [("Alice", "Can everyone see my screen now", False),
+        ("Bob", "Yes it works fine for me", False),
+        ("Carol", "/respone what is on the slide?", True)]
+
+
+def test_in_order_when_not_behind(engine):
+    spoken, actions = read(engine, SchedulerPolicy(), CHAT)
+    assert spoken == [text for _, text, _ in CHAT]
+    assert actions == []
+
+
+def test_promotes_priority_when_oldest_is_late(engine):
+    spoken, actions = read(engine, SchedulerPolicy(target_latency=10), CHAT, waited=15)
+    assert spoken[0] == "/respone what is on the slide?"
+    assert actions[0] == Action.PROMOTE
+
+
+def test_promotes_priority_when_too_many_wait(engine):
+    spoken, actions = read(engine, SchedulerPolicy(max_waiting=2), CHAT)
+    assert spoken[0] == "/respone what is on the slide?"
+    assert Action.PROMOTE in actions
+
+
+def test_mentions_are_priority(engine):
+    chat = [("Alice", "Can everyone see my screen now", False), ("Bob", "hey Bot can you read this", False)]
+    spoken, _ = read(engine, SchedulerPolicy(mentions=("bot",), max_waiting=1), chat)
+    assert spoken[0] == "hey Bot can you read this"
+
+
+def test_merges_one_speaker(engine):
+    chat = [("Alice", "First part of my question", False), ("Alice", "and the second part", False)]
+    spoken, actions = read(engine, SchedulerPolicy(), chat)
+    assert spoken == ["First part of my question. and the second part"]
+    assert actions == [Action.MERGE]
+
+
+def test_no_merge_when_disabled(engine):
+    chat = [("Alice", "First part of my question", False), ("Alice", "and the second part", False)]
+    spoken, actions = read(engine, SchedulerPolicy(merge=False), chat)
+    assert spoken == ["First part of my question", "and the second part"]
+    assert actions == []
+
+
+def test_shortens_long_messages_only_when_behind(engine):
+    long = "This is the first sentence of it. " + "Then a lot more words follow here. " * 10
+    spoken, actions = read(engine, SchedulerPolicy(max_chars=40), [("Alice", long, False)])
+    assert spoken == [long]
+
+    spoken, actions = read(FakeEngine(), SchedulerPolicy(max_chars=40, target_latency=1),
+                           [("Alice", long, False)], waited=2)
+    assert spoken == ["This is the first sentence of it."]
+    assert actions == [Action.SHORTEN]
+
+
+def test_skips_low_value_only_when_behind(engine):
+    chat = [("Alice", "ok", False), ("Bob", "Can you share the link?", False)]
+    spoken, actions = read(engine, SchedulerPolicy(), chat)
+    assert spoken == ["ok", "Can you share the link?"]
+
+    spoken, actions = read(FakeEngine(), SchedulerPolicy(target_latency=1), chat, waited=2)
+    assert spoken == ["Can you share the link?"]
+    assert actions == [Action.SKIP]
+
+
+def test_skips_stale_messages(engine):
+    spoken, actions = read(engine, SchedulerPolicy(drop_after=30), CHAT[:2], waited=40)
+    assert spoken == []
+    assert actions == [Action.SKIP, Action.SKIP]
+
+
+def test_priority_is_never_skipped(engine):
+    spoken, actions = read(engine, SchedulerPolicy(drop_after=30), [("Carol", "/respone hi", True)], waited=40)
+    assert spoken == ["/respone hi"]
+    assert actions == []
+
+
+def test_behind(engine):
+    scheduler = ChatScheduler(engine, SchedulerPolicy(target_latency=5, max_waiting=2))
+    try:
+        assert not scheduler.behind()
+        scheduler.add(ChatRecord("09:00", "Alice", "m0", "hello there everyone"))
+        assert not scheduler.behind()
+        scheduler.waiting[0].read_at = time.monotonic() - 6
+        assert scheduler.behind()
+    finally:
+        scheduler.close()
+
+
+def test_merged_messages_call_back_once(engine):
+    scheduler = ChatScheduler(engine, SchedulerPolicy())
+    spoken = []
+    try:
+        for i, text in enumerate(["First part of my question", "and the second part", "and a third"]):
+            scheduler.add(ChatRecord("09:00", "Alice", f"m{i}", text),
+                          on_speak=lambda utterance, i=i: spoken.append(f"m{i}"))
+        engine.pipeline.held = False
+        assert scheduler.drain(timeout=5)
+    finally:
+        scheduler.close()
+    assert spoken == ["m0"]
+    assert [d.message_id for d in scheduler.decisions if d.action == Action.MERGE] == ["m1", "m2"]
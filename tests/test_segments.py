@@ -0,0 +1,27 @@
+from Models.VoiceModel import split_segments
+
+
+def test_short_text_is_one_segment():
+    assert split_segments("Hello there.", 100) == ["Hello there."]
+
+
+def test_empty_text():
+    assert split_segments("   ", 100) == []
+
+
+def test_prefers_sentence_then_clause_boundaries():
+    text = "Hello there. This is a much longer sentence, with a clause, and more words to go."
+    assert split_segments(text, 30) == ["Hello there.", "This is a much longer", "sentence, with a clause,",
+                                        "and more words to go."]
+
+
+def test_first_segment_stays_short_and_later_ones_merge():
+    segments = split_segments("One. Two. Three. Four.", 100)
+    assert segments == ["One.", "Two. Three. Four."]
+
+
+def test_no_segment_is_longer_than_the_limit():
+    text = "word " * 40 + "averyveryverylongwordwithoutanybreaks " * 3
+    segments = split_segments(text, 50)
+    assert all(len(segment) <= 50 for segment in segments)
+    assert " ".join(segments).split() == text.split()
@@ -0,0 +1,67 @@
+import os
+
+import gtts
+
+from Models.TTSBackends import GTTSBackend, SpeechCache
+
+
+def test_key_ignores_case_whitespace_and_speed():
+    assert SpeechCache.key("Hello  World", "en") == SpeechCache.key("hello world", "en")
+    assert SpeechCache.key("hello", "en") != SpeechCache.key("hello", "vi")
+
+
+def test_memory_and_disk_hits(tmp_path):
+    cache = SpeechCache(directory=str(tmp_path))
+    key = SpeechCache.key("hello", "en")
+    assert cache.get(key) is None
+    cache.put(key, b"mp3")
+    assert cache.get(key) == b"mp3"
+
+    # A new process finds it on disk, then in memory
+    reopened = SpeechCache(directory=str(tmp_path))
+    assert key in reopened
+    assert reopened.get(key) == b"mp3"
+    assert reopened.get(key) == b"mp3"
+    assert cache.snapshot()["misses"] == 1 and cache.snapshot()["memory_hits"] == 1
+    assert reopened.snapshot()["disk_hits"] == 1 and reopened.snapshot()["memory_hits"] == 1
+
+
+def test_memory_tier_evicts_least_recently_used():
+    cache = SpeechCache(max_memory_bytes=10, directory=None)
+    cache.put("a", b"aaaa")
+    cache.put("b", b"bbbb")
+    cache.get("a")
+    cache.put("c", b"cccc")
+    assert "b" not in cache
+    assert "a" in cache and "c" in cache
+    assert cache.snapshot()["evictions"] == 1
+    assert cache.snapshot()["memory_bytes"] == 8
+
+
+def test_disk_tier_is_pruned(tmp_path):
+    cache = SpeechCache(max_memory_bytes=1024, directory=str(tmp_path), max_disk_bytes=100)
+    for i in range(5):
+        cache.put(f"{i:040x}", bytes(40))
+    total = sum(os.path.getsize(tmp_path / name) for name in os.listdir(tmp_path))
+    assert total <= 100
+    assert cache.snapshot()["disk_bytes"] == total
+
+
+class FakeGTTS:
+    calls = 0
+
+    def __init__(self, text: str, lang: str, timeout=None) -> None:
+        self.text = text
+
+    def write_to_fp(self, fp) -> None:
+        FakeGTTS.calls += 1
+        fp.write(self.text.encode("utf-8"))
+
+
+def test_speed_change_reuses_the_cached_clip(monkeypatch):
+    monkeypatch.setattr(gtts, "gTTS", FakeGTTS)
+    FakeGTTS.calls = 0
+    backend = GTTSBackend(SpeechCache(directory=None))
+    assert backend.fetch("hello", {"LANG": "en", "SPEED": 1.0, "REMOVE": True}) == b"hello"
+    assert backend.fetch("Hello", {"LANG": "en", "SPEED": 1.5, "REMOVE": True}) == b"hello"
+    assert FakeGTTS.calls == 1
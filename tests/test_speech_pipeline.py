@@ -0,0 +1,69 @@
+from Models.SpeechPipeline import SpeechPipeline, UtteranceState
+
+
+class FakeEngine:
+    """Synthesizes text to itself and plays it instantly, recording the order."""
+
+    def __init__(self) -> None:
+        self.played = []
+
+    def synthesize(self, text: str) -> str:
+        return text
+
+    def play(self, audio: str, on_done) -> None:
+        self.played.append(audio)
+        on_done(True)
+
+    def drain(self) -> None:
+        pass
+
+
+def test_stream_waiting_for_text_lets_other_speech_play():
+    engine = FakeEngine()
+    pipeline = SpeechPipeline(engine, stream_wait=0.05)
+    try:
+        stream = pipeline.open_stream(["Reply:"])
+        chat = pipeline.submit("chat message")
+        assert chat.wait(timeout=2)
+        pipeline.add_segment(stream, "First sentence.")
+        pipeline.end_stream(stream)
+        assert stream.wait(timeout=2)
+        assert engine.played == ["Reply:", "chat message", "First sentence."]
+        assert stream.state == UtteranceState.PLAYED
+    finally:
+        pipeline.close()
+
+
+def test_stream_with_text_ready_keeps_the_player():
+    engine = FakeEngine()
+    pipeline = SpeechPipeline(engine, stream_wait=1.0)
+    try:
+        stream = pipeline.open_stream(["Reply:", "First sentence."])
+        chat = pipeline.submit("chat message")
+        pipeline.add_segment(stream, "Second sentence.")
+        pipeline.end_stream(stream)
+        assert chat.wait(timeout=2) and stream.wait(timeout=2)
+        assert engine.played == ["Reply:", "First sentence.", "Second sentence.", "chat message"]
+    finally:
+        pipeline.close()
+
+
+def test_close_waits_for_parked_streams():
+    engine = FakeEngine()
+    pipeline = SpeechPipeline(engine, stream_wait=0.01)
+    stream = pipeline.open_stream(["Reply:"])
+    pipeline.submit("chat message").wait(timeout=2)
+    pipeline.add_segment(stream, "Late sentence.")
+    pipeline.end_stream(stream)
+    pipeline.close()
+    assert stream.done()
+    assert engine.played[-1] == "Late sentence."
+
+
+def test_close_without_waiting_ends_parked_streams():
+    engine = FakeEngine()
+    pipeline = SpeechPipeline(engine, stream_wait=0.01)
+    stream = pipeline.open_stream(["Reply:"])
+    pipeline.submit("chat message").wait(timeout=2)
+    pipeline.close(wait=False)
+    assert stream.wait(timeout=2)
@@ -0,0 +1,45 @@
+import json
+import threading
+import time
+
+from Models.AudioSink import NullSink
+from Models.ChatScraper import IngestionMode
+from Models.Supervisor import MeetingSupervisor
+from benchmarks.fakes import FakeGenerativeModel, FakeTTSBackend, FakeWebDriver
+
+
+def wait_for(condition, timeout: float = 10.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+def test_crashed_rooms_are_released(tmp_path):
+    credentials = tmp_path / "credentials.json"
+    credentials.write_text(json.dumps({"email": "test@example.com", "password": "-",
+                                       "meeting_link": "https://meet.google.com/test"}))
+    supervisor = MeetingSupervisor(
+        ["https://meet.google.com/test"], lambda slot: FakeWebDriver(latency=0.0),
+        config_path=str(tmp_path / "config.json"), credentials_path=str(credentials),
+        ingestion=IngestionMode.INCREMENTAL, backends=[FakeTTSBackend("gtts", median=0.001)],
+        sink_factory=lambda index: NullSink(), gemini_model=FakeGenerativeModel(latency=0.01), gemini_key="fake",
+        history_path=str(tmp_path / "history.sqlite3"), join=False, spares=0, restart_delay=0.01,
+        report_interval=3600)
+    supervisor.start()
+    try:
+        wait_for(lambda: supervisor.rooms[0] is not None)
+        threads = threading.active_count()
+        crashed = []
+        for _ in range(3):
+            room = supervisor.rooms[0]
+            room.driver.crash()
+            crashed.append(room)
+            wait_for(lambda: supervisor.rooms[0] is not None and supervisor.rooms[0] is not room)
+        assert all(room.released for room in crashed)
+        assert all(not room.scheduler.thread.is_alive() for room in crashed)
+        assert all(not room.engine.pipeline.player.is_alive() for room in crashed)
+        wait_for(lambda: threading.active_count() <= threads + 1)
+    finally:
+        supervisor.stopped.set()
+        supervisor.stop()
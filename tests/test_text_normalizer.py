@@ -0,0 +1,36 @@
+import pytest
+
+from Models.TextNormalizer import DEFAULT_PACK, PACKS, TextNormalizer, normalizer_for
+
+
+@pytest.mark.parametrize("text, vi, en", [
+    ("https://example.com/a", "", ""),
+    ("xem https://example.com/a nhé", "xem đường link nhé", "xem link nhé"),
+    ("@Minh ơi", "Minh ơi", "Minh ơi"),
+    ("hahahaha", "haha", "haha"),
+    ("sooooo good!!!!", "soo good!", "soo good!"),
+    ("1000000 đồng", "1000000 đồng", "1000000 đồng"),
+    ("?", "hỏi chấm", "question mark"),
+    ("👍👍 ok  👍", "ok", "ok"),
+    ("ok 😀 thanks", "ok thanks", "ok thanks"),
+    ("   ", "", ""),
+])
+def test_normalizers(text, vi, en):
+    assert normalizer_for("vi")(text) == vi
+    assert normalizer_for("en")(text) == en
+
+
+def test_language_lookup():
+    assert normalizer_for("en") is normalizer_for("en")
+    assert normalizer_for("en-US").pack is PACKS["en"]
+    assert normalizer_for("zh-CN").pack is DEFAULT_PACK
+
+
+def test_unknown_language_keeps_symbols():
+    assert normalizer_for("zh-CN")("?") == "?"
+
+
+def test_uncached_matches_cached():
+    cached, uncached = TextNormalizer(PACKS["vi"]), TextNormalizer(PACKS["vi"], cache_size=0)
+    for text in ("hahaha @An https://x.y", "!!!", "Chào mọi người"):
+        assert cached(text) == uncached(text)
@@ -0,0 +1,42 @@
+import time
+
+import pytest
+
+from CustomExeption.CustomExeption import RateLimited
+from Models.Gemini import TokenBudget
+
+
+def test_admits_within_limits():
+    budget = TokenBudget(requests_per_minute=3, tokens_per_minute=100)
+    assert [budget.acquire(30) for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert budget.tokens == 90
+
+
+def test_sheds_when_the_wait_is_too_long():
+    budget = TokenBudget(requests_per_minute=2, max_wait=1)
+    budget.acquire(10)
+    budget.acquire(10)
+    with pytest.raises(RateLimited):
+        budget.acquire(10)
+
+
+def test_sheds_on_tokens():
+    budget = TokenBudget(tokens_per_minute=100, max_wait=1)
+    budget.acquire(80)
+    with pytest.raises(RateLimited):
+        budget.acquire(30)
+
+
+def test_request_larger_than_the_budget():
+    with pytest.raises(RateLimited):
+        TokenBudget(tokens_per_minute=100).acquire(101)
+
+
+def test_waits_for_the_window_to_slide():
+    budget = TokenBudget(requests_per_minute=1, max_wait=1)
+    budget.acquire(10)
+    # Pretend the first request was made almost a minute ago
+    budget.events[0] = (time.monotonic() - 59.8, 10)
+    waited = budget.acquire(10)
+    assert 0.0 < waited < 1.0
+    assert len(budget.events) == 1
@@ -0,0 +1,59 @@
+import time
+
+import numpy as np
+
+from Models.TTSBackends import EspeakBackend, SpeechCache, TTSBackend, TTSRouter, default_backends
+
+CONFIG = {"REMOVE": 0, "SPEED": 1.0, "LANG": "en"}
+
+
+class SlowBackend(TTSBackend):
+    """Takes `seconds` per call; prewarming submits one call per text."""
+
+    def __init__(self, name: str, seconds: float) -> None:
+        self.name = name
+        self.seconds = seconds
+
+    def synthesize(self, text: str, config: dict) -> tuple[np.ndarray, int]:
+        time.sleep(self.seconds)
+        return np.zeros(10, dtype=np.float32), 24000
+
+    def prewarm(self, texts, config, executor) -> None:
+        for text in texts:
+            executor.submit(self.synthesize, text, config)
+
+
+def test_prewarm_does_not_eat_the_budget():
+    primary, fallback = SlowBackend("primary", 0.1), SlowBackend("fallback", 0.0)
+    router = TTSRouter([primary, fallback], budget=0.5, workers=2)
+    try:
+        # Enough prewarming to keep a shared pool busy for seconds
+        router.prewarm([f"text {i}" for i in range(40)], CONFIG)
+        router.synthesize("live", CONFIG)
+        assert router.fallbacks == 0
+        assert router.stats["primary"].calls >= 1
+    finally:
+        router.close()
+
+
+def test_falls_back_after_the_budget():
+    router = TTSRouter([SlowBackend("primary", 0.5), SlowBackend("fallback", 0.0)], budget=0.1)
+    try:
+        router.synthesize("live", CONFIG)
+        assert router.fallbacks == 1
+    finally:
+        router.close()
+
+
+def test_default_backends_warn_without_espeak(monkeypatch, caplog):
+    monkeypatch.setattr(EspeakBackend, "available", staticmethod(lambda executable="espeak-ng": False))
+    backends = default_backends(SpeechCache(directory=None))
+    assert [backend.name for backend in backends] == ["gtts"]
+    assert "espeak-ng not found" in caplog.text
+
+
+def test_default_backends_with_espeak(monkeypatch, caplog):
+    monkeypatch.setattr(EspeakBackend, "available", staticmethod(lambda executable="espeak-ng": True))
+    backends = default_backends(SpeechCache(directory=None))
+    assert [backend.name for backend in backends] == ["gtts", "espeak-ng"]
+    assert "espeak-ng not found" not in caplog.text